@@ -0,0 +1,368 @@
+"""
+Read-optimized, columnar snapshot of the `alumni` table.
+
+The recommender and GET /alumni/ used to materialize one ORM object per
+alumnus per request. Instead we keep one process-wide snapshot:
+
+- numeric fields   -> NumPy arrays (int32 / bool, NULL = INT_NULL)
+- text fields      -> lists of interned str (departments, companies,
+                      domains, locations repeat a lot)
+- skills           -> flat int32 skill-id array + owner-row array, so a
+                      skill match for every alumnus is one np.isin + bincount
+- AlumniRecord     -> __slots__ view over one row (attribute access like the
+                      ORM object, no per-row dict / instrumentation)
+
+Freshness: every read does one cheap `count(*), max(id)` query. New ids are
+appended incrementally; anything else (count mismatch) triggers a rebuild.
+Writes in this process also push the new row directly (upsert_row).
+Appended rows go to a small in-memory tail next to the (possibly
+memory-mapped) base columns, so an append never copies the snapshot;
+base and tail merge when the next artifact version or rebuild replaces it.
+
+Startup: when `python -m app.artifacts build` has published a version, the
+snapshot starts from those memory-mapped files instead of a table scan,
+and newer versions are swapped in as they appear (see app/artifacts.py).
+"""
+import sys
+import threading
+import time
+from typing import Iterable, List, Optional
+
+import numpy as np
+from sqlalchemy import func, select
+
+from . import artifacts, models
+from .config import settings
+
+INT_NULL = np.iinfo(np.int32).min
+
+STR_FIELDS = (
+    "alumni_id", "name", "email", "department", "current_role",
+    "company", "skills", "domain", "location",
+)
+INT_FIELDS = ("graduation_year", "experience_years")
+
+# Column-only select: Row tuples, no ORM identity map
+_COLUMNS = [models.Alumni.id, models.Alumni.mentorship_available] + [
+    getattr(models.Alumni, f) for f in STR_FIELDS + INT_FIELDS
+]
+
+
+def split_skills(skills: Optional[str]) -> List[str]:
+    """Same normalization as recommend.compute_skill_score."""
+    if not skills:
+        return []
+    return [s.strip().lower() for s in skills.split(",") if s.strip()]
+
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class ArrayColumn:
+    """
+    Numeric column = read-only base array + rows appended since (the tail).
+
+    Counterpart of artifacts.StringColumn: `column + more` copies only the
+    tail, never the base (a memory-mapped artifact stays shared between
+    workers instead of becoming a private copy on the first register).
+    """
+
+    __slots__ = ("base", "tail")
+
+    def __init__(self, base, tail=None):
+        self.base = base
+        self.tail = np.zeros(0, dtype=base.dtype) if tail is None else tail
+
+    def __len__(self):
+        return len(self.base) + len(self.tail)
+
+    def __add__(self, more: np.ndarray) -> "ArrayColumn":
+        return ArrayColumn(self.base, np.concatenate([self.tail, more]).astype(self.base.dtype, copy=False))
+
+    def __getitem__(self, i):
+        n = len(self.base)
+        if not len(self.tail):
+            return self.base[i]
+        if isinstance(i, (int, np.integer)):
+            i = i + len(self) if i < 0 else i
+            return self.base[i] if i < n else self.tail[i - n]
+        i = np.asarray(i)
+        in_base = i < n
+        out = np.empty(i.shape, dtype=self.base.dtype)
+        out[in_base] = self.base[i[in_base]]
+        out[~in_base] = self.tail[i[~in_base] - n]
+        return out
+
+    def __array__(self, dtype=None, copy=None):
+        """Whole column as one array (copies when there is a tail)."""
+        out = np.concatenate([self.base, self.tail]) if len(self.tail) else np.asarray(self.base)
+        return out if dtype is None else out.astype(dtype, copy=False)
+
+    @property
+    def segments(self) -> tuple:
+        return self.base, self.tail
+
+    def tolist(self) -> list:
+        return self.base.tolist() + self.tail.tolist()
+
+    def flatnonzero(self) -> np.ndarray:
+        return np.concatenate([np.flatnonzero(self.base), np.flatnonzero(self.tail) + len(self.base)])
+
+    def searchsorted(self, value) -> int:
+        """Position of `value` in a column sorted across base and tail (ids)."""
+        i = int(np.searchsorted(self.base, value))
+        return i if i < len(self.base) else i + int(np.searchsorted(self.tail, value))
+
+
+def _column(values) -> ArrayColumn:
+    return values if isinstance(values, ArrayColumn) else ArrayColumn(values)
+
+
+class _Snapshot:
+    """Immutable set of columns. Refreshes build a new one and swap it in."""
+
+    __slots__ = (
+        "ids", "mentorship", "ints", "strings",
+        "skill_ids", "skill_owner", "vocab", "max_id",
+    )
+
+    def __init__(self, ids, mentorship, ints, strings, skill_ids, skill_owner, vocab):
+        self.ids = _column(ids)
+        self.mentorship = _column(mentorship)
+        self.ints = {f: _column(v) for f, v in ints.items()}
+        self.strings = strings
+        self.skill_ids = _column(skill_ids)
+        self.skill_owner = _column(skill_owner)
+        self.vocab = vocab  # skill token -> id; append-only, shared with appended snapshots
+        self.max_id = int(ids[-1]) if len(ids) else 0  # rows are in id order
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, pk: int) -> bool:
+        i = self.ids.searchsorted(pk)
+        return i < len(self.ids) and self.ids[i] == pk
+
+
+class AlumniRecord:
+    """Attribute view over one snapshot row (duck-types models.Alumni for reads)."""
+
+    __slots__ = ("_snap", "_row")
+
+    def __init__(self, snap: _Snapshot, row: int):
+        self._snap = snap
+        self._row = row
+
+    @property
+    def id(self) -> int:
+        return int(self._snap.ids[self._row])
+
+    @property
+    def mentorship_available(self) -> bool:
+        return bool(self._snap.mentorship[self._row])
+
+    def to_dict(self) -> dict:
+        out = {"id": self.id, "mentorship_available": self.mentorship_available}
+        for f in STR_FIELDS:
+            out[f] = self._snap.strings[f][self._row]
+        for f in INT_FIELDS:
+            out[f] = getattr(self, f)
+        return out
+
+
+def _str_getter(field):
+    return property(lambda self: self._snap.strings[field][self._row])
+
+
+def _int_getter(field):
+    def get(self):
+        v = self._snap.ints[field][self._row]
+        return None if v == INT_NULL else int(v)
+    return property(get)
+
+
+for _f in STR_FIELDS:
+    setattr(AlumniRecord, _f, _str_getter(_f))
+for _f in INT_FIELDS:
+    setattr(AlumniRecord, _f, _int_getter(_f))
+
+
+class AlumniStore:
+    def __init__(self):
+        self._snap: Optional[_Snapshot] = None
+        self._lock = threading.Lock()
+        self._artifact_version: Optional[str] = None
+        self._artifact_checked_at = 0.0
+
+    @property
+    def snapshot(self) -> Optional[_Snapshot]:
+        return self._snap
+
+    # ---------------- building ----------------
+    @staticmethod
+    def _columns(rows: Iterable, vocab: dict, row_offset: int = 0):
+        """Row tuples (see _COLUMNS) -> column pieces."""
+        ids, mentorship = [], []
+        strings = {f: [] for f in STR_FIELDS}
+        ints = {f: [] for f in INT_FIELDS}
+        skill_ids, skill_owner = [], []
+
+        for i, row in enumerate(rows, start=row_offset):
+            ids.append(row[0])
+            mentorship.append(bool(row[1]))  # NULL = never opted in, as `== True` filtered before
+            for j, f in enumerate(STR_FIELDS, start=2):
+                strings[f].append(_intern(row[j]))
+            for j, f in enumerate(INT_FIELDS, start=2 + len(STR_FIELDS)):
+                ints[f].append(INT_NULL if row[j] is None else row[j])
+            for token in set(split_skills(row[2 + STR_FIELDS.index("skills")])):
+                sid = vocab.get(token)
+                if sid is None:
+                    sid = vocab[token] = len(vocab)
+                skill_ids.append(sid)
+                skill_owner.append(i)
+
+        return (
+            np.asarray(ids, dtype=np.int64),
+            np.asarray(mentorship, dtype=bool),
+            {f: np.asarray(v, dtype=np.int32) for f, v in ints.items()},
+            strings,
+            np.asarray(skill_ids, dtype=np.int32),
+            np.asarray(skill_owner, dtype=np.int32),
+            vocab,
+        )
+
+    def _rebuild(self, rows) -> _Snapshot:
+        self._snap = _Snapshot(*self._columns(rows, {}))
+        return self._snap
+
+    def _append(self, rows) -> _Snapshot:
+        """New snapshot sharing the old base columns; only the tails are copied."""
+        old = self._snap
+        ids, mentorship, ints, strings, skill_ids, skill_owner, vocab = self._columns(
+            rows, old.vocab, len(old)
+        )
+        self._snap = _Snapshot(
+            old.ids + ids,
+            old.mentorship + mentorship,
+            {f: old.ints[f] + ints[f] for f in INT_FIELDS},
+            {f: old.strings[f] + strings[f] for f in STR_FIELDS},
+            old.skill_ids + skill_ids,
+            old.skill_owner + skill_owner,
+            vocab,
+        )
+        return self._snap
+
+    # ---------------- freshness (sync / async) ----------------
+    _STATS = select(func.count(models.Alumni.id), func.max(models.Alumni.id))
+    _ALL = select(*_COLUMNS).order_by(models.Alumni.id)
+
+    @staticmethod
+    def _is_fresh(snap, count: int, max_id) -> bool:
+        return snap is not None and len(snap) == count and snap.max_id == (max_id or 0)
+
+    @staticmethod
+    def _append_from(snap, max_id) -> Optional[int]:
+        """Highest id we already hold if only newer rows can be missing, else None."""
+        if snap is None or max_id is None or max_id < snap.max_id:
+            return None
+        return snap.max_id
+
+    def _poll_artifacts(self) -> None:
+        """Swap in a newly published artifact version (reads one tiny file every few seconds)."""
+        if not settings.artifacts_enabled:
+            return
+        now = time.monotonic()
+        if self._snap is not None and now - self._artifact_checked_at < settings.artifact_check_seconds:
+            return
+        self._artifact_checked_at = now
+        version = artifacts.current_version()
+        if version is None or version == self._artifact_version:
+            return
+        snap = artifacts.load_snapshot(version)
+        with self._lock:
+            self._snap = snap
+            self._artifact_version = version
+
+    def ensure_fresh(self, db) -> _Snapshot:
+        self._poll_artifacts()
+        count, max_id = db.execute(self._STATS).one()
+        with self._lock:
+            snap = self._snap
+            if self._is_fresh(snap, count, max_id):
+                return snap
+            after = self._append_from(snap, max_id)
+            if after is not None:
+                newer = db.execute(self._ALL.where(models.Alumni.id > after)).all()
+                if len(snap) + len(newer) == count:
+                    return self._append(newer)
+            return self._rebuild(db.execute(self._ALL).all())
+
+    async def aensure_fresh(self, db) -> _Snapshot:
+        self._poll_artifacts()
+        count, max_id = (await db.execute(self._STATS)).one()
+        snap = self._snap
+        if self._is_fresh(snap, count, max_id):
+            return snap
+
+        # Can't await while holding the thread lock: fetch first, then swap
+        # in only if nobody refreshed the snapshot meanwhile.
+        after = self._append_from(snap, max_id)
+        if after is not None:
+            newer = (await db.execute(self._ALL.where(models.Alumni.id > after))).all()
+            with self._lock:
+                if self._snap is snap and len(snap) + len(newer) == count:
+                    return self._append(newer)
+        rows = (await db.execute(self._ALL)).all()
+        with self._lock:
+            return self._rebuild(rows)
+
+    def upsert_row(self, alumni) -> None:
+        """Push a just-committed models.Alumni into the snapshot (register)."""
+        with self._lock:
+            if self._snap is None:
+                return  # first read will build it
+            row = (alumni.id, alumni.mentorship_available) + tuple(
+                getattr(alumni, f) for f in STR_FIELDS + INT_FIELDS
+            )
+            if alumni.id > self._snap.max_id:
+                self._append([row])
+            elif alumni.id in self._snap:
+                self._snap = None  # edited in place: rebuild on next read
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._snap = None
+
+    # ---------------- reads ----------------
+    @staticmethod
+    def to_dicts(snap: _Snapshot) -> List[dict]:
+        """Every row as an AlumniOut-shaped dict, built column by column (no per-row views)."""
+        n = len(snap)
+        columns = {"id": snap.ids.tolist(), "mentorship_available": snap.mentorship.tolist()}
+        for f in STR_FIELDS:
+            col = snap.strings[f]
+            columns[f] = col if isinstance(col, list) else [col[i] for i in range(n)]
+        for f in INT_FIELDS:
+            columns[f] = [None if v == INT_NULL else v for v in snap.ints[f].tolist()]
+        keys = list(columns)
+        return [dict(zip(keys, row)) for row in zip(*columns.values())]
+
+    def skill_scores(self, snap: _Snapshot, student_skills: Optional[str]) -> np.ndarray:
+        """compute_skill_score for every row at once -> float64[len(snap)]."""
+        tokens = split_skills(student_skills)
+        scores = np.zeros(len(snap), dtype=np.float64)
+        if not tokens or not len(snap):
+            return scores
+        wanted = [snap.vocab[t] for t in set(tokens) if t in snap.vocab]
+        if not wanted:
+            return scores
+        owners = np.concatenate([
+            owner[np.isin(skill_ids, wanted)]
+            for skill_ids, owner in zip(snap.skill_ids.segments, snap.skill_owner.segments)
+        ])
+        counts = np.bincount(owners, minlength=len(snap))
+        return counts / len(tokens)
+
+
+alumni_store = AlumniStore()
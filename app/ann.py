@@ -0,0 +1,115 @@
+"""
+Inverted-file (IVF) approximate nearest-neighbour index over unit vectors.
+
+Exact cosine search is one (n x dim) matrix-vector product per query,
+linear in the number of alumni. IVF clusters the vectors offline with
+spherical k-means (nlist ~ sqrt(n) centroids); a query scores only the
+centroids, then the rows of the `nprobe` closest lists:
+
+    cost ~ nlist + n * nprobe / nlist   instead of n
+
+Rows are stored grouped by list (CSR: `order` + `offsets`), so a probe
+is a contiguous slice. Everything is NumPy and saved as .npy next to the
+embedding vectors (loaded with mmap_mode="r").
+
+Rows inserted after the build (EmbeddingIndex.insert) live in a small
+exhaustively-searched segment and are folded into the lists by the next
+`python -m app.embeddings build`.
+"""
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+
+class IVFIndex:
+    FILES = ("ivf_centroids.npy", "ivf_order.npy", "ivf_offsets.npy")
+
+    def __init__(self, centroids: np.ndarray, order: np.ndarray, offsets: np.ndarray):
+        self.centroids = centroids  # nlist x dim, unit rows
+        self.order = order          # row ids grouped by list
+        self.offsets = offsets      # list l = order[offsets[l]:offsets[l + 1]]
+
+    @property
+    def nlist(self) -> int:
+        return len(self.centroids)
+
+    # ---------------- building ----------------
+    @staticmethod
+    def _assign(vectors: np.ndarray, centroids: np.ndarray, batch: int = 65536) -> np.ndarray:
+        out = np.empty(len(vectors), dtype=np.int32)
+        for start in range(0, len(vectors), batch):
+            out[start:start + batch] = np.argmax(vectors[start:start + batch] @ centroids.T, axis=1)
+        return out
+
+    @classmethod
+    def train(cls, vectors: np.ndarray, nlist: Optional[int] = None, iters: int = 10,
+              sample: int = 50000, seed: int = 0) -> "IVFIndex":
+        """Spherical k-means on a sample, then assign every row to its closest centroid."""
+        n = len(vectors)
+        rng = np.random.default_rng(seed)
+        nlist = max(1, min(nlist or int(np.sqrt(n)), n))
+        train = np.asarray(vectors[np.sort(rng.choice(n, min(n, sample), replace=False))], dtype=np.float32)
+        centroids = train[rng.choice(len(train), nlist, replace=False)].copy()
+
+        for _ in range(iters):
+            labels = cls._assign(train, centroids)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, train)
+            counts = np.bincount(labels, minlength=nlist)
+            empty = counts == 0
+            # Re-seed empty clusters from random training points
+            sums[empty] = train[rng.choice(len(train), int(empty.sum()))]
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            centroids = sums / np.maximum(norms, 1e-12)
+
+        labels = cls._assign(vectors, centroids)
+        order = np.argsort(labels, kind="stable").astype(np.int64)
+        offsets = np.zeros(nlist + 1, dtype=np.int64)
+        np.cumsum(np.bincount(labels, minlength=nlist), out=offsets[1:])
+        return cls(centroids.astype(np.float32), order, offsets)
+
+    # ---------------- persistence ----------------
+    def save(self, directory, write) -> None:
+        """`write(name, fn)` is the caller's atomic-file helper."""
+        write("ivf_centroids.npy", lambda f: np.save(f, self.centroids))
+        write("ivf_order.npy", lambda f: np.save(f, self.order))
+        write("ivf_offsets.npy", lambda f: np.save(f, self.offsets))
+
+    @classmethod
+    def load(cls, directory) -> Optional["IVFIndex"]:
+        directory = Path(directory)
+        if not all((directory / name).exists() for name in cls.FILES):
+            return None
+        return cls(
+            np.load(directory / "ivf_centroids.npy"),
+            np.load(directory / "ivf_order.npy", mmap_mode="r"),
+            np.load(directory / "ivf_offsets.npy"),
+        )
+
+    # ---------------- search ----------------
+    def candidates(self, qvec: np.ndarray, nprobe: int) -> np.ndarray:
+        """Row ids in the nprobe lists closest to qvec."""
+        nprobe = min(nprobe, self.nlist)
+        lists = np.argpartition(-(self.centroids @ qvec), nprobe - 1)[:nprobe]
+        return np.concatenate([self.order[self.offsets[l]:self.offsets[l + 1]] for l in lists])
+
+    def search(self, vectors: np.ndarray, qvec: np.ndarray, k: int, nprobe: int):
+        """Approximate top-k (rows, similarities) by inner product, best first."""
+        rows = np.sort(self.candidates(qvec, nprobe))  # ascending = sequential reads of the memmap
+        if not len(rows):
+            return rows, np.empty(0, dtype=np.float32)
+        sims = vectors[rows] @ qvec
+        k = min(k, len(rows))
+        top = np.argpartition(-sims, k - 1)[:k]
+        top = top[np.argsort(-sims[top])]
+        return rows[top], sims[top]
+
+
+def exact_search(vectors: np.ndarray, qvec: np.ndarray, k: int):
+    """Brute-force top-k, the reference for recall measurements."""
+    sims = vectors @ qvec
+    k = min(k, len(sims))
+    top = np.argpartition(-sims, k - 1)[:k]
+    top = top[np.argsort(-sims[top])]
+    return top, sims[top]
@@ -0,0 +1,235 @@
+"""
+Versioned, memory-mapped recommendation artifacts.
+
+Building the alumni snapshot (skill vocabulary, skill-id CSR arrays,
+columns) and the rating aggregates from the database costs every uvicorn
+worker a full table scan at startup plus its own private copy. Instead an
+offline command writes them once:
+
+    python -m app.artifacts build [--if-changed] [--keep 3]
+
+Layout (every version directory is immutable once published):
+
+    {ARTIFACT_DIR}/CURRENT              name of the live version (os.replace'd)
+    {ARTIFACT_DIR}/<version>/manifest.json
+        alumni_ids.npy  mentorship.npy  int_<field>.npy
+        skill_ids.npy   skill_owner.npy skill_vocab.json
+        str_<field>.bin + .idx.npy + .null.npy  UTF-8 blob, offsets, NULL mask
+        rating_alumni_ids.npy rating_count.npy reward_sum.npy
+
+Workers open the arrays with mmap_mode="r": the pages live once in the OS
+page cache and are shared by every worker (read-only, so nothing is ever
+copied), and strings are only decoded for rows actually returned.
+
+Hot swap: AlumniStore polls CURRENT every ARTIFACT_CHECK_SECONDS and
+swaps in a new version as one reference assignment; rows added since the
+build are appended from the DB as before. Old versions stay on disk
+(`--keep`) so a worker still reading one is never pulled out from under.
+"""
+import argparse
+import json
+import os
+import shutil
+import time
+import uuid
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from .config import settings
+
+FORMAT = 1
+
+
+class StringColumn:
+    """List-like view of a text column stored as one UTF-8 blob + offsets."""
+
+    __slots__ = ("blob", "offsets", "nulls", "tail")
+
+    def __init__(self, blob, offsets: np.ndarray, nulls: np.ndarray, tail: Optional[list] = None):
+        self.blob = blob          # uint8 memmap
+        self.offsets = offsets    # int64[n + 1]: row i is blob[offsets[i]:offsets[i + 1]]
+        self.nulls = nulls        # bool[n]
+        self.tail = tail or []    # rows appended after the build (plain str)
+
+    def __len__(self):
+        return len(self.nulls) + len(self.tail)
+
+    def __getitem__(self, i: int):
+        n = len(self.nulls)
+        if i >= n:
+            return self.tail[i - n]
+        if self.nulls[i]:
+            return None
+        return bytes(self.blob[self.offsets[i]:self.offsets[i + 1]]).decode("utf-8")
+
+    def __add__(self, more: list) -> "StringColumn":
+        return StringColumn(self.blob, self.offsets, self.nulls, self.tail + list(more))
+
+    @staticmethod
+    def encode(values: list):
+        """values -> (blob bytes, offsets, nulls)."""
+        parts = [v.encode("utf-8") if v is not None else b"" for v in values]
+        offsets = np.zeros(len(parts) + 1, dtype=np.int64)
+        np.cumsum([len(p) for p in parts], out=offsets[1:])
+        nulls = np.asarray([v is None for v in values], dtype=bool)
+        return b"".join(parts), offsets, nulls
+
+
+# ---------------------------------------------------------
+# Building
+# ---------------------------------------------------------
+def build(db, root=None) -> str:
+    """Write a new version directory from the DB and return its name (not yet live)."""
+    from .alumni_store import AlumniStore, STR_FIELDS, INT_FIELDS
+    from .bandit import ThompsonReranker
+
+    root = Path(root or settings.artifact_dir)
+    root.mkdir(parents=True, exist_ok=True)
+    version = time.strftime("%Y%m%dT%H%M%S") + "-" + uuid.uuid4().hex[:6]
+    tmp = root / f".tmp-{version}"
+    tmp.mkdir()
+
+    rows = db.execute(AlumniStore._ALL).all()
+    ids, mentorship, ints, strings, skill_ids, skill_owner, vocab = AlumniStore._columns(rows, {})
+    np.save(tmp / "alumni_ids.npy", ids)
+    np.save(tmp / "mentorship.npy", mentorship)
+    np.save(tmp / "skill_ids.npy", skill_ids)
+    np.save(tmp / "skill_owner.npy", skill_owner)
+    (tmp / "skill_vocab.json").write_text(json.dumps(vocab))
+    for f in INT_FIELDS:
+        np.save(tmp / f"int_{f}.npy", ints[f])
+    for f in STR_FIELDS:
+        blob, offsets, nulls = StringColumn.encode(strings[f])
+        (tmp / f"str_{f}.bin").write_bytes(blob)
+        np.save(tmp / f"str_{f}.idx.npy", offsets)
+        np.save(tmp / f"str_{f}.null.npy", nulls)
+
+    stats = db.execute(ThompsonReranker._STATS).all()
+    np.save(tmp / "rating_alumni_ids.npy", np.asarray([r[0] for r in stats], dtype=np.int64))
+    np.save(tmp / "rating_count.npy", np.asarray([r[1] or 0 for r in stats], dtype=np.int64))
+    np.save(tmp / "reward_sum.npy", np.asarray([r[2] or 0.0 for r in stats], dtype=np.float64))
+
+    (tmp / "manifest.json").write_text(json.dumps({
+        "format": FORMAT,
+        "version": version,
+        "built_at": time.time(),
+        "alumni_count": int(len(ids)),
+        "alumni_max_id": int(ids[-1]) if len(ids) else 0,
+        "skill_vocab_size": len(vocab),
+        "rated_alumni": len(stats),
+    }))
+    os.rename(tmp, root / version)
+    return version
+
+
+def publish(version: str, root=None) -> None:
+    """Make `version` live: atomic replace of the CURRENT pointer."""
+    root = Path(root or settings.artifact_dir)
+    tmp = root / f".CURRENT.{uuid.uuid4().hex}"
+    tmp.write_text(version)
+    os.replace(tmp, root / "CURRENT")
+
+
+def prune(keep: int, root=None) -> None:
+    """Delete all but the newest `keep` versions (never the live one)."""
+    root = Path(root or settings.artifact_dir)
+    live = current_version(root)
+    versions = sorted(p for p in root.iterdir() if p.is_dir() and not p.name.startswith("."))
+    for path in versions[:-keep] if keep else versions:
+        if path.name != live:
+            shutil.rmtree(path, ignore_errors=True)
+
+
+# ---------------------------------------------------------
+# Loading
+# ---------------------------------------------------------
+def current_version(root=None) -> Optional[str]:
+    try:
+        return (Path(root or settings.artifact_dir) / "CURRENT").read_text().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def read_manifest(version: str, root=None) -> dict:
+    return json.loads((Path(root or settings.artifact_dir) / version / "manifest.json").read_text())
+
+
+def load_snapshot(version: str, root=None):
+    """Memory-mapped alumni_store._Snapshot for `version`."""
+    from .alumni_store import _Snapshot, STR_FIELDS, INT_FIELDS
+
+    path = Path(root or settings.artifact_dir) / version
+    if read_manifest(version, root).get("format") != FORMAT:
+        raise ValueError(f"unsupported artifact format in {path}")
+
+    def arr(name):
+        return np.load(path / name, mmap_mode="r")
+
+    strings = {}
+    for f in STR_FIELDS:
+        blob_path = path / f"str_{f}.bin"
+        blob = np.memmap(blob_path, dtype=np.uint8, mode="r") if blob_path.stat().st_size else np.zeros(0, np.uint8)
+        strings[f] = StringColumn(blob, arr(f"str_{f}.idx.npy"), arr(f"str_{f}.null.npy"))
+
+    return _Snapshot(
+        arr("alumni_ids.npy"),
+        arr("mentorship.npy"),
+        {f: arr(f"int_{f}.npy") for f in INT_FIELDS},
+        strings,
+        arr("skill_ids.npy"),
+        arr("skill_owner.npy"),
+        json.loads((path / "skill_vocab.json").read_text()),
+    )
+
+
+def load_rating_rows(version: str, root=None):
+    """(alumni_id, rating_count, reward_sum) rows, as bandit.ThompsonReranker.load takes them."""
+    path = Path(root or settings.artifact_dir) / version
+    return zip(
+        np.load(path / "rating_alumni_ids.npy").tolist(),
+        np.load(path / "rating_count.npy").tolist(),
+        np.load(path / "reward_sum.npy").tolist(),
+    )
+
+
+def is_current(db, root=None) -> bool:
+    """Does the live version still match the alumni table (count + max id)?"""
+    from .alumni_store import AlumniStore
+
+    version = current_version(root)
+    if version is None:
+        return False
+    manifest = read_manifest(version, root)
+    count, max_id = db.execute(AlumniStore._STATS).one()
+    return manifest["alumni_count"] == count and manifest["alumni_max_id"] == (max_id or 0)
+
+
+if __name__ == "__main__":
+    from .database import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Build + publish recommendation artifacts")
+    parser.add_argument("command", choices=["build"])
+    parser.add_argument("--dir", default=None)
+    parser.add_argument("--if-changed", action="store_true", help="skip when the alumni table is unchanged")
+    parser.add_argument("--keep", type=int, default=settings.artifacts_keep)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        if args.if_changed and is_current(db, args.dir):
+            print(f"artifacts {current_version(args.dir)} are current, nothing to do")
+        else:
+            t0 = time.perf_counter()
+            new_version = build(db, args.dir)
+            publish(new_version, args.dir)
+            prune(args.keep, args.dir)
+            manifest = read_manifest(new_version, args.dir)
+            print(
+                f"published {new_version}: {manifest['alumni_count']} alumni, "
+                f"{manifest['skill_vocab_size']} skills, {manifest['rated_alumni']} rated "
+                f"in {time.perf_counter() - t0:.2f}s"
+            )
+    finally:
+        db.close()
@@ -0,0 +1,60 @@
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+
+from .config import settings
+from .database import DATABASE_URL
+
+
+def to_async_url(url: str) -> str:
+    """
+    Map the sync DATABASE_URL onto its async driver:
+    sqlite -> aiosqlite, postgresql(+psycopg2) -> asyncpg
+    """
+    if url.startswith("sqlite+aiosqlite") or url.startswith("postgresql+asyncpg"):
+        return url
+    if url.startswith("sqlite"):
+        return "sqlite+aiosqlite" + url[len("sqlite"):]
+    if url.startswith("postgresql"):
+        return "postgresql+asyncpg://" + url.split("://", 1)[1]
+    return url
+
+
+ASYNC_DATABASE_URL = to_async_url(DATABASE_URL)
+
+
+def build_async_engine(url: str = ASYNC_DATABASE_URL, cfg=settings):
+    """Async twin of database.build_engine (same pool settings)."""
+    if url.startswith("sqlite"):
+        return create_async_engine(url, echo=cfg.db_echo)
+
+    connect_args = {}
+    if cfg.db_statement_timeout_ms > 0:
+        # asyncpg takes server settings instead of libpq "options"
+        connect_args["server_settings"] = {
+            "statement_timeout": str(cfg.db_statement_timeout_ms)
+        }
+
+    return create_async_engine(
+        url,
+        pool_size=cfg.db_pool_size,
+        max_overflow=cfg.db_max_overflow,
+        pool_timeout=cfg.db_pool_timeout,
+        pool_recycle=cfg.db_pool_recycle,
+        pool_pre_ping=cfg.db_pool_pre_ping,
+        connect_args=connect_args,
+        echo=cfg.db_echo,
+    )
+
+
+async_engine = build_async_engine()
+
+# expire_on_commit=False: attributes stay loaded after commit, so returning
+# an ORM object from an async route never triggers a lazy (sync) reload.
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
+
+# Dependency for async routes (counterpart of database.get_db)
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,169 @@
+"""
+Signed, stateless session tokens (JWT, HS256, stdlib hmac only).
+
+POST /students/login returns `access_token`; clients send it back as
+`Authorization: Bearer <token>`. Claims:
+
+    sub  student id          pv   profile_version at login
+    iat  issued at           exp  expiry (AUTH_TOKEN_TTL_MINUTES)
+    jti  token id (for revocation)
+
+Verifying is one HMAC over the token: no DB read. A valid token proves
+the student exists, so hot endpoints skip their existence query, and it
+ties the caller to one student id (403 on someone else's id).
+
+Revocation (POST /students/logout) goes into an in-process LRU of token
+ids, each entry dropped once its token has expired anyway. It is per
+worker; set a short TTL if revocation must be immediate everywhere.
+
+AUTH_REQUIRED (default true) rejects token-less calls to student-scoped
+routes with 401. AUTH_REQUIRED=false is a local-development override:
+calls without a token are then trusted to act for any student id.
+"""
+import base64
+import hashlib
+import hmac
+import json
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from typing import NamedTuple, Optional
+
+from fastapi import Depends, HTTPException, status
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+
+from .config import settings
+
+_HEADER = base64.urlsafe_b64encode(b'{"alg":"HS256","typ":"JWT"}').rstrip(b"=")
+
+if settings.auth_secret_key:
+    _KEY = settings.auth_secret_key.encode("utf-8")
+else:
+    # Dev fallback: tokens only valid in this process, lost on restart
+    _KEY = secrets.token_bytes(32)
+    print("⚠️ AUTH_SECRET_KEY not set, using a random per-process key")
+
+if not settings.auth_required:
+    print("⚠️ AUTH_REQUIRED=false: token-less requests may act for any student (development only)")
+
+
+class TokenClaims(NamedTuple):
+    student_id: int
+    profile_version: int
+    jti: str
+    exp: int
+
+
+def _b64(raw: bytes) -> bytes:
+    return base64.urlsafe_b64encode(raw).rstrip(b"=")
+
+
+def _unb64(data: bytes) -> bytes:
+    return base64.urlsafe_b64decode(data + b"=" * (-len(data) % 4))
+
+
+def _sign(signing_input: bytes) -> bytes:
+    return _b64(hmac.new(_KEY, signing_input, hashlib.sha256).digest())
+
+
+def issue_token(student_id: int, profile_version: int = 0) -> str:
+    now = int(time.time())
+    payload = {
+        "sub": str(student_id),
+        "pv": profile_version,
+        "iat": now,
+        "exp": now + settings.auth_token_ttl_minutes * 60,
+        "jti": secrets.token_urlsafe(12),
+    }
+    signing_input = _HEADER + b"." + _b64(json.dumps(payload, separators=(",", ":")).encode())
+    return (signing_input + b"." + _sign(signing_input)).decode("ascii")
+
+
+def _unauthorized(detail: str) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail=detail,
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+def decode_token(token: str) -> TokenClaims:
+    try:
+        signing_input, signature = token.encode("ascii").rsplit(b".", 1)
+        header, payload = signing_input.split(b".")
+    except (ValueError, UnicodeEncodeError):
+        raise _unauthorized("Malformed token")
+    if not hmac.compare_digest(_sign(signing_input), signature) or header != _HEADER:
+        raise _unauthorized("Invalid token")
+
+    claims = json.loads(_unb64(payload))
+    if claims["exp"] < time.time():
+        raise _unauthorized("Token expired")
+    if revocations.is_revoked(claims["jti"]):
+        raise _unauthorized("Token revoked")
+    return TokenClaims(int(claims["sub"]), int(claims.get("pv", 0)), claims["jti"], int(claims["exp"]))
+
+
+class RevocationCache:
+    """Bounded LRU of revoked token ids -> their expiry."""
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._revoked: "OrderedDict[str, int]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def revoke(self, jti: str, exp: int) -> None:
+        with self._lock:
+            self._revoked[jti] = exp
+            self._revoked.move_to_end(jti)
+            now = time.time()
+            # Oldest first: drop entries whose token has expired anyway, then enforce the bound
+            while self._revoked:
+                oldest, oldest_exp = next(iter(self._revoked.items()))
+                if oldest_exp >= now and len(self._revoked) <= self.max_entries:
+                    break
+                self._revoked.popitem(last=False)
+
+    def is_revoked(self, jti: str) -> bool:
+        return jti in self._revoked
+
+    def __len__(self):
+        return len(self._revoked)
+
+
+revocations = RevocationCache(settings.auth_revocation_cache)
+
+_bearer = HTTPBearer(auto_error=False)
+
+
+async def optional_claims(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(_bearer),
+) -> Optional[TokenClaims]:
+    """Verified claims when a bearer token is sent, else None (or 401 with AUTH_REQUIRED)."""
+    if credentials is None:
+        if settings.auth_required:
+            raise _unauthorized("Not authenticated")
+        return None
+    return decode_token(credentials.credentials)
+
+
+def claims_from_query(token: Optional[str]) -> Optional[TokenClaims]:
+    """optional_claims for WebSocket / EventSource clients, which can't set headers (?token=)."""
+    if token is None:
+        if settings.auth_required:
+            raise _unauthorized("Not authenticated")
+        return None
+    return decode_token(token)
+
+
+async def require_claims(claims: Optional[TokenClaims] = Depends(optional_claims)) -> TokenClaims:
+    if claims is None:
+        raise _unauthorized("Not authenticated")
+    return claims
+
+
+def authorize_student(claims: Optional[TokenClaims], student_id: int) -> None:
+    """A token may only act for its own student."""
+    if claims is not None and claims.student_id != student_id:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Token does not match student")
@@ -0,0 +1,185 @@
+"""
+Online re-ranking of recommendation candidates with Thompson sampling.
+
+Each alumnus is an arm with a Beta(alpha, beta) posterior over "this
+mentor gets good feedback". Rewards are the normalized ratings from
+feedback.compute_reward_from_rating (0..1), so one feedback adds
+`reward` to alpha and `1 - reward` to beta.
+
+Sufficient statistics are exactly reward_sum / rating_count from the
+alumni_rating_stats table (kept by submit_feedback), so:
+- submit_feedback calls bandit.observe() -> this worker updates instantly
+- every `refresh_seconds` a worker reloads the per-alumni totals (one small
+  read, never a scan of interactions) to pick up other workers' feedback
+
+A worker's first load comes from the published artifacts
+(app/artifacts.py) when there are any, then from the table as above.
+
+With no feedback at all every arm is Beta(1, 1), i.e. a uniform random
+order, which is what recommend_for_student did before (random.shuffle).
+"""
+import threading
+import time
+from typing import Optional
+
+import numpy as np
+from sqlalchemy import select
+
+from .config import settings
+from . import artifacts, models
+
+
+class ThompsonReranker:
+    def __init__(self, prior_alpha: float = 1.0, prior_beta: float = 1.0, refresh_seconds: int = 60):
+        self.prior_alpha = prior_alpha
+        self.prior_beta = prior_beta
+        self.refresh_seconds = refresh_seconds
+        self._success: dict[int, float] = {}
+        self._failure: dict[int, float] = {}
+        self._loaded_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    # ---------------- updates ----------------
+    def observe(self, alumni_id: int, reward: Optional[float]) -> None:
+        """One feedback event (reward None = comment only, no signal)."""
+        if reward is None:
+            return
+        reward = min(max(float(reward), 0.0), 1.0)
+        with self._lock:
+            self._success[alumni_id] = self._success.get(alumni_id, 0.0) + reward
+            self._failure[alumni_id] = self._failure.get(alumni_id, 0.0) + (1.0 - reward)
+
+    def load(self, rows) -> None:
+        """Replace state from (alumni_id, rating_count, reward_sum) rows."""
+        success = {}
+        failure = {}
+        for alumni_id, rating_count, reward_sum in rows:
+            if rating_count:
+                success[alumni_id] = float(reward_sum)
+                failure[alumni_id] = max(float(rating_count) - float(reward_sum), 0.0)
+        with self._lock:
+            self._success, self._failure = success, failure
+            self._loaded_at = time.monotonic()
+
+    _STATS = select(
+        models.AlumniRatingStats.alumni_id,
+        models.AlumniRatingStats.rating_count,
+        models.AlumniRatingStats.reward_sum,
+    )
+
+    def _stale(self) -> bool:
+        return self._loaded_at is None or time.monotonic() - self._loaded_at > self.refresh_seconds
+
+    def _load_artifact(self) -> bool:
+        version = artifacts.current_version() if settings.artifacts_enabled else None
+        if version is None:
+            return False
+        self.load(artifacts.load_rating_rows(version))
+        return True
+
+    def ensure_fresh(self, db) -> None:
+        if self._loaded_at is None and self._load_artifact():
+            return
+        if self._stale():
+            self.load(db.execute(self._STATS).all())
+
+    async def aensure_fresh(self, db) -> None:
+        if self._loaded_at is None and self._load_artifact():
+            return
+        if self._stale():
+            self.load((await db.execute(self._STATS)).all())
+
+    # ---------------- ranking ----------------
+    def posterior(self, alumni_ids: np.ndarray):
+        success, failure = self._success, self._failure
+        alpha = self.prior_alpha + np.fromiter((success.get(int(a), 0.0) for a in alumni_ids), float, len(alumni_ids))
+        beta = self.prior_beta + np.fromiter((failure.get(int(a), 0.0) for a in alumni_ids), float, len(alumni_ids))
+        return alpha, beta
+
+    def rank(self, alumni_ids: np.ndarray, top_k: int, rng=None) -> np.ndarray:
+        """Positions (into alumni_ids) of the top_k arms by one posterior sample each."""
+        if not len(alumni_ids):
+            return np.empty(0, dtype=np.int64)
+        rng = rng or np.random.default_rng()
+        alpha, beta = self.posterior(alumni_ids)
+        theta = rng.beta(alpha, beta)
+        k = min(top_k, len(theta))
+        top = np.argpartition(-theta, k - 1)[:k]
+        return top[np.argsort(-theta[top])]
+
+    def stats(self) -> dict:
+        return {
+            "arms_with_feedback": len(self._success),
+            "prior": [self.prior_alpha, self.prior_beta],
+            "refresh_seconds": self.refresh_seconds,
+        }
+
+
+bandit = ThompsonReranker(refresh_seconds=settings.bandit_refresh_seconds)
+
+
+def replay_evaluate(db, top_k: int = 10, use_bandit: bool = True, seed: int = 0) -> dict:
+    """
+    Offline replay evaluation (Li et al., 2011) over the interactions table.
+
+    Walks rated interactions in id order. For each, the policy ranks that
+    student's candidates (skill match, plus profile similarity once the
+    embedding index is built); if the logged alumnus is in its top_k
+    the event "counts": its reward is credited to the policy and fed back to
+    the policy's own (fresh) bandit state. Non-matching events are skipped,
+    as the policy would not have shown that mentor.
+    """
+    from .alumni_store import alumni_store
+    from .embeddings import get_index
+    from .routers.recommend import candidate_rows
+
+    rng = np.random.default_rng(seed)
+    snap = alumni_store.ensure_fresh(db)
+    model = ThompsonReranker()
+    index = get_index()
+    students = {
+        row.id: row
+        for row in db.execute(select(
+            models.Student.id, models.Student.skills,
+            models.Student.interests, models.Student.career_goal,
+        ))
+    }
+
+    events = matched = 0
+    logged_reward = policy_reward = 0.0
+    candidates_for: dict[int, np.ndarray] = {}
+
+    rows = db.execute(
+        select(models.Interaction.student_id, models.Interaction.alumni_id, models.Interaction.reward)
+        .where(models.Interaction.reward.is_not(None))
+        .order_by(models.Interaction.id)
+        .execution_options(yield_per=1000)
+    )
+    for student_id, alumni_id, reward in rows:
+        events += 1
+        logged_reward += reward
+
+        if student_id not in candidates_for:
+            candidates_for[student_id] = candidate_rows(students.get(student_id), snap, index)[0]
+        cands = candidates_for[student_id]
+        ids = snap.ids[cands]
+
+        if use_bandit:
+            shown = ids[model.rank(ids, top_k, rng)]
+        else:
+            shown = rng.permutation(ids)[:top_k]
+
+        if alumni_id in shown:
+            matched += 1
+            policy_reward += reward
+            model.observe(alumni_id, reward)
+
+    return {
+        "policy": "thompson" if use_bandit else "random",
+        "top_k": top_k,
+        "events": events,
+        "matched": matched,
+        "match_rate": round(matched / events, 4) if events else 0.0,
+        "policy_avg_reward": round(policy_reward / matched, 4) if matched else None,
+        "logged_avg_reward": round(logged_reward / events, 4) if events else None,
+    }
@@ -0,0 +1,273 @@
+"""
+Read-through cache for Student / Alumni profiles.
+
+Values are the serialized StudentOut / AlumniOut dicts, so a hit never
+touches the DB or the ORM. Keys carry a per-kind version number:
+
+    student:v3:42  ->  {"id": 42, "name": ..., ...}
+
+- invalidate(kind, id)  drops one row (profile update, alumni register)
+- bump(kind)            moves every key of that kind to a new version
+                        (CSV import); old entries just age out of the LRU
+
+Both also advance a per-kind stamp. get_or_load / aget_or_load drop what
+their loader read if the stamp moved meanwhile, so a load racing a write cannot put
+the old row back after the write's invalidate().
+
+Default backend is process-local (bounded LRU + TTL). Set CACHE_REDIS_URL
+to share entries and versions across workers (needs the `redis` package).
+"""
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Optional
+
+from .config import settings
+from . import models, schemas
+
+
+# ---------------------------------------------------------
+# Backends
+# ---------------------------------------------------------
+class LocalBackend:
+    """In-process LRU with per-entry TTL. Thread-safe (sync routes run in a threadpool)."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._data: "OrderedDict[str, tuple[float, Any]]" = OrderedDict()
+        self._counters: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def get(self, key: str):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value, ttl: int) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def get_counter(self, key: str) -> int:
+        return self._counters.get(key, 0)
+
+    def incr(self, key: str) -> int:
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + 1
+            return self._counters[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def size(self) -> int:
+        return len(self._data)
+
+
+class RedisBackend:
+    """Shared backend. Memory bound = Redis maxmemory + allkeys-lru policy."""
+
+    def __init__(self, url: str, prefix: str = "mb:"):
+        import redis  # optional dependency
+
+        self._r = redis.Redis.from_url(url)
+        self.prefix = prefix
+        self.evictions = 0  # tracked by Redis itself (INFO stats)
+
+    def get(self, key: str):
+        raw = self._r.get(self.prefix + key)
+        return json.loads(raw) if raw is not None else None
+
+    def set(self, key: str, value, ttl: int) -> None:
+        self._r.set(self.prefix + key, json.dumps(value, default=str), ex=ttl)
+
+    def delete(self, key: str) -> None:
+        self._r.delete(self.prefix + key)
+
+    def get_counter(self, key: str) -> int:
+        raw = self._r.get(self.prefix + "ctr:" + key)
+        return int(raw) if raw is not None else 0
+
+    def incr(self, key: str) -> int:
+        return int(self._r.incr(self.prefix + "ctr:" + key))
+
+    def clear(self) -> None:
+        for key in self._r.scan_iter(self.prefix + "*"):
+            self._r.delete(key)
+
+    def size(self) -> int:
+        return sum(1 for _ in self._r.scan_iter(self.prefix + "*"))
+
+
+# ---------------------------------------------------------
+# Versioned entity cache
+# ---------------------------------------------------------
+class EntityCache:
+    def __init__(self, backend, ttl: int, enabled: bool = True):
+        self.backend = backend
+        self.ttl = ttl
+        self.enabled = enabled
+        self._lock = threading.Lock()  # counters below (sync routes run in a threadpool)
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def version(self, kind: str) -> int:
+        return self.backend.get_counter(f"version:{kind}")
+
+    def _stamp(self, kind: str) -> tuple:
+        return self.version(kind), self.backend.get_counter(f"invalidated:{kind}")
+
+    def _key(self, kind: str, entity_id: int) -> str:
+        return f"{kind}:v{self.version(kind)}:{entity_id}"
+
+    def get(self, kind: str, entity_id: int) -> Optional[dict]:
+        if not self.enabled:
+            return None
+        value = self.backend.get(self._key(kind, entity_id))
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, kind: str, entity_id: int, value: dict) -> None:
+        if self.enabled:
+            self.backend.set(self._key(kind, entity_id), value, self.ttl)
+
+    def get_or_load(self, kind: str, entity_id: int, loader: Callable[[], Optional[dict]]) -> Optional[dict]:
+        value = self.get(kind, entity_id)
+        if value is None:
+            stamp = self._stamp(kind)
+            value = loader()
+            self._store_loaded(kind, entity_id, value, stamp)
+        return value
+
+    async def aget_or_load(self, kind: str, entity_id: int,
+                           loader: Callable[[], Awaitable[Optional[dict]]]) -> Optional[dict]:
+        """get_or_load for an async loader (AsyncSession)."""
+        value = self.get(kind, entity_id)
+        if value is None:
+            stamp = self._stamp(kind)
+            value = await loader()
+            self._store_loaded(kind, entity_id, value, stamp)
+        return value
+
+    def _store_loaded(self, kind: str, entity_id: int, value: Optional[dict], stamp: tuple) -> None:
+        """Cache what a loader read, unless the kind was invalidated since `stamp` was taken."""
+        if value is None or not self.enabled:  # misses for unknown ids are not cached
+            return
+        key = self._key(kind, entity_id)
+        if self.version(kind) == stamp[0]:
+            self.backend.set(key, value, self.ttl)
+        # Checked after the set: an invalidate() that ran while the loader
+        # read the row either moved the stamp before this check or deletes
+        # the key after the set
+        if self._stamp(kind) != stamp:
+            self.backend.delete(key)
+
+    def invalidate(self, kind: str, entity_id: int) -> None:
+        self.backend.incr(f"invalidated:{kind}")  # before the delete, see get_or_load
+        self.backend.delete(self._key(kind, entity_id))
+        with self._lock:
+            self.invalidations += 1
+
+    def bump(self, kind: str) -> int:
+        """Invalidate every cached entry of this kind at once."""
+        with self._lock:
+            self.invalidations += 1
+        return self.backend.incr(f"version:{kind}")
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "backend": type(self.backend).__name__,
+            "entries": self.backend.size(),
+            "max_entries": getattr(self.backend, "max_entries", None),
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "invalidations": self.invalidations,
+            "evictions": self.backend.evictions,
+            "versions": {kind: self.version(kind) for kind in ("student", "alumni")},
+        }
+
+
+def _build_cache() -> EntityCache:
+    if settings.cache_redis_url:
+        backend = RedisBackend(settings.cache_redis_url)
+    else:
+        backend = LocalBackend(settings.cache_max_entries)
+    return EntityCache(backend, ttl=settings.cache_ttl_seconds, enabled=settings.cache_enabled)
+
+
+entity_cache = _build_cache()
+
+
+# ---------------------------------------------------------
+# Profile lookups (sync Session and AsyncSession variants)
+# ---------------------------------------------------------
+# Hits come back as StudentOut / AlumniOut built with model_construct
+# (no re-validation), so callers keep using attribute access.
+
+def _student_out(row) -> dict:
+    return schemas.StudentOut.model_validate(row).model_dump()
+
+
+def _alumni_out(row) -> dict:
+    return schemas.AlumniOut.model_validate(row).model_dump()
+
+
+def get_student(db, student_id: int) -> Optional[schemas.StudentOut]:
+    def load():
+        row = db.get(models.Student, student_id)
+        return _student_out(row) if row else None
+
+    data = entity_cache.get_or_load("student", student_id, load)
+    return schemas.StudentOut.model_construct(**data) if data else None
+
+
+def get_alumni(db, alumni_id: int) -> Optional[schemas.AlumniOut]:
+    def load():
+        row = db.get(models.Alumni, alumni_id)
+        return _alumni_out(row) if row else None
+
+    data = entity_cache.get_or_load("alumni", alumni_id, load)
+    return schemas.AlumniOut.model_construct(**data) if data else None
+
+
+async def aget_student(db, student_id: int) -> Optional[schemas.StudentOut]:
+    async def load():
+        row = await db.get(models.Student, student_id)
+        return _student_out(row) if row else None
+
+    data = await entity_cache.aget_or_load("student", student_id, load)
+    return schemas.StudentOut.model_construct(**data) if data else None
+
+
+async def aget_alumni(db, alumni_id: int) -> Optional[schemas.AlumniOut]:
+    async def load():
+        row = await db.get(models.Alumni, alumni_id)
+        return _alumni_out(row) if row else None
+
+    data = await entity_cache.aget_or_load("alumni", alumni_id, load)
+    return schemas.AlumniOut.model_construct(**data) if data else None
@@ -0,0 +1,216 @@
+"""
+Response compression: Brotli when the `brotli` package is installed and
+the client accepts it, gzip otherwise.
+
+CompressionMiddleware (pure ASGI) compresses JSON / NDJSON / CSV / text
+bodies of at least COMPRESSION_MIN_SIZE bytes:
+
+- whole bodies are compressed in one go (Content-Length rewritten)
+- streamed bodies (the /export endpoints) are compressed chunk by chunk,
+  flushed after each chunk so the client still gets data immediately
+- Server-Sent Events (text/event-stream) are never touched: buffering
+  inside a compressor would hold events back
+- responses that already carry Content-Encoding pass through as-is
+
+Cached responses: `precompressed.response(...)` keeps the serialized body
+and its compressed variants per (key, token), compressed once at the
+highest level, so repeated GET /alumni/ or /chat/history do neither the
+serialization nor the compression again until their version changes.
+"""
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Callable, Optional
+
+from fastapi import Request, Response
+from starlette.datastructures import Headers, MutableHeaders
+
+from .config import settings
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+COMPRESSIBLE = ("application/json", "application/x-ndjson", "text/")
+NEVER = ("text/event-stream",)
+
+# Levels for bodies compressed once and reused (cost paid a single time)
+PRECOMPRESS_GZIP_LEVEL = 9
+PRECOMPRESS_BROTLI_QUALITY = 11
+
+
+def negotiate(accept_encoding: Optional[str]) -> Optional[str]:
+    """'br', 'gzip' or None for an Accept-Encoding header value."""
+    if not accept_encoding:
+        return None
+    accepted = set()
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        if params.strip().startswith("q="):
+            try:
+                q = float(params.strip()[2:])
+            except ValueError:
+                q = 0.0
+        if q > 0:
+            accepted.add(name.strip())
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted or "*" in accepted:
+        return "gzip"
+    return None
+
+
+def compress(data: bytes, encoding: str, level: Optional[int] = None) -> bytes:
+    if encoding == "br":
+        return brotli.compress(data, quality=settings.compression_brotli_quality if level is None else level)
+    return gzip_compress(data, settings.compression_gzip_level if level is None else level)
+
+
+def gzip_compress(data: bytes, level: int) -> bytes:
+    c = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    return c.compress(data) + c.flush()
+
+
+def _stream_compressor(encoding: str):
+    """(compress_chunk, finish) pair; each chunk is flushed so it can be sent right away."""
+    if encoding == "br":
+        c = brotli.Compressor(quality=settings.compression_brotli_quality)
+        return (lambda data: c.process(data) + c.flush()), c.finish
+    c = zlib.compressobj(settings.compression_gzip_level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    return (lambda data: c.compress(data) + c.flush(zlib.Z_SYNC_FLUSH)), c.flush
+
+
+def _compressible(content_type: str) -> bool:
+    content_type = content_type.lower()
+    return content_type.startswith(COMPRESSIBLE) and not content_type.startswith(NEVER)
+
+
+# ---------------------------------------------------------
+# ASGI middleware
+# ---------------------------------------------------------
+class CompressionMiddleware:
+    def __init__(self, app, minimum_size: int = None):
+        self.app = app
+        self.minimum_size = settings.compression_min_size if minimum_size is None else minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding"))
+        if encoding is None:
+            return await self.app(scope, receive, send)
+        await self.app(scope, receive, _Responder(send, encoding, self.minimum_size).send)
+
+
+class _Responder:
+    """Holds http.response.start until the first body chunk decides what to do."""
+
+    def __init__(self, send, encoding: str, minimum_size: int):
+        self._send = send
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.start = None
+        self.mode = None            # "passthrough" | "stream"
+        self.compress_chunk = None
+        self.finish = None
+
+    async def send(self, message):
+        kind = message["type"]
+        if kind == "http.response.start":
+            self.start = message
+            return
+        if kind != "http.response.body":
+            return await self._send(message)
+
+        body = message.get("body", b"")
+        more = message.get("more_body", False)
+
+        if self.mode is None:
+            headers = MutableHeaders(raw=self.start["headers"])
+            content_type = headers.get("content-type", "")
+            if "content-encoding" in headers or not _compressible(content_type):
+                self.mode = "passthrough"
+            else:
+                headers.add_vary_header("Accept-Encoding")
+                if not more:
+                    if len(body) >= self.minimum_size:
+                        body = compress(body, self.encoding)
+                        headers["Content-Encoding"] = self.encoding
+                        headers["Content-Length"] = str(len(body))
+                    await self._send(self.start)
+                    return await self._send({"type": "http.response.body", "body": body})
+                self.mode = "stream"
+                self.compress_chunk, self.finish = _stream_compressor(self.encoding)
+                headers["Content-Encoding"] = self.encoding
+                if "content-length" in headers:
+                    del headers["content-length"]
+            await self._send(self.start)
+
+        if self.mode == "passthrough":
+            return await self._send(message)
+
+        data = self.compress_chunk(body) if body else b""
+        if not more:
+            data += self.finish()
+        await self._send({"type": "http.response.body", "body": data, "more_body": more})
+
+
+# ---------------------------------------------------------
+# Precompressed bodies for cached responses
+# ---------------------------------------------------------
+class PrecompressedCache:
+    """
+    LRU of key -> (token, {encoding: body}). The entry is reused while the
+    caller passes an equal token (an ETag, a snapshot object, ...); a new
+    token rebuilds it. Variants are compressed lazily, once each.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _variants(self, key: str, token, build: Callable[[], bytes]) -> dict:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == token:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+        self.misses += 1
+        variants = {"identity": build()}
+        with self._lock:
+            self._entries[key] = (token, variants)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return variants
+
+    def body(self, key: str, token, build: Callable[[], bytes], encoding: Optional[str]):
+        """(body bytes, encoding used or None)."""
+        variants = self._variants(key, token, build)
+        raw = variants["identity"]
+        if encoding is None or not settings.compression_enabled or len(raw) < settings.compression_min_size:
+            return raw, None
+        if encoding not in variants:
+            level = PRECOMPRESS_BROTLI_QUALITY if encoding == "br" else PRECOMPRESS_GZIP_LEVEL
+            variants[encoding] = compress(raw, encoding, level)  # racing threads compute the same bytes
+        return variants[encoding], encoding
+
+    def response(self, request: Request, key: str, token, build: Callable[[], bytes],
+                 media_type: str = "application/json") -> Response:
+        body, encoding = self.body(key, token, build, negotiate(request.headers.get("accept-encoding")))
+        headers = {"Vary": "Accept-Encoding"}
+        if encoding is not None:
+            headers["Content-Encoding"] = encoding
+        return Response(content=body, media_type=media_type, headers=headers)
+
+    def stats(self) -> dict:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+precompressed = PrecompressedCache(settings.compression_cache_entries)
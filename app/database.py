@@ -1,13 +1,51 @@
-from sqlalchemy import create_engine
+from pathlib import Path
+
+from sqlalchemy import create_engine, inspect
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import QueuePool
+
+from .config import settings
+
+
+def normalize_database_url(url: str) -> str:
+    """Hosted Postgres (Render/Heroku) hands out postgres://, SQLAlchemy wants postgresql://"""
+    if url.startswith("postgres://"):
+        return "postgresql+psycopg2://" + url[len("postgres://"):]
+    return url
+
+
+DATABASE_URL = normalize_database_url(settings.database_url)
+
+
+def build_engine(url: str = DATABASE_URL, cfg=settings):
+    """
+    SQLite  -> local runs, single file, no pool tuning.
+    Postgres -> QueuePool sized from settings + per-connection statement timeout.
+    """
+    if url.startswith("sqlite"):
+        # For SQLite only: check_same_thread=False
+        return create_engine(
+            url, connect_args={"check_same_thread": False}, echo=cfg.db_echo
+        )
 
-# SQLite database URL
-DATABASE_URL = "sqlite:///./alumni.db"
+    connect_args = {}
+    if url.startswith("postgresql") and cfg.db_statement_timeout_ms > 0:
+        connect_args["options"] = f"-c statement_timeout={cfg.db_statement_timeout_ms}"
 
-# For SQLite only: check_same_thread=False
-engine = create_engine(
-    DATABASE_URL, connect_args={"check_same_thread": False}
-)
+    return create_engine(
+        url,
+        poolclass=QueuePool,
+        pool_size=cfg.db_pool_size,
+        max_overflow=cfg.db_max_overflow,
+        pool_timeout=cfg.db_pool_timeout,
+        pool_recycle=cfg.db_pool_recycle,
+        pool_pre_ping=cfg.db_pool_pre_ping,
+        connect_args=connect_args,
+        echo=cfg.db_echo,
+    )
+
+
+engine = build_engine()
 
 # Session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -24,3 +62,30 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+MIGRATIONS = Path(__file__).resolve().parents[1] / "migrations"
+
+
+def init_db() -> bool:
+    """
+    Dev convenience, run at app startup (not at import): on a database
+    without any of our tables, create the schema and stamp it at the
+    Alembic head so later `alembic upgrade head` runs apply on top.
+
+    An existing schema is never touched, not even to add missing tables:
+    create_all cannot add columns, and tables it made would break the
+    migrations that create them. Schema changes go through Alembic
+    (see migrations/). Returns True when the schema was created.
+    """
+    from alembic.runtime.migration import MigrationContext
+    from alembic.script import ScriptDirectory
+    from . import models  # noqa: F401  (registers tables on Base.metadata)
+
+    if set(inspect(engine).get_table_names()) & set(Base.metadata.tables):
+        return False
+    with engine.begin() as conn:
+        Base.metadata.create_all(bind=conn)
+        script = ScriptDirectory(str(MIGRATIONS))
+        MigrationContext.configure(conn).stamp(script, script.get_current_head())
+    return True
@@ -0,0 +1,459 @@
+"""
+Semantic profile matching with precomputed vectors (TF-IDF + SVD / LSA).
+
+Exact skill-set intersection misses "ML" vs "Machine Learning" and ignores
+a student's interests and career goal. Here both sides are embedded in the
+same low-dimensional space:
+
+- alumni text   = current_role + skills + domain + company
+- student text  = skills + interests + career_goal
+- tokens: lowercased words of each comma-separated phrase, common
+  abbreviations expanded (ml -> machine learning), plus one token for the
+  whole phrase ("machine_learning")
+- TF-IDF (sublinear tf, smoothed idf, L2) -> projection onto the top
+  `dim` right singular vectors, computed from the streamed V x V Gram
+  matrix (NumPy only, no scipy/sklearn)
+
+Offline build (writes float32 .npy files, loaded with mmap_mode="r" so
+workers share the pages):
+
+    python -m app.embeddings build [--dim 64] [--keep 3]
+
+Layout, versioned like app/artifacts.py (a version directory is never
+rewritten, except for its delta segment):
+
+    {EMBEDDING_DIR}/CURRENT              name of the live version (os.replace'd)
+    {EMBEDDING_DIR}/<version>/manifest.json
+        vocab.json  idf.npy  projection.npy  alumni_ids.npy  alumni_vectors.npy
+        ivf_*.npy   (app/ann.py, large directories only)
+        delta.npz   rows inserted since the build, tagged with the build version
+
+Workers poll CURRENT every EMBEDDING_CHECK_SECONDS and swap in a new
+build as one reference assignment. A delta whose tag does not match the
+build it sits next to is ignored: vectors from another encoder would be
+in a different space.
+
+Alumni added after the build are encoded on the fly from the snapshot.
+Student vectors are computed on profile update (and lazily otherwise) and
+kept in a small content-keyed LRU: encoding is a sparse dot product, far
+cheaper than storing and reading them back from the DB.
+"""
+import argparse
+import json
+import math
+import os
+import re
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+import numpy as np
+
+from . import artifacts
+from .ann import IVFIndex
+from .config import settings
+
+DELTA_FILE = "delta.npz"
+
+ABBREVIATIONS = {
+    "ml": "machine learning",
+    "ai": "artificial intelligence",
+    "dl": "deep learning",
+    "nlp": "natural language processing",
+    "cv": "computer vision",
+    "js": "javascript",
+    "ts": "typescript",
+    "k8s": "kubernetes",
+    "aws": "amazon web services",
+    "gcp": "google cloud platform",
+    "db": "database",
+    "dbms": "database management",
+    "ui": "user interface",
+    "ux": "user experience",
+    "dsa": "data structures algorithms",
+    "oop": "object oriented programming",
+    "iot": "internet of things",
+    "bi": "business intelligence",
+    "devops": "dev ops",
+    "qa": "quality assurance",
+}
+STOP_WORDS = {"and", "of", "the", "in", "at", "for", "with", "to", "a", "an", "on", "&"}
+
+_WORD = re.compile(r"[a-z0-9+#]+(?:\.[a-z0-9]+)*")
+_PHRASE_SPLIT = re.compile(r"[,;/|\n]")
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    if not text:
+        return []
+    out = []
+    for phrase in _PHRASE_SPLIT.split(text.lower()):
+        words = []
+        for word in _WORD.findall(phrase):
+            words.extend(ABBREVIATIONS.get(word, word).split())
+        words = [w for w in words if w not in STOP_WORDS]
+        out.extend(words)
+        if len(words) > 1:
+            out.append("_".join(words))
+    return out
+
+
+def alumni_text(alum) -> str:
+    return ", ".join(filter(None, [alum.current_role, alum.skills, alum.domain, alum.company]))
+
+
+def student_text(student) -> str:
+    return ", ".join(filter(None, [
+        student.skills,
+        getattr(student, "interests", None),
+        getattr(student, "career_goal", None),
+    ]))
+
+
+class TextEncoder:
+    """TF-IDF vocabulary + LSA projection. Fitted offline, pure NumPy at query time."""
+
+    def __init__(self, vocab: dict, idf: np.ndarray, projection: np.ndarray):
+        self.vocab = vocab
+        self.idf = idf.astype(np.float32)
+        self.projection = projection.astype(np.float32)  # V x dim
+
+    @property
+    def dim(self) -> int:
+        return self.projection.shape[1]
+
+    def tfidf(self, texts: Iterable[str]) -> np.ndarray:
+        texts = list(texts)
+        X = np.zeros((len(texts), len(self.vocab)), dtype=np.float32)
+        for i, text in enumerate(texts):
+            for tok, n in Counter(tokenize(text)).items():
+                j = self.vocab.get(tok)
+                if j is not None:
+                    X[i, j] = 1.0 + math.log(n)
+        X *= self.idf
+        norms = np.linalg.norm(X, axis=1, keepdims=True)
+        np.divide(X, norms, out=X, where=norms > 0)
+        return X
+
+    def encode(self, texts: Iterable[str]) -> np.ndarray:
+        """Texts -> L2-normalized float32 vectors (zero vector for empty text)."""
+        Z = self.tfidf(texts) @ self.projection
+        norms = np.linalg.norm(Z, axis=1, keepdims=True)
+        np.divide(Z, norms, out=Z, where=norms > 0)
+        return Z.astype(np.float32, copy=False)
+
+    @classmethod
+    def fit(cls, texts: List[str], dim: int = 64, max_features: int = 2048, batch: int = 4096) -> "TextEncoder":
+        df = Counter()
+        for text in texts:
+            df.update(set(tokenize(text)))
+        vocab_terms = [t for t, _ in df.most_common(max_features)]
+        vocab = {t: i for i, t in enumerate(sorted(vocab_terms))}
+        n = max(len(texts), 1)
+        idf = np.zeros(len(vocab), dtype=np.float32)
+        for t, j in vocab.items():
+            idf[j] = math.log((1 + n) / (1 + df[t])) + 1.0
+
+        # Right singular vectors of X == eigenvectors of X^T X; accumulate the
+        # Gram matrix batch by batch so X never has to fit in memory at once.
+        plain = cls(vocab, idf, np.eye(len(vocab), dtype=np.float32))
+        gram = np.zeros((len(vocab), len(vocab)), dtype=np.float64)
+        for start in range(0, len(texts), batch):
+            X = plain.tfidf(texts[start:start + batch])
+            gram += X.T.astype(np.float64) @ X
+        k = max(1, min(dim, len(vocab)))
+        eigvals, eigvecs = np.linalg.eigh(gram)
+        projection = eigvecs[:, ::-1][:, :k]
+        return cls(vocab, idf, projection)
+
+
+def _atomic_writer(directory: Path):
+    """write(name, fn): fn(fileobj) into a temp file, then rename over `name`."""
+    def write(name, fn):
+        tmp = directory / f".{name}.tmp"
+        with open(tmp, "wb") as f:
+            fn(f)
+        os.replace(tmp, directory / name)
+    return write
+
+
+class EmbeddingIndex:
+    """
+    Alumni vectors (memory-mapped) + encoder + per-snapshot alignment.
+
+    Optional IVF index (app/ann.py) for large directories, and a small
+    "inserted since build" segment (delta.npz) fed by /alumni/register.
+    """
+
+    def __init__(self, encoder: TextEncoder, alumni_ids: np.ndarray, vectors: np.ndarray, version: str,
+                 ivf: Optional[IVFIndex] = None, directory=None):
+        self.encoder = encoder
+        self.alumni_ids = alumni_ids
+        self.vectors = vectors  # np.memmap (n, dim) float32 when loaded from disk
+        self.version = version
+        self.ivf = ivf
+        self.directory = Path(directory) if directory else None
+        self._delta_ids = np.zeros(0, dtype=np.int64)
+        self._delta_vecs = np.zeros((0, encoder.dim), dtype=np.float32)
+        self._aligned = None  # (snapshot, snap_rows, index_rows, extra_rows, extra_vecs, snap_row_of)
+        self._students: "OrderedDict[tuple, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    # ---------------- persistence ----------------
+    def save(self, root) -> None:
+        """Write a new version directory under `root` and make it CURRENT."""
+        root = Path(root)
+        root.mkdir(parents=True, exist_ok=True)
+        tmp = root / f".tmp-{self.version}"
+        tmp.mkdir()
+        write = _atomic_writer(tmp)
+
+        write("vocab.json", lambda f: f.write(json.dumps(self.encoder.vocab).encode()))
+        write("idf.npy", lambda f: np.save(f, self.encoder.idf))
+        write("projection.npy", lambda f: np.save(f, self.encoder.projection))
+        write("alumni_ids.npy", lambda f: np.save(f, self.alumni_ids))
+        write("alumni_vectors.npy", lambda f: np.save(f, np.ascontiguousarray(self.vectors, dtype=np.float32)))
+        if self.ivf is not None:
+            self.ivf.save(tmp, write)
+        write("manifest.json", lambda f: f.write(json.dumps({
+            "version": self.version,
+            "dim": self.encoder.dim,
+            "count": int(len(self.alumni_ids)),
+            "vocab_size": len(self.encoder.vocab),
+            "ivf_lists": self.ivf.nlist if self.ivf is not None else 0,
+        }).encode()))
+        os.rename(tmp, root / self.version)
+        artifacts.publish(self.version, root)
+        self.directory = root / self.version
+
+    @classmethod
+    def load_current(cls, root) -> Optional["EmbeddingIndex"]:
+        """The version CURRENT points at, or None before the first build."""
+        version = artifacts.current_version(root)
+        return cls.load(Path(root) / version) if version else None
+
+    @classmethod
+    def load(cls, directory) -> Optional["EmbeddingIndex"]:
+        """One version directory."""
+        directory = Path(directory)
+        if not (directory / "manifest.json").exists():
+            return None
+        manifest = json.loads((directory / "manifest.json").read_text())
+        encoder = TextEncoder(
+            json.loads((directory / "vocab.json").read_text()),
+            np.load(directory / "idf.npy"),
+            np.load(directory / "projection.npy"),
+        )
+        index = cls(
+            encoder,
+            np.load(directory / "alumni_ids.npy"),
+            np.load(directory / "alumni_vectors.npy", mmap_mode="r"),
+            manifest["version"],
+            ivf=IVFIndex.load(directory) if manifest.get("ivf_lists") else None,
+            directory=directory,
+        )
+        if (directory / DELTA_FILE).exists():
+            with np.load(directory / DELTA_FILE) as delta:
+                if str(delta["version"]) == index.version and delta["vectors"].shape[1:] == (encoder.dim,):
+                    index._delta_ids = delta["ids"]
+                    index._delta_vecs = delta["vectors"]
+        return index
+
+    @classmethod
+    def build(cls, alumni_rows, dim: int = 64, ivf_lists: Optional[int] = None) -> "EmbeddingIndex":
+        """ivf_lists: None = IVF only from settings.ann_min_alumni rows up, 0 = never."""
+        alumni_rows = list(alumni_rows)
+        texts = [alumni_text(a) for a in alumni_rows]
+        encoder = TextEncoder.fit(texts, dim=dim)
+        vectors = np.vstack([encoder.encode(texts[i:i + 4096]) for i in range(0, len(texts), 4096)]) \
+            if texts else np.zeros((0, encoder.dim), dtype=np.float32)
+        ids = np.asarray([a.id for a in alumni_rows], dtype=np.int64)
+
+        ivf = None
+        if ivf_lists or (ivf_lists is None and len(ids) >= settings.ann_min_alumni):
+            ivf = IVFIndex.train(vectors, nlist=ivf_lists)
+        version = time.strftime("%Y%m%dT%H%M%S") + "-" + uuid.uuid4().hex[:6]
+        return cls(encoder, ids, vectors, version=version, ivf=ivf)
+
+    def insert(self, alumni) -> None:
+        """
+        Add one just-registered alumnus without a rebuild: encoded now,
+        searched exhaustively alongside the IVF lists, persisted to the
+        build's delta.npz (tagged with its version) so a restart keeps it.
+        Other workers encode it on the fly until their next reload.
+        """
+        vec = self.encoder.encode([alumni_text(alumni)])
+        with self._lock:
+            keep = self._delta_ids != alumni.id
+            self._delta_ids = np.concatenate([self._delta_ids[keep], [alumni.id]])
+            self._delta_vecs = np.concatenate([self._delta_vecs[keep], vec])
+            self._aligned = None
+            if self.directory is not None:
+                ids, vecs, version = self._delta_ids, self._delta_vecs, self.version
+                _atomic_writer(self.directory)(
+                    DELTA_FILE, lambda f: np.savez(f, version=version, ids=ids, vectors=vecs)
+                )
+
+    # ---------------- queries ----------------
+    def student_vector(self, student) -> np.ndarray:
+        """Content-keyed LRU: a profile edit changes the key, no invalidation needed."""
+        text = student_text(student)
+        key = (student.id, text)
+        with self._lock:
+            vec = self._students.get(key)
+            if vec is not None:
+                self._students.move_to_end(key)
+                return vec
+        vec = self.encoder.encode([text])[0]
+        with self._lock:
+            self._students[key] = vec
+            while len(self._students) > settings.embedding_student_cache:
+                self._students.popitem(last=False)
+        return vec
+
+    def _alignment(self, snap):
+        aligned = self._aligned
+        if aligned is not None and aligned[0] is snap:
+            return aligned
+        # Both id arrays are sorted (built / snapshotted in id order)
+        snap_ids = np.asarray(snap.ids)
+        index_rows = np.searchsorted(self.alumni_ids, snap_ids)
+        index_rows[index_rows >= len(self.alumni_ids)] = 0
+        present = (self.alumni_ids[index_rows] == snap_ids) if len(self.alumni_ids) else np.zeros(len(snap), bool)
+        snap_rows = np.flatnonzero(present)
+        index_rows = index_rows[snap_rows]
+        snap_row_of = np.full(len(self.alumni_ids), -1, dtype=np.int64)
+        snap_row_of[index_rows] = snap_rows
+
+        # Alumni registered after the offline build: inserted vectors, or
+        # (registered by another worker) encoded now, once per snapshot
+        from .alumni_store import AlumniRecord
+        extra_rows = np.flatnonzero(~present)
+        extra_vecs = np.zeros((len(extra_rows), self.encoder.dim), dtype=np.float32)
+        delta_row = {int(a): i for i, a in enumerate(self._delta_ids)}
+        encode = []
+        for j, row in enumerate(extra_rows):
+            d = delta_row.get(int(snap.ids[row]))
+            if d is None:
+                encode.append(j)
+            else:
+                extra_vecs[j] = self._delta_vecs[d]
+        if encode:
+            extra_vecs[encode] = self.encoder.encode(
+                alumni_text(AlumniRecord(snap, int(extra_rows[j]))) for j in encode
+            )
+
+        aligned = (snap, snap_rows, index_rows, extra_rows, extra_vecs, snap_row_of)
+        self._aligned = aligned
+        return aligned
+
+    def similarities(self, snap, qvec: np.ndarray) -> np.ndarray:
+        """
+        Cosine similarity of qvec to every snapshot row (one matrix-vector
+        product). With an IVF index only the ~ann_candidates approximate
+        nearest rows get a value; every other row is 0.
+        """
+        _, snap_rows, index_rows, extra_rows, extra_vecs, snap_row_of = self._alignment(snap)
+        out = np.zeros(len(snap), dtype=np.float32)
+        if len(snap_rows):
+            if self.ivf is not None and settings.ann_search:
+                rows, sims = self.ivf.search(self.vectors, qvec, settings.ann_candidates, settings.ann_nprobe)
+                target = snap_row_of[rows]
+                keep = target >= 0
+                out[target[keep]] = sims[keep]
+            else:
+                sims = self.vectors @ qvec
+                out[snap_rows] = sims[index_rows]
+        if len(extra_rows):
+            out[extra_rows] = extra_vecs @ qvec
+        return out
+
+
+# ---------------------------------------------------------
+# Process-wide index (loaded lazily, not at import)
+# ---------------------------------------------------------
+_index: Optional[EmbeddingIndex] = None
+_index_checked_at: Optional[float] = None
+_load_lock = threading.Lock()
+
+
+def get_index() -> Optional[EmbeddingIndex]:
+    """
+    The live on-disk index, or None when semantic matching is off / not
+    built yet. Re-reads CURRENT every EMBEDDING_CHECK_SECONDS and swaps in
+    a newly published build.
+    """
+    global _index, _index_checked_at
+    if not settings.semantic_matching:
+        return None
+    now = time.monotonic()
+    if _index_checked_at is None or now - _index_checked_at >= settings.embedding_check_seconds:
+        with _load_lock:
+            if _index_checked_at is None or now - _index_checked_at >= settings.embedding_check_seconds:
+                version = artifacts.current_version(settings.embedding_dir)
+                if version is None:
+                    _index = None
+                elif _index is None or _index.version != version:
+                    _index = EmbeddingIndex.load(Path(settings.embedding_dir) / version)
+                _index_checked_at = now
+    return _index
+
+
+def warm_student_vector(student) -> None:
+    """Called on profile update so the next recommend call finds the vector ready."""
+    index = get_index()
+    if index is not None:
+        index.student_vector(student)
+
+
+def index_alumni(alumni) -> None:
+    """Called by /alumni/register after commit."""
+    index = get_index()
+    if index is not None:
+        index.insert(alumni)
+
+
+def build_from_db(directory=None, dim: Optional[int] = None, ivf_lists: Optional[int] = None,
+                  keep: Optional[int] = None) -> EmbeddingIndex:
+    from sqlalchemy import select
+    from .database import SessionLocal
+    from . import models
+
+    db = SessionLocal()
+    try:
+        rows = db.execute(
+            select(
+                models.Alumni.id, models.Alumni.current_role, models.Alumni.skills,
+                models.Alumni.domain, models.Alumni.company,
+            ).order_by(models.Alumni.id)
+        ).all()
+    finally:
+        db.close()
+    index = EmbeddingIndex.build(rows, dim=dim or settings.embedding_dim, ivf_lists=ivf_lists)
+    root = directory or settings.embedding_dir
+    index.save(root)
+    artifacts.prune(settings.embedding_keep if keep is None else keep, root)
+    return index
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the alumni embedding index")
+    parser.add_argument("command", choices=["build"])
+    parser.add_argument("--dir", default=None)
+    parser.add_argument("--dim", type=int, default=None)
+    parser.add_argument("--ivf-lists", type=int, default=None,
+                        help="IVF lists (0 = exact search only; default sqrt(n) from ANN_MIN_ALUMNI rows)")
+    parser.add_argument("--keep", type=int, default=settings.embedding_keep)
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    idx = build_from_db(args.dir, args.dim, args.ivf_lists, args.keep)
+    print(
+        f"built embedding index v{idx.version}: {len(idx.alumni_ids)} alumni, "
+        f"dim={idx.encoder.dim}, vocab={len(idx.encoder.vocab)}, "
+        f"ivf_lists={idx.ivf.nlist if idx.ivf is not None else 0} "
+        f"in {time.perf_counter() - t0:.2f}s -> {args.dir or settings.embedding_dir}"
+    )
@@ -0,0 +1,213 @@
+"""
+Push events for the browser (routers/events.py serves them over a
+WebSocket or Server-Sent Events), so pages stop polling the DB.
+
+One channel per student, `student:{id}`. Events are small dicts:
+
+    {"type": "message",    "alumni_id": 7, "messages": [ChatMessageOut, ...]}
+    {"type": "connection", "request": ConnectionRequestOut}
+    {"type": "feedback",   "feedback": FeedbackOut}
+    {"type": "read",       "alumni_id": 7}   conversation marked read
+    {"type": "resync"}     the subscriber fell behind: events were dropped,
+                           re-fetch over HTTP once
+
+Write paths publish after their commit, so a client never sees a change
+that was rolled back.
+
+Brokers share one interface:
+
+    publish(channel, event)                  non-blocking, any thread
+    subscribe(channel) -> async context manager yielding sub, `await sub.get()`
+
+Default broker is process-local (only reaches clients of this worker).
+Set EVENTS_REDIS_URL to fan out between workers over Redis pub/sub
+(needs the `redis` package).
+"""
+import asyncio
+import json
+import queue
+import threading
+from contextlib import asynccontextmanager
+
+from .config import settings
+from .responses import dumps
+
+RESYNC = {"type": "resync"}
+
+
+# ---------------------------------------------------------
+# Brokers
+# ---------------------------------------------------------
+class _LocalSubscription:
+    """Bounded queue on the subscriber's event loop."""
+
+    def __init__(self, max_queued: int):
+        self._loop = asyncio.get_running_loop()
+        self._queue: asyncio.Queue = asyncio.Queue(max_queued)
+        self.dropped = 0
+
+    def deliver(self, event: dict) -> None:
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self._loop:
+            self._put(event)
+        else:  # sync route in the threadpool
+            self._loop.call_soon_threadsafe(self._put, event)
+
+    def _put(self, event: dict) -> None:
+        if self._queue.full():
+            # Slow client: drop what is queued and tell it to re-fetch instead
+            self.dropped += self._queue.qsize()
+            while not self._queue.empty():
+                self._queue.get_nowait()
+            event = RESYNC
+        self._queue.put_nowait(event)
+
+    async def get(self) -> dict:
+        return await self._queue.get()
+
+
+class LocalBroker:
+    """In-process fan-out. Thread-safe (sync routes publish from the threadpool)."""
+
+    def __init__(self, max_queued: int):
+        self.max_queued = max_queued
+        self._subscribers: dict[str, set] = {}
+        self._lock = threading.Lock()
+        self.published = 0
+
+    def publish(self, channel: str, event: dict) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers.get(channel, ()))
+        self.published += 1
+        for sub in subscribers:
+            sub.deliver(event)
+
+    @asynccontextmanager
+    async def subscribe(self, channel: str):
+        sub = _LocalSubscription(self.max_queued)
+        with self._lock:
+            self._subscribers.setdefault(channel, set()).add(sub)
+        try:
+            yield sub
+        finally:
+            with self._lock:
+                subs = self._subscribers.get(channel)
+                subs.discard(sub)
+                if not subs:
+                    del self._subscribers[channel]
+
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return sum(len(s) for s in self._subscribers.values())
+
+
+class _RedisSubscription:
+    def __init__(self, pubsub):
+        self._pubsub = pubsub
+
+    async def get(self) -> dict:
+        while True:
+            message = await self._pubsub.get_message(ignore_subscribe_messages=True, timeout=None)
+            if message is not None:
+                return json.loads(message["data"])
+
+
+class RedisBroker:
+    """
+    Shared broker over Redis pub/sub: an event reaches the subscriber whichever worker holds it.
+
+    publish() only queues the event; one sender thread does the network
+    round-trips, so neither the event loop (async routes) nor a threadpool
+    worker (sync routes) waits on Redis. Events keep their publish order.
+    """
+
+    def __init__(self, url: str, prefix: str = "mb:events:"):
+        import redis  # optional dependency
+        import redis.asyncio
+
+        self._r = redis.Redis.from_url(url)
+        self._async = redis.asyncio.Redis.from_url(url)
+        self._errors = (redis.RedisError, OSError)
+        self.prefix = prefix
+        self.published = 0
+        self.failed = 0
+        self._local = 0  # subscriptions held by this worker
+        self._outbox: queue.SimpleQueue = queue.SimpleQueue()
+        threading.Thread(target=self._send_loop, name="events-redis", daemon=True).start()
+
+    def publish(self, channel: str, event: dict) -> None:
+        self._outbox.put((self.prefix + channel, dumps(event)))
+        self.published += 1
+
+    def _send_loop(self) -> None:
+        while True:
+            channel, payload = self._outbox.get()
+            try:
+                self._r.publish(channel, payload)
+            except self._errors as e:
+                # Best effort, like a dropped local event: the page re-syncs over HTTP
+                self.failed += 1
+                print(f"❌ Redis event publish error: {type(e).__name__}: {e}")
+
+    @asynccontextmanager
+    async def subscribe(self, channel: str):
+        pubsub = self._async.pubsub()
+        await pubsub.subscribe(self.prefix + channel)
+        self._local += 1
+        try:
+            yield _RedisSubscription(pubsub)
+        finally:
+            self._local -= 1
+            await pubsub.unsubscribe()
+            await pubsub.aclose()
+
+    def subscriber_count(self) -> int:
+        return self._local
+
+
+def _build_broker():
+    if settings.events_redis_url:
+        return RedisBroker(settings.events_redis_url)
+    return LocalBroker(settings.events_max_queued)
+
+
+broker = _build_broker()
+
+
+# ---------------------------------------------------------
+# Publishing helpers (call after commit)
+# ---------------------------------------------------------
+def student_channel(student_id: int) -> str:
+    return f"student:{student_id}"
+
+
+def notify_student(student_id: int, event_type: str, **payload) -> None:
+    if settings.events_enabled:
+        broker.publish(student_channel(student_id), {"type": event_type, **payload})
+
+
+def message_dict(msg) -> dict:
+    return {
+        "id": msg.id, "sender_id": msg.sender_id, "receiver_id": msg.receiver_id,
+        "sender_type": msg.sender_type, "receiver_type": msg.receiver_type,
+        "content": msg.content, "created_at": msg.created_at,
+    }
+
+
+def connection_dict(req) -> dict:
+    return {
+        "id": req.id, "student_id": req.student_id, "alumni_id": req.alumni_id,
+        "status": req.status, "created_at": req.created_at,
+    }
+
+
+def stats() -> dict:
+    return {
+        "enabled": settings.events_enabled,
+        "broker": type(broker).__name__,
+        "subscribers": broker.subscriber_count(),
+        "published": broker.published,
+    }
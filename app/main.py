@@ -1,8 +1,15 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 
-from .database import engine
-from . import models
+from .config import settings
+from .database import engine, init_db
+from .async_database import async_engine
+from .cache import entity_cache
+from .responses import DefaultJSONResponse
+from . import compression, metrics, profiling
 from .routers import email as email_router
 from .routers import alumni as alumni_router
 
@@ -12,11 +19,24 @@ from .routers import recommend as recommend_router
 from .routers import feedback as feedback_router
 from .routers import connections as connections_router
 from .routers import chat as chat_router
+from .routers import admin as admin_router
+from .routers import export as export_router
+from .routers import events as events_router
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Schema is managed by Alembic; this only fills in missing tables for local runs
+    if settings.db_create_tables:
+        init_db()
+    yield
 
-# Create DB tables
-models.Base.metadata.create_all(bind=engine)
 
-app = FastAPI(title="Alumni Recommendation Backend")
+app = FastAPI(
+    title="Alumni Recommendation Backend",
+    lifespan=lifespan,
+    default_response_class=DefaultJSONResponse,
+)
 
 # ✅ CORS – ADD YOUR ACTUAL FRONTEND URL
 origins = [
@@ -34,6 +54,19 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+if settings.profiling_enabled:
+    profiling.install(app, (engine, async_engine.sync_engine))
+    app.include_router(admin_router.router)
+
+if settings.compression_enabled:
+    app.add_middleware(compression.CompressionMiddleware)
+
+# Added last = outermost, so the timings include CORS handling
+if settings.metrics_enabled:
+    metrics.instrument_engine(engine)
+    metrics.instrument_engine(async_engine.sync_engine)
+    app.add_middleware(metrics.MetricsMiddleware)
+
 # Include routers
 app.include_router(alumni_router.router)
 app.include_router(students_router.router)
@@ -42,7 +75,22 @@ app.include_router(feedback_router.router)
 app.include_router(connections_router.router)
 app.include_router(chat_router.router)
 app.include_router(email_router.router)
+app.include_router(export_router.router)
+if settings.events_enabled:
+    app.include_router(events_router.router)
 
 @app.get("/")
 def home():
     return {"message": "Backend working successfully 🚀"}
+
+
+@app.get("/cache/stats")
+def cache_stats():
+    """Hit/miss counters and size of the Student/Alumni profile cache."""
+    return entity_cache.stats()
+
+
+@app.get("/metrics", include_in_schema=False)
+def prometheus_metrics():
+    """Prometheus text exposition of this worker's request / SQL / external-call histograms."""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
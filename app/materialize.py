@@ -0,0 +1,135 @@
+"""
+Bulk materialization of recommendation candidates (run nightly / off-peak).
+
+    python -m app.materialize [--batch 500] [--top-n 50]
+
+For every student, score all alumni on the snapshot exactly like the live
+path (routers/recommend.candidate_rows) and store the best top-N in
+`student_recommendations`, stamped with the student's profile_version.
+
+recommend_for_student serves from there while the row set is fresh
+(profile_version unchanged and younger than MATERIALIZED_MAX_AGE_HOURS):
+one indexed read on (student_id, rank), joined to the alumni rows (the
+reason text is stored too, so no student profile is needed). The
+bandit / shuffle still picks top_k out of the stored top-N on each call.
+Anything stale falls back to live scoring.
+"""
+import argparse
+import time
+from datetime import datetime
+
+import numpy as np
+from sqlalchemy import delete, insert, select
+
+from .alumni_store import alumni_store, AlumniRecord
+from .config import settings
+from .embeddings import get_index
+from . import models, versions
+
+_STUDENTS = select(
+    models.Student.id, models.Student.skills, models.Student.interests,
+    models.Student.career_goal, models.Student.profile_version,
+)
+
+
+def top_candidates(student, snap, index, top_n: int, rng):
+    """(rows, scores, skill scores) of the best top_n candidates; ties in random order."""
+    from .routers.recommend import candidate_rows
+
+    candidates, scores, skill = candidate_rows(student, snap, index)
+    candidates = rng.permutation(candidates)
+    top = candidates[np.argsort(-scores[candidates], kind="stable")[:top_n]]
+    return top, scores[top], skill[top]
+
+
+def materialize_batch(db, students, snap, index, top_n: int, now: datetime, rng) -> int:
+    """
+    Replace the stored candidates of `students` (caller commits). Returns rows written.
+
+    Scores first, then re-reads the students' profile_version with a shared
+    row lock held until commit: a profile PATCHed while the batch was
+    scoring is skipped (its rows were scored from the old profile), and a
+    PATCH arriving later waits for the commit, then deletes our rows itself.
+    Lock order (students, then student_recommendations) matches the PATCH.
+    On SQLite the DELETE's write lock serializes the two instead.
+    """
+    from .routers.recommend import recommendation_reason
+
+    scored = {}
+    for student in students:
+        top, scores, skill = top_candidates(student, snap, index, top_n, rng)
+        scored[student.id] = [
+            {
+                "student_id": student.id,
+                "rank": rank,
+                "alumni_id": int(snap.ids[row]),
+                "match_score": float(score),
+                "skill_score": float(skill_score),
+                "reason": recommendation_reason(student, AlumniRecord(snap, int(row)), float(score), float(skill_score)),
+                "profile_version": student.profile_version or 0,
+                "computed_at": now,
+            }
+            for rank, (row, score, skill_score) in enumerate(zip(top, scores, skill))
+        ]
+
+    ids = [s.id for s in students]
+    current = dict(db.execute(
+        select(models.Student.id, models.Student.profile_version)
+        .where(models.Student.id.in_(ids))
+        .with_for_update(read=True)
+    ).all())
+    db.execute(
+        delete(models.StudentRecommendation)
+        .where(models.StudentRecommendation.student_id.in_(ids))
+    )
+    rows = [
+        row
+        for student in students
+        if (current.get(student.id) or 0) == (student.profile_version or 0)
+        for row in scored[student.id]
+    ]
+    if rows:
+        db.execute(insert(models.StudentRecommendation), rows)
+    return len(rows)
+
+
+def materialize_all(db, batch: int = 500, top_n: int = None, seed: int = None) -> dict:
+    """Every student, `batch` at a time (keyset on id), one commit per batch."""
+    top_n = top_n or settings.materialize_top_n
+    rng = np.random.default_rng(seed)
+    snap = alumni_store.ensure_fresh(db)
+    index = get_index()
+    now = datetime.utcnow()
+
+    students = rows = 0
+    last_id = 0
+    while True:
+        chunk = db.execute(_STUDENTS.where(models.Student.id > last_id).order_by(models.Student.id).limit(batch)).all()
+        if not chunk:
+            break
+        rows += materialize_batch(db, chunk, snap, index, top_n, now, rng)
+        db.commit()
+        students += len(chunk)
+        last_id = chunk[-1].id
+
+    versions.bump(db, "recommendations")
+    db.commit()
+
+    return {"students": students, "rows": rows, "top_n": top_n, "computed_at": now.isoformat()}
+
+
+if __name__ == "__main__":
+    from .database import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Precompute top-N recommendation candidates for every student")
+    parser.add_argument("--batch", type=int, default=500)
+    parser.add_argument("--top-n", type=int, default=None)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        t0 = time.perf_counter()
+        result = materialize_all(db, args.batch, args.top_n)
+        print(f"materialized {result['rows']} rows for {result['students']} students in {time.perf_counter() - t0:.1f}s")
+    finally:
+        db.close()
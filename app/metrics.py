@@ -0,0 +1,190 @@
+"""
+Request instrumentation, exposed in Prometheus text format at GET /metrics.
+
+- http_request_duration_seconds{method,route,status}   histogram per route
+  template (/recommend/student/{student_id}, not one series per id)
+- http_request_db_statements{route}                    SQL statements per request
+- db_statement_duration_seconds{route}                 time per SQL statement
+- external_call_duration_seconds{service,outcome}      LLM (groq) / SMTP calls
+
+SQL is attributed to the request through a contextvar holding a mutable
+per-request tally: it is visible from FastAPI's threadpool (sync routes)
+and from SQLAlchemy's greenlets (AsyncSession) alike. The middleware is a
+plain ASGI callable (no BaseHTTPMiddleware task / stream overhead), and
+each observation is a bisect + two adds under a lock.
+
+Numbers are per worker process: scrape each worker, or aggregate in
+Prometheus with sum by (...).
+"""
+import contextvars
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Optional, Tuple
+
+from sqlalchemy import event
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 500)
+EXTERNAL_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class Histogram:
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...], buckets):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = tuple(buckets)
+        self._series = {}  # label values -> [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, labels: Tuple[str, ...], value: float) -> None:
+        i = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * (len(self.buckets) + 2)
+            if i < len(self.buckets):
+                series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self):
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} histogram"
+        with self._lock:
+            items = [(labels, list(series)) for labels, series in self._series.items()]
+        for labels, series in sorted(items):
+            base = ",".join(f'{k}="{_escape(v)}"' for k, v in zip(self.labelnames, labels))
+            sep = "," if base else ""
+            cumulative = 0
+            for bound, n in zip(self.buckets, series):
+                cumulative += n
+                yield f'{self.name}_bucket{{{base}{sep}le="{bound}"}} {cumulative}'
+            yield f'{self.name}_bucket{{{base}{sep}le="+Inf"}} {series[-1]}'
+            yield f"{self.name}_sum{{{base}}} {series[-2]}"
+            yield f"{self.name}_count{{{base}}} {series[-1]}"
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+request_duration = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template.",
+    ("method", "route", "status"), LATENCY_BUCKETS,
+)
+request_statements = Histogram(
+    "http_request_db_statements", "SQL statements issued per HTTP request.",
+    ("route",), COUNT_BUCKETS,
+)
+statement_duration = Histogram(
+    "db_statement_duration_seconds", "SQL statement execution time.",
+    ("route",), STATEMENT_BUCKETS,
+)
+external_duration = Histogram(
+    "external_call_duration_seconds", "Outbound LLM / SMTP call duration.",
+    ("service", "outcome"), EXTERNAL_BUCKETS,
+)
+REGISTRY = (request_duration, request_statements, statement_duration, external_duration)
+
+
+def render() -> str:
+    return "\n".join(line for metric in REGISTRY for line in metric.render()) + "\n"
+
+
+# ---------------------------------------------------------
+# Per-request SQL tally
+# ---------------------------------------------------------
+class RequestStats:
+    __slots__ = ("scope", "statements", "sql_seconds", "listeners")
+
+    def __init__(self, scope):
+        self.scope = scope
+        self.statements = 0
+        self.sql_seconds = 0.0
+        self.listeners = ()  # extra per-statement callbacks (app/profiling.py)
+
+    @property
+    def route(self) -> str:
+        # The router stores the matched APIRoute in the (shared) scope dict
+        route = self.scope.get("route")
+        return route.path if route is not None else "unmatched"
+
+
+current_request: contextvars.ContextVar[Optional[RequestStats]] = contextvars.ContextVar(
+    "current_request", default=None
+)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # On the execution context, not the connection: a statement that fails
+    # never reaches after_cursor_execute, and its start time goes with it
+    context._query_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - context._query_start
+    stats = current_request.get()
+    if stats is None:
+        statement_duration.observe(("background",), elapsed)
+        return
+    statement_duration.observe((stats.route,), elapsed)
+    stats.statements += 1
+    stats.sql_seconds += elapsed
+    for listener in stats.listeners:
+        listener(statement, elapsed)
+
+
+def instrument_engine(engine) -> None:
+    """Attach the statement timers to a (sync) Engine; pass async_engine.sync_engine for async."""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+@contextmanager
+def timed_call(service: str):
+    """Time an outbound call: `with timed_call("groq"): ...`."""
+    outcome = "error"
+    start = time.perf_counter()
+    try:
+        yield
+        outcome = "ok"
+    finally:
+        external_duration.observe((service, outcome), time.perf_counter() - start)
+
+
+# ---------------------------------------------------------
+# ASGI middleware
+# ---------------------------------------------------------
+class MetricsMiddleware:
+    def __init__(self, app, skip_paths=("/metrics",)):
+        self.app = app
+        self.skip_paths = set(skip_paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.skip_paths:
+            return await self.app(scope, receive, send)
+
+        stats = RequestStats(scope)
+        token = current_request.set(stats)
+        status_code = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            current_request.reset(token)
+            route = stats.route
+            request_duration.observe((scope["method"], route, str(status_code)), elapsed)
+            request_statements.observe((route,), stats.statements)
@@ -2,7 +2,7 @@ from sqlalchemy import Column, Integer, String, Boolean, Float, ForeignKey
 from sqlalchemy.orm import relationship
 
 from .database import Base
-from sqlalchemy import Column, Integer, String, Boolean, Float, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, Boolean, Float, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 
@@ -23,6 +23,10 @@ class Student(Base):
     interests = Column(String, nullable=True)     # comma-separated
     career_goal = Column(String, nullable=True)
 
+    # Bumped on every profile update; precomputed recommendations carry
+    # the version they were computed for
+    profile_version = Column(Integer, nullable=False, default=0, server_default="0")
+
     # One student → many interactions
     interactions = relationship("Interaction", back_populates="student")
 
@@ -58,17 +62,88 @@ class Interaction(Base):
     id = Column(Integer, primary_key=True, index=True)
 
     student_id = Column(Integer, ForeignKey("students.id"))
-    alumni_id = Column(Integer, ForeignKey("alumni.id"))
+    alumni_id = Column(Integer, ForeignKey("alumni.id"), index=True)
 
     rating = Column(Float, nullable=True)         # 1–5
     comment = Column(String, nullable=True)
     reward = Column(Float, nullable=True)         # for RL later
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=True)
 
     # Relationships
     student = relationship("Student", back_populates="interactions")
     alumni = relationship("Alumni", back_populates="interactions")
 
 
+class AlumniRatingStats(Base):
+    """
+    Running totals of `interactions` per alumni, kept up to date by
+    submit_feedback in the same transaction (averages = sum / count).
+    """
+    __tablename__ = "alumni_rating_stats"
+
+    alumni_id = Column(Integer, ForeignKey("alumni.id"), primary_key=True)
+
+    feedback_count = Column(Integer, nullable=False, default=0)
+    rating_count = Column(Integer, nullable=False, default=0)   # rows with a rating
+    rating_sum = Column(Float, nullable=False, default=0.0)
+    reward_sum = Column(Float, nullable=False, default=0.0)
+    last_feedback_at = Column(DateTime, nullable=True)
+
+
+class StudentRecommendation(Base):
+    """
+    Precomputed top-N candidates per student (app/materialize.py).
+    Valid while profile_version matches the student's.
+    """
+    __tablename__ = "student_recommendations"
+
+    student_id = Column(Integer, ForeignKey("students.id"), primary_key=True)
+    rank = Column(Integer, primary_key=True)
+
+    alumni_id = Column(Integer, ForeignKey("alumni.id"), nullable=False)
+    match_score = Column(Float, nullable=False)
+    skill_score = Column(Float, nullable=False)   # skill-overlap part of match_score
+    reason = Column(String, nullable=True)
+    profile_version = Column(Integer, nullable=False)
+    computed_at = Column(DateTime, nullable=False)
+
+
+class DataVersion(Base):
+    """
+    Change counters behind the ETag / Last-Modified headers (app/versions.py),
+    bumped by the write paths in the same transaction as the change.
+    """
+    __tablename__ = "data_versions"
+
+    key = Column(String, primary_key=True)        # "alumni", "student:42", "chat:42:7", ...
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, nullable=False)
+
+
+class ConversationSummary(Base):
+    """
+    One inbox row per (user, conversation): unread count + last-message
+    preview, kept up to date by chat send / mark-read in the same
+    transaction, so listing an inbox never scans `messages`.
+    """
+    __tablename__ = "conversation_summaries"
+
+    user_type = Column(String, primary_key=True)    # "student" / "alumni_ai" (the inbox owner)
+    user_id = Column(Integer, primary_key=True)
+    peer_id = Column(Integer, primary_key=True)     # the other side of the conversation
+    peer_type = Column(String, nullable=False)
+
+    unread_count = Column(Integer, nullable=False, default=0)
+    last_message_id = Column(Integer, nullable=False)  # newest first = ORDER BY this DESC
+    last_message_preview = Column(String, nullable=False)
+    last_sender_type = Column(String, nullable=False)
+    last_message_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        Index("ix_conversation_summaries_inbox", "user_type", "user_id", "last_message_id"),
+    )
+
+
 class ConnectionRequest(Base):
     __tablename__ = "connection_requests"
 
@@ -81,8 +156,10 @@ class ConnectionRequest(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
 
     # relationships (optional, helpful)
-    student = relationship("Student", backref="connection_requests")
-    alumni = relationship("Alumni", backref="connection_requests")
+    # raise_on_sql: listing code must eager-load these (selectinload/joinedload),
+    # a silent per-row lazy load would be an N+1 (and fails under AsyncSession anyway)
+    student = relationship("Student", backref="connection_requests", lazy="raise_on_sql")
+    alumni = relationship("Alumni", backref="connection_requests", lazy="raise_on_sql")
 
 
 class Message(Base):
@@ -0,0 +1,123 @@
+"""
+Password hashing: salted scrypt (stdlib hashlib), run off the event loop.
+
+Stored format:   scrypt$<n>$<r>$<p>$<salt b64>$<hash b64>
+Legacy format:   64 hex chars = unsalted SHA-256 (the old hash_password).
+                 Still accepted at login and transparently re-hashed.
+Unusable:        "!" + random (seeded accounts: nobody can log in until a
+                 password is set; no shared default password).
+
+scrypt costs ~n * r * 128 bytes of memory and tens of ms of CPU per call
+by design. hashlib.scrypt releases the GIL, so the work goes to a bounded
+thread pool (PASSWORD_HASH_WORKERS): at most that many KDF computations
+run at once, and the event loop keeps serving other requests meanwhile.
+Unknown e-mails and unusable hashes are checked against a dummy hash so a
+failed login costs the same whether or not the account exists or has a
+password set.
+"""
+import asyncio
+import base64
+import hashlib
+import hmac
+import os
+import secrets
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
+
+from .config import settings
+
+SCHEME = "scrypt"
+_DKLEN = 32
+
+_executor = ThreadPoolExecutor(max_workers=settings.password_hash_workers, thread_name_prefix="kdf")
+
+
+def _b64(raw: bytes) -> str:
+    return base64.b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _unb64(text: str) -> bytes:
+    return base64.b64decode(text + "=" * (-len(text) % 4))
+
+
+def _scrypt(password: str, salt: bytes, n: int, r: int, p: int) -> bytes:
+    return hashlib.scrypt(
+        password.encode("utf-8"), salt=salt, n=n, r=r, p=p,
+        maxmem=256 * n * r * p, dklen=_DKLEN,
+    )
+
+
+def _is_legacy(stored: str) -> bool:
+    return len(stored) == 64 and all(c in "0123456789abcdef" for c in stored)
+
+
+# ---------------- blocking primitives (run these in the pool) ----------------
+def hash_password(password: str) -> str:
+    n, r, p = settings.scrypt_n, settings.scrypt_r, settings.scrypt_p
+    salt = os.urandom(16)
+    return f"{SCHEME}${n}${r}${p}${_b64(salt)}${_b64(_scrypt(password, salt, n, r, p))}"
+
+
+def unusable_password() -> str:
+    return "!" + secrets.token_urlsafe(16)
+
+
+def needs_rehash(stored: str) -> bool:
+    if _is_legacy(stored):
+        return True
+    parts = stored.split("$")
+    return parts[0] == SCHEME and parts[1:4] != [
+        str(settings.scrypt_n), str(settings.scrypt_r), str(settings.scrypt_p)
+    ]
+
+
+def verify_password(password: str, stored: Optional[str]) -> bool:
+    if not stored or stored.startswith("!"):
+        burn_verify(password)  # no timing difference for accounts without a password
+        return False
+    if _is_legacy(stored):
+        digest = hashlib.sha256(password.encode("utf-8")).hexdigest()
+        return hmac.compare_digest(digest, stored)
+    try:
+        scheme, n, r, p, salt, expected = stored.split("$")
+        if scheme != SCHEME:
+            return False
+        actual = _scrypt(password, _unb64(salt), int(n), int(r), int(p))
+    except (ValueError, TypeError):
+        return False
+    return hmac.compare_digest(actual, _unb64(expected))
+
+
+def verify_and_update(password: str, stored: Optional[str]) -> Tuple[bool, Optional[str]]:
+    """(valid, new hash to store or None). New hash = legacy / outdated parameters."""
+    if not verify_password(password, stored):
+        return False, None
+    return True, hash_password(password) if needs_rehash(stored) else None
+
+
+_DUMMY: Optional[str] = None
+
+
+def burn_verify(password: str) -> None:
+    """Same cost as a real check, for unknown e-mails and unusable hashes."""
+    global _DUMMY
+    if _DUMMY is None:
+        _DUMMY = hash_password(secrets.token_urlsafe(16))
+    verify_password(password, _DUMMY)
+
+
+# ---------------- pool-backed entry points ----------------
+async def ahash_password(password: str) -> str:
+    return await asyncio.get_running_loop().run_in_executor(_executor, hash_password, password)
+
+
+async def averify_and_update(password: str, stored: Optional[str]) -> Tuple[bool, Optional[str]]:
+    if stored is None:
+        await asyncio.get_running_loop().run_in_executor(_executor, burn_verify, password)
+        return False, None
+    return await asyncio.get_running_loop().run_in_executor(_executor, verify_and_update, password, stored)
+
+
+def hash_password_pooled(password: str) -> str:
+    """For sync routes (already in a worker thread): still bounded by the KDF pool."""
+    return _executor.submit(hash_password, password).result()
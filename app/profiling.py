@@ -0,0 +1,165 @@
+"""
+Opt-in per-request profiling with slow-request capture.
+
+Off unless PROFILING_ENABLED=true: the middleware is then not even in
+the stack, so normal traffic pays nothing. When enabled, a request is
+profiled if it carries `X-Profile: <PROFILING_TOKEN>` or wins the
+PROFILING_SAMPLE_RATE draw. Without a PROFILING_TOKEN the header is
+ignored (only sampling profiles) and /admin/profiles answers 403.
+Everything else passes straight through after one header scan and one
+random().
+
+A profiled request runs under cProfile and collects its SQL (statement
+text + time, no parameters) through the app/metrics.py request tally.
+The PROFILING_KEEP slowest profiles are kept in memory and served at
+/admin/profiles; the response carries `X-Profile-Id` to find its entry.
+
+cProfile can only run one profiler per thread, so one request is
+profiled at a time; requests arriving meanwhile are skipped. The
+profile covers the event-loop thread, so other coroutines that ran
+during the request show up too, and sync (threadpool) handlers appear
+as their run_in_threadpool await. Per worker, like the metrics.
+"""
+import cProfile
+import heapq
+import hmac
+import io
+import itertools
+import pstats
+import random
+import threading
+import time
+from datetime import datetime
+from typing import List, Optional
+
+from .config import settings
+from .metrics import RequestStats, current_request, instrument_engine
+
+
+class ProfileStore:
+    """The `keep` slowest profiles, as a min-heap on duration."""
+
+    def __init__(self, keep: int = 20):
+        self.keep = keep
+        self._heap = []
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def next_id(self) -> int:
+        return next(self._ids)
+
+    def add(self, entry: dict) -> None:
+        item = (entry["duration_ms"], entry["id"], entry)
+        with self._lock:
+            if len(self._heap) < self.keep:
+                heapq.heappush(self._heap, item)
+            elif item > self._heap[0]:
+                heapq.heapreplace(self._heap, item)
+
+    def list(self) -> List[dict]:
+        with self._lock:
+            entries = [e for _, _, e in self._heap]
+        return sorted(entries, key=lambda e: -e["duration_ms"])
+
+    def get(self, profile_id: int) -> Optional[dict]:
+        with self._lock:
+            return next((e for _, i, e in self._heap if i == profile_id), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._heap.clear()
+
+
+profiles = ProfileStore(settings.profiling_keep)
+
+
+def format_stats(profiler: cProfile.Profile, limit: int) -> str:
+    out = io.StringIO()
+    stats = pstats.Stats(profiler, stream=out)
+    stats.sort_stats("cumulative").print_stats(limit)
+    return out.getvalue()
+
+
+class ProfilingMiddleware:
+    """Add inside MetricsMiddleware so both share the request tally."""
+
+    def __init__(self, app, header: str = None, token: str = None, sample_rate: float = None):
+        self.app = app
+        self.header = (header or settings.profiling_header).lower().encode("latin-1")
+        self.token = token if token is not None else settings.profiling_token
+        self.sample_rate = settings.profiling_sample_rate if sample_rate is None else sample_rate
+        self._busy = threading.Lock()
+
+    def _wanted(self, scope) -> bool:
+        for name, value in scope["headers"]:
+            if name == self.header:
+                # Fail closed: no configured token, no client-triggered profiles
+                return bool(self.token) and hmac.compare_digest(value, self.token.encode("latin-1"))
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self._wanted(scope):
+            return await self.app(scope, receive, send)
+        if not self._busy.acquire(blocking=False):
+            return await self.app(scope, receive, send)
+        try:
+            await self._profile(scope, receive, send)
+        finally:
+            self._busy.release()
+
+    async def _profile(self, scope, receive, send):
+        profile_id = profiles.next_id()
+        sql = []
+        max_sql = settings.profiling_max_statements
+
+        def record_sql(statement, elapsed):
+            if len(sql) < max_sql:
+                sql.append({"ms": round(elapsed * 1000, 3), "statement": statement})
+
+        stats = current_request.get()
+        token = None
+        if stats is None:  # metrics disabled: keep our own tally
+            stats = RequestStats(scope)
+            token = current_request.set(stats)
+        stats.listeners = stats.listeners + (record_sql,)
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"x-profile-id", str(profile_id).encode())
+                ]
+            await send(message)
+
+        profiler = cProfile.Profile()
+        start = time.perf_counter()
+        profiler.enable()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            profiler.disable()
+            elapsed = time.perf_counter() - start
+            if token is not None:
+                current_request.reset(token)
+            profiles.add({
+                "id": profile_id,
+                "at": datetime.utcnow().isoformat(),
+                "method": scope["method"],
+                "path": scope["path"],
+                "route": stats.route,
+                "status": status_code,
+                "duration_ms": round(elapsed * 1000, 2),
+                "sql_count": stats.statements,
+                "sql_ms": round(stats.sql_seconds * 1000, 2),
+                "sql": sql,
+                "profile": format_stats(profiler, settings.profiling_stats_limit),
+            })
+
+
+def install(app, engines) -> None:
+    """Called from main.py when PROFILING_ENABLED; engines get the SQL timers."""
+    for engine in engines:
+        instrument_engine(engine)
+    app.add_middleware(ProfilingMiddleware)
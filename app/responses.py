@@ -0,0 +1,52 @@
+"""
+JSON response classes.
+
+DefaultJSONResponse is the app-wide default: ORJSONResponse when orjson
+is installed (several times faster than json.dumps on large lists),
+the standard JSONResponse otherwise.
+
+TrustedJSONResponse is the fast path for large list endpoints whose rows
+come straight from our own column selects: returning a Response makes
+FastAPI skip response_model validation, and the plain dicts / tuples go
+directly to orjson. The route keeps its response_model for the OpenAPI
+schema; the selected columns must match it (same names, same types).
+"""
+import json
+from datetime import date, datetime
+from typing import List
+
+from fastapi.responses import JSONResponse, ORJSONResponse, Response
+
+try:
+    import orjson
+except ImportError:  # optional: falls back to the stdlib encoder
+    orjson = None
+
+DefaultJSONResponse = ORJSONResponse if orjson is not None else JSONResponse
+
+
+def _default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(content, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class TrustedJSONResponse(Response):
+    """Serialize pre-shaped rows as-is (no validation, no jsonable_encoder)."""
+
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        return dumps(content)
+
+
+def row_dicts(result) -> List[dict]:
+    """A column select's Result -> list of {column label: value}."""
+    keys = list(result.keys())
+    return [dict(zip(keys, row)) for row in result]
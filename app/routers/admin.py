@@ -0,0 +1,55 @@
+import hmac
+
+from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi.responses import PlainTextResponse
+from typing import Optional
+
+from ..config import settings
+from ..profiling import profiles
+
+router = APIRouter(
+    prefix="/admin",
+    tags=["Admin"]
+)
+
+
+def require_admin_token(x_profile_token: Optional[str] = Header(None)):
+    """
+    PROFILING_TOKEN guards both triggering profiles and reading them.
+    Fail closed: no configured token means no access at all.
+    """
+    if not settings.profiling_token or not hmac.compare_digest(
+        (x_profile_token or "").encode(), settings.profiling_token.encode()
+    ):
+        raise HTTPException(status_code=403, detail="Invalid profiling token")
+
+
+# ---------------------------------------------------------
+# Slowest profiled requests (app/profiling.py)
+# ---------------------------------------------------------
+@router.get("/profiles", dependencies=[Depends(require_admin_token)])
+def list_profiles():
+    """Profiled requests, slowest first (without the profile / SQL bodies)."""
+    return [
+        {k: v for k, v in entry.items() if k not in ("profile", "sql")}
+        for entry in profiles.list()
+    ]
+
+
+@router.get("/profiles/{profile_id}", dependencies=[Depends(require_admin_token)])
+def get_profile(profile_id: int, format: str = "json"):
+    entry = profiles.get(profile_id)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Profile not found (or evicted)")
+    if format == "text":
+        sql = "\n".join(f"{q['ms']:>9.3f} ms  {q['statement']}" for q in entry["sql"])
+        return PlainTextResponse(
+            f"{entry['method']} {entry['path']} -> {entry['status']} in {entry['duration_ms']} ms\n\n"
+            f"SQL: {entry['sql_count']} statements, {entry['sql_ms']} ms\n{sql}\n\n{entry['profile']}"
+        )
+    return entry
+
+
+@router.delete("/profiles", status_code=204, dependencies=[Depends(require_admin_token)])
+def clear_profiles():
+    profiles.clear()
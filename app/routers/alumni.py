@@ -1,11 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.orm import Session
 from pathlib import Path
-import pandas as pd
 import time
 import random
 from ..database import get_db
-from .. import models, schemas
+from ..cache import entity_cache
+from ..alumni_store import alumni_store
+from ..embeddings import index_alumni
+from ..compression import precompressed
+from ..responses import dumps
+from .. import models, schemas, versions
 
 router = APIRouter(
     prefix="/alumni",
@@ -17,9 +21,18 @@ router = APIRouter(
 # 1) Get all alumni
 # ---------------------------------------------------------
 @router.get("/", response_model=list[schemas.AlumniOut])
-def get_all_alumni(db: Session = Depends(get_db)):
-    """Return all alumni from the database."""
-    return db.query(models.Alumni).all()
+def get_all_alumni(request: Request, db: Session = Depends(get_db)):
+    """
+    Return all alumni (from the in-memory columnar snapshot, kept in sync with the DB).
+    The encoded body (and its gzip/br variants) is reused until the snapshot changes.
+    """
+    cond = versions.check(request, db, ["alumni"])
+    if cond.not_modified:
+        return cond.not_modified_response()
+    snap = alumni_store.ensure_fresh(db)
+    return cond.apply(precompressed.response(
+        request, "alumni", (cond.etag, snap), lambda: dumps(alumni_store.to_dicts(snap))
+    ))
 
 
 # ---------------------------------------------------------
@@ -46,6 +59,9 @@ def import_alumni_from_csv(db: Session = Depends(get_db)):
     if not csv_path.exists():
         return {"status": "error", "detail": f"CSV file not found at {csv_path}"}
 
+    # pandas is heavy; only pay for it when an import actually runs
+    import pandas as pd
+
     try:
         df = pd.read_csv(csv_path)
         
@@ -85,7 +101,10 @@ def import_alumni_from_csv(db: Session = Depends(get_db)):
             if imported % 50 == 0:
                 db.commit()
 
+        versions.bump(db, "alumni")
         db.commit()
+        entity_cache.bump("alumni")
+        alumni_store.invalidate()
         total = db.query(models.Alumni).count()
 
         return {
@@ -145,15 +164,39 @@ def register_alumni(payload: schemas.AlumniCreate, db: Session = Depends(get_db)
 
     db.add(alumni)
     try:
+        versions.bump(db, "alumni")
         db.commit()
-        db.refresh(alumni)
-        return alumni
     except Exception as e:
         db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"DB error: {str(e)}"
         )
+    db.refresh(alumni)
+    after_register(alumni)
+    return alumni
+
+
+def after_register(alumni) -> None:
+    """
+    Post-commit side effects. The row is committed, so a failure here must
+    not turn into an error response: each derived structure is rebuilt or
+    re-encoded from the DB on a later read anyway.
+    """
+    try:
+        entity_cache.invalidate("alumni", alumni.id)
+    except Exception as e:
+        print(f"❌ Cache invalidate error: {type(e).__name__}: {str(e)}")
+    try:
+        alumni_store.upsert_row(alumni)
+    except Exception as e:
+        print(f"❌ Snapshot append error: {type(e).__name__}: {str(e)}")
+        alumni_store.invalidate()  # next read rebuilds it from the table
+    try:
+        index_alumni(alumni)
+    except Exception as e:
+        # Searches still find the row: alignment encodes alumni missing from the index
+        print(f"❌ Embedding insert error: {type(e).__name__}: {str(e)}")
 
 
 
@@ -1,41 +1,110 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy import case, select, update, delete
 from sqlalchemy.orm import Session
-from typing import List
-import os
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
 
+from ..config import settings
 from ..database import get_db
-from .. import models, schemas
+from ..async_database import get_async_db
+from ..cache import aget_student, aget_alumni
+from ..auth import TokenClaims, optional_claims, authorize_student
+from ..metrics import timed_call
+from ..compression import precompressed
+from ..responses import TrustedJSONResponse, dumps, row_dicts
+from .. import events, models, schemas, versions
 
-# Groq imports
-from dotenv import load_dotenv
-from groq import Groq
+# Groq client is built on first use, not at import (keeps worker cold start cheap)
+_client = None
+_client_ready = False
 
-# Load environment variables
-load_dotenv()
-GROQ_API_KEY = os.getenv("GROQ_API_KEY")
 
-# Initialize Groq client
-if GROQ_API_KEY:
-    client = Groq(api_key=GROQ_API_KEY)
-    print("✅ Groq API configured successfully")
-else:
-    print("⚠️ GROQ_API_KEY not found in .env file")
-    client = None
+def get_groq_client():
+    """Return the shared AsyncGroq client, or None if GROQ_API_KEY is not set."""
+    global _client, _client_ready
+    if not _client_ready:
+        if settings.groq_api_key:
+            from groq import AsyncGroq
+            _client = AsyncGroq(api_key=settings.groq_api_key)
+            print("✅ Groq API configured successfully")
+        else:
+            print("⚠️ GROQ_API_KEY not found in .env file")
+        _client_ready = True
+    return _client
 
 router = APIRouter(
     prefix="/chat",
     tags=["Chat"]
 )
 
+# Exactly the ChatMessageOut fields, for the no-validation history path
+_HISTORY_COLUMNS = select(
+    models.Message.id,
+    models.Message.sender_id,
+    models.Message.receiver_id,
+    models.Message.sender_type,
+    models.Message.receiver_type,
+    models.Message.content,
+    models.Message.created_at,
+)
+
+PREVIEW_CHARS = 120  # last_message_preview length in the inbox
+
+
+def _insert(dialect: str):
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert
+
+
+async def apply_inbox(db: AsyncSession, messages) -> None:
+    """
+    Fold new (flushed) messages into both participants' conversation_summaries
+    rows, one upsert for all of them (caller commits). The receiver's unread
+    count grows; the newest message becomes the preview on both sides.
+    """
+    rows = {}
+    for msg in messages:  # in send order: the last one wins the preview
+        for user_type, user_id, peer_type, peer_id, unread in (
+            (msg.receiver_type, msg.receiver_id, msg.sender_type, msg.sender_id, 1),
+            (msg.sender_type, msg.sender_id, msg.receiver_type, msg.receiver_id, 0),
+        ):
+            previous = rows.get((user_type, user_id, peer_id))
+            rows[(user_type, user_id, peer_id)] = {
+                "user_type": user_type, "user_id": user_id, "peer_id": peer_id, "peer_type": peer_type,
+                "unread_count": (previous["unread_count"] if previous else 0) + unread,
+                "last_message_id": msg.id,
+                "last_message_preview": msg.content[:PREVIEW_CHARS],
+                "last_sender_type": msg.sender_type,
+                "last_message_at": msg.created_at,
+            }
+
+    summary = models.ConversationSummary
+    stmt = _insert(db.get_bind().dialect.name)(summary).values(list(rows.values()))
+    await db.execute(stmt.on_conflict_do_update(
+        index_elements=[summary.user_type, summary.user_id, summary.peer_id],
+        set_={
+            "unread_count": summary.unread_count + stmt.excluded.unread_count,
+            "last_message_id": stmt.excluded.last_message_id,
+            "last_message_preview": stmt.excluded.last_message_preview,
+            "last_sender_type": stmt.excluded.last_sender_type,
+            "last_message_at": stmt.excluded.last_message_at,
+        },
+    ))
+
+
 # -----------------------------
 # GROQ-POWERED ANSWER
 # -----------------------------
-def llm_answer(db: Session, student_id: int, alumni_id: int, user_message: str) -> str:
+async def llm_answer(db: AsyncSession, student_id: int, alumni_id: int, user_message: str) -> str:
     """
     Uses Groq API with Llama 3.3 to generate smart replies
     with context from previous messages in DB.
     """
     
+    client = get_groq_client()
     if not client:
         return (
             "⚠️ AI service is not configured. "
@@ -43,7 +112,7 @@ def llm_answer(db: Session, student_id: int, alumni_id: int, user_message: str)
         )
     
     # ✅ GET ALUMNI INFO FROM DATABASE
-    alumni = db.query(models.Alumni).filter(models.Alumni.id == alumni_id).first()
+    alumni = await aget_alumni(db, alumni_id)
     
     if not alumni:
         alumni_name = "Alumni Mentor"
@@ -55,15 +124,15 @@ def llm_answer(db: Session, student_id: int, alumni_id: int, user_message: str)
         alumni_company = f" at {alumni.company}" if alumni.company else ""
     
     # Load last 10 messages for context
-    history_msgs = (
-        db.query(models.Message)
-        .filter(
+    result = await db.execute(
+        select(models.Message)
+        .where(
             ((models.Message.sender_id == student_id) & (models.Message.receiver_id == alumni_id)) |
             ((models.Message.sender_id == alumni_id) & (models.Message.receiver_id == student_id))
         )
         .order_by(models.Message.created_at.asc())
-        .all()
     )
+    history_msgs = result.scalars().all()
     
     # ✅ BUILD SYSTEM PROMPT WITH REAL ALUMNI INFO
     messages = [
@@ -89,13 +158,14 @@ def llm_answer(db: Session, student_id: int, alumni_id: int, user_message: str)
     messages.append({"role": "user", "content": user_message})
     
     try:
-        response = client.chat.completions.create(
-            model="llama-3.3-70b-versatile",
-            messages=messages,
-            temperature=0.7,
-            max_tokens=1024,
-            top_p=0.95
-        )
+        with timed_call("groq"):
+            response = await client.chat.completions.create(
+                model="llama-3.3-70b-versatile",
+                messages=messages,
+                temperature=0.7,
+                max_tokens=1024,
+                top_p=0.95
+            )
         
         answer = response.choices[0].message.content.strip()
         
@@ -122,21 +192,22 @@ def llm_answer(db: Session, student_id: int, alumni_id: int, user_message: str)
 # SEND MESSAGE ENDPOINT
 # -----------------------------
 @router.post("/send", response_model=schemas.ChatReply)
-def send_message(
+async def send_message(
     body: schemas.ChatMessageCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db),
+    claims: Optional[TokenClaims] = Depends(optional_claims),
 ):
     """
     Student sends a message to AI alumni mentor.
     We store the conversation in 'messages' and return an AI reply.
     """
     
-    # Validate student & alumni exist
-    student = db.query(models.Student).filter(models.Student.id == body.student_id).first()
-    alumni = db.query(models.Alumni).filter(models.Alumni.id == body.alumni_id).first()
-    
-    if not student:
+    # Validate student & alumni exist (a verified token already proves the student)
+    authorize_student(claims, body.student_id)
+    if claims is None and not await aget_student(db, body.student_id):
         raise HTTPException(status_code=404, detail="Student not found")
+    alumni = await aget_alumni(db, body.alumni_id)
+    
     if not alumni:
         raise HTTPException(status_code=404, detail="Alumni not found")
     
@@ -154,7 +225,7 @@ def send_message(
     db.add(msg_user)
     
     # Generate AI reply via Groq
-    ai_text = llm_answer(db, body.student_id, body.alumni_id, body.message)
+    ai_text = await llm_answer(db, body.student_id, body.alumni_id, body.message)
     
     # Store AI's reply
     msg_bot = models.Message(
@@ -165,8 +236,16 @@ def send_message(
         content=ai_text,
     )
     db.add(msg_bot)
+    await db.flush()  # ids for the inbox rows
+    await apply_inbox(db, [msg_user, msg_bot])
+    await versions.abump(db, f"chat:{body.student_id}:{body.alumni_id}")
     
-    db.commit()
+    await db.commit()
+    # Other open tabs / pages get both messages without re-fetching the history
+    events.notify_student(
+        body.student_id, "message",
+        alumni_id=body.alumni_id, messages=[events.message_dict(msg_user), events.message_dict(msg_bot)],
+    )
     
     return schemas.ChatReply(reply=ai_text)
 
@@ -177,31 +256,134 @@ def send_message(
 def get_chat_history(
     student_id: int,
     alumni_id: int,
-    db: Session = Depends(get_db)
+    request: Request,
+    db: Session = Depends(get_db),
+    claims: Optional[TokenClaims] = Depends(optional_claims),
 ):
     """
     Return full chat history between this student and this AI alumni.
+    304 while nothing was sent or cleared since the client's copy; the
+    encoded (and compressed) body is reused for the same version.
     """
-    msgs = (
-        db.query(models.Message)
-        .filter(
-            ((models.Message.sender_id == student_id) & (models.Message.receiver_id == alumni_id)) |
-            ((models.Message.sender_id == alumni_id) & (models.Message.receiver_id == student_id))
+    authorize_student(claims, student_id)
+    key = f"chat:{student_id}:{alumni_id}"
+    cond = versions.check(request, db, [key])
+    if cond.not_modified:
+        return cond.not_modified_response()
+
+    def build() -> bytes:
+        result = db.execute(
+            _HISTORY_COLUMNS
+            .where(
+                ((models.Message.sender_id == student_id) & (models.Message.receiver_id == alumni_id)) |
+                ((models.Message.sender_id == alumni_id) & (models.Message.receiver_id == student_id))
+            )
+            .order_by(models.Message.created_at.asc())
         )
-        .order_by(models.Message.created_at.asc())
-        .all()
+        return dumps(row_dicts(result))
+
+    return cond.apply(precompressed.response(request, key, cond.etag, build))
+
+# -----------------------------
+# INBOX + MARK READ
+# -----------------------------
+@router.get("/inbox/{student_id}", response_model=schemas.InboxPage)
+async def get_inbox(
+    student_id: int,
+    limit: int = Query(20, ge=1, le=100),
+    before_id: Optional[int] = None,
+    db: AsyncSession = Depends(get_async_db),
+    claims: Optional[TokenClaims] = Depends(optional_claims),
+):
+    """
+    The student's conversations, most recent first, with unread counts and
+    a preview of the last message: one indexed read of conversation_summaries,
+    keyset-paginated (pass next_before_id as ?before_id=).
+    """
+    authorize_student(claims, student_id)
+    summary = models.ConversationSummary
+    stmt = (
+        select(
+            summary.peer_id.label("alumni_id"),
+            models.Alumni.name.label("alumni_name"),
+            summary.unread_count,
+            summary.last_message_id,
+            summary.last_message_preview,
+            summary.last_sender_type,
+            summary.last_message_at,
+        )
+        .outerjoin(models.Alumni, models.Alumni.id == summary.peer_id)
+        .where(summary.user_type == "student", summary.user_id == student_id)
+        .order_by(summary.last_message_id.desc())
+        .limit(limit)
     )
-    
-    return msgs
+    if before_id is not None:
+        stmt = stmt.where(summary.last_message_id < before_id)
+
+    items = row_dicts(await db.execute(stmt))
+    next_before_id = items[-1]["last_message_id"] if len(items) == limit else None
+    return TrustedJSONResponse({"items": items, "next_before_id": next_before_id})
+
+
+@router.post("/read")
+async def mark_read(
+    student_id: int,
+    alumni_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    claims: Optional[TokenClaims] = Depends(optional_claims),
+):
+    """
+    Mark everything this AI alumni sent the student as read and take that
+    many off the conversation's unread count. A no-op (one primary-key
+    read) when nothing is unread.
+    """
+    authorize_student(claims, student_id)
+    summary = await db.get(models.ConversationSummary, ("student", student_id, alumni_id))
+    if summary is None or summary.unread_count == 0:
+        return {"success": True, "marked_read": 0}
+
+    marked = (await db.execute(
+        update(models.Message)
+        .where(
+            models.Message.receiver_type == "student",
+            models.Message.receiver_id == student_id,
+            models.Message.sender_id == alumni_id,
+            models.Message.is_read == False,
+        )
+        .values(is_read=True)
+    )).rowcount
+    # Subtract what was marked, in SQL: a message a concurrent send counts
+    # meanwhile stays unread and stays in the count (no read-then-write)
+    unread = models.ConversationSummary.unread_count
+    await db.execute(
+        update(models.ConversationSummary)
+        .where(
+            models.ConversationSummary.user_type == "student",
+            models.ConversationSummary.user_id == student_id,
+            models.ConversationSummary.peer_id == alumni_id,
+        )
+        .values(unread_count=case((unread > marked, unread - marked), else_=0))
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    events.notify_student(student_id, "read", alumni_id=alumni_id)
+    return {"success": True, "marked_read": marked}
+
 
 # -----------------------------
 # CLEAR CHAT ENDPOINT
 # -----------------------------
 @router.delete("/clear", status_code=200)
-def clear_chat(student_id: int, alumni_id: int, db: Session = Depends(get_db)):
+def clear_chat(
+    student_id: int,
+    alumni_id: int,
+    db: Session = Depends(get_db),
+    claims: Optional[TokenClaims] = Depends(optional_claims),
+):
     """
     Deletes full chat history between this student and this AI alumni.
     """
+    authorize_student(claims, student_id)
     
     deleted = (
         db.query(models.Message)
@@ -211,6 +393,17 @@ def clear_chat(student_id: int, alumni_id: int, db: Session = Depends(get_db)):
         )
         .delete(synchronize_session=False)
     )
+    db.execute(
+        delete(models.ConversationSummary).where(
+            ((models.ConversationSummary.user_type == "student") &
+             (models.ConversationSummary.user_id == student_id) &
+             (models.ConversationSummary.peer_id == alumni_id)) |
+            ((models.ConversationSummary.user_type == "alumni_ai") &
+             (models.ConversationSummary.user_id == alumni_id) &
+             (models.ConversationSummary.peer_id == student_id))
+        )
+    )
+    versions.bump(db, f"chat:{student_id}:{alumni_id}")
     
     db.commit()
     return {"success": True, "deleted_messages": deleted}
@@ -1,61 +1,124 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
+from sqlalchemy import select, update
+from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
 from datetime import datetime, timedelta
+import asyncio
 
-from ..database import get_db
-from .. import models, schemas
+from ..async_database import AsyncSessionLocal, get_async_db
+from ..cache import aget_student, aget_alumni
+from ..auth import TokenClaims, optional_claims, authorize_student
+from .. import events, models, schemas
 
 router = APIRouter(
     prefix="/connect",
     tags=["Connections"]
 )
 
-def auto_accept_old_requests(requests, db: Session):
+AUTO_ACCEPT_AFTER = timedelta(minutes=1)
+
+# Timer tasks in flight (the loop only keeps weak references to tasks)
+_auto_accept_tasks = set()
+
+
+async def auto_accept_old_requests(requests, db: AsyncSession):
     """
-    Auto-accept pending requests that are older than 30 seconds.
+    Auto-accept pending requests that are older than AUTO_ACCEPT_AFTER.
     """
-    changed = False
     now = datetime.utcnow()
-    for req in requests:
-        if req.status == "Pending" and req.created_at and (now - req.created_at) >= timedelta(minutes=1):
-            req.status = "Accepted"
-            changed = True
+    stale = [
+        req for req in requests
+        if req.status == "Pending" and req.created_at and (now - req.created_at) >= AUTO_ACCEPT_AFTER
+    ]
+
+    if stale:
+        # One UPDATE for all of them (not one per row, and no per-row refresh)
+        await db.execute(
+            update(models.ConnectionRequest)
+            .where(models.ConnectionRequest.id.in_([req.id for req in stale]))
+            .values(status="Accepted")
+        )
+        await db.commit()
+        for req in stale:
+            set_committed_value(req, "status", "Accepted")
+            events.notify_student(req.student_id, "connection", request=events.connection_dict(req))
+
+
+async def _auto_accept(request_id: int) -> None:
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            update(models.ConnectionRequest)
+            .where(models.ConnectionRequest.id == request_id, models.ConnectionRequest.status == "Pending")
+            .values(status="Accepted")
+        )
+        await db.commit()
+        if result.rowcount:
+            req = await db.get(models.ConnectionRequest, request_id)
+            events.notify_student(req.student_id, "connection", request=events.connection_dict(req))
 
-    if changed:
-        db.commit()
-        # Refresh objects after commit so latest values are returned
-        for req in requests:
-            db.refresh(req)
+
+def schedule_auto_accept(request_id: int) -> None:
+    """
+    Accept (and push) a request once it is AUTO_ACCEPT_AFTER old, instead
+    of waiting for a list read to notice. Timers die with the worker; the
+    read path above still catches those requests.
+    """
+    def spawn():
+        task = asyncio.create_task(_auto_accept(request_id))
+        _auto_accept_tasks.add(task)
+        task.add_done_callback(_auto_accept_tasks.discard)
+
+    asyncio.get_running_loop().call_later(AUTO_ACCEPT_AFTER.total_seconds(), spawn)
+
+
+async def load_requests(db: AsyncSession, *criteria, expand: bool = False):
+    """
+    Connection requests matching `criteria`, oldest auto-accepted.
+    expand=True also loads the alumni + student rows with selectinload:
+    3 queries in total (selectinload batches ids 500 at a time).
+    """
+    stmt = select(models.ConnectionRequest).where(*criteria).order_by(models.ConnectionRequest.id)
+    if expand:
+        stmt = stmt.options(
+            selectinload(models.ConnectionRequest.alumni),
+            selectinload(models.ConnectionRequest.student),
+        )
+    requests = (await db.execute(stmt)).scalars().all()
+    await auto_accept_old_requests(requests, db)
+    return requests
 
 
 @router.post("/request", response_model=schemas.ConnectionRequestOut)
-def send_connection_request(
+async def send_connection_request(
     req: schemas.ConnectionRequestCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db),
+    claims: Optional[TokenClaims] = Depends(optional_claims),
 ):
     """Student sends a connection request to an alumni."""
 
-    # Check student exists
-    student = db.query(models.Student).filter(models.Student.id == req.student_id).first()
-    if not student:
+    # Check student exists (a verified token already proves it)
+    authorize_student(claims, req.student_id)
+    if claims is None and not await aget_student(db, req.student_id):
         raise HTTPException(status_code=404, detail="Student not found")
 
     # Check alumni exists
-    alumni = db.query(models.Alumni).filter(models.Alumni.id == req.alumni_id).first()
+    alumni = await aget_alumni(db, req.alumni_id)
     if not alumni:
         raise HTTPException(status_code=404, detail="Alumni not found")
 
     # Check if a pending request already exists
-    existing = (
-        db.query(models.ConnectionRequest)
-        .filter(
+    result = await db.execute(
+        select(models.ConnectionRequest)
+        .where(
             models.ConnectionRequest.student_id == req.student_id,
             models.ConnectionRequest.alumni_id == req.alumni_id,
             models.ConnectionRequest.status == "Pending"
         )
-        .first()
+        .limit(1)
     )
+    existing = result.scalars().first()
     if existing:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -69,63 +132,74 @@ def send_connection_request(
     )
 
     db.add(new_req)
-    db.commit()
-    db.refresh(new_req)
+    await db.commit()
+    await db.refresh(new_req)
+    events.notify_student(new_req.student_id, "connection", request=events.connection_dict(new_req))
+    schedule_auto_accept(new_req.id)
 
     return new_req
 
 
 @router.get("/student/{student_id}", response_model=List[schemas.ConnectionRequestOut])
-def get_student_requests(student_id: int, db: Session = Depends(get_db)):
+async def get_student_requests(
+    student_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    claims: Optional[TokenClaims] = Depends(optional_claims),
+):
     """List all connection requests for a given student."""
-    requests = (
-        db.query(models.ConnectionRequest)
-        .filter(models.ConnectionRequest.student_id == student_id)
-        .all()
-    )
+    authorize_student(claims, student_id)
+    return await load_requests(db, models.ConnectionRequest.student_id == student_id)
 
-    # Auto-accept old pending ones
-    auto_accept_old_requests(requests, db)
 
-    return requests
+@router.get("/student/{student_id}/expanded", response_model=List[schemas.ConnectionRequestExpanded])
+async def get_student_requests_expanded(
+    student_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    claims: Optional[TokenClaims] = Depends(optional_claims),
+):
+    """Same as /student/{id}, with alumni + student summaries joined in (fixed query count)."""
+    authorize_student(claims, student_id)
+    return await load_requests(db, models.ConnectionRequest.student_id == student_id, expand=True)
 
 
 @router.get("/alumni/{alumni_id}", response_model=List[schemas.ConnectionRequestOut])
-def get_alumni_requests(alumni_id: int, db: Session = Depends(get_db)):
+async def get_alumni_requests(alumni_id: int, db: AsyncSession = Depends(get_async_db)):
     """List all connection requests for a given alumni."""
-    requests = (
-        db.query(models.ConnectionRequest)
-        .filter(models.ConnectionRequest.alumni_id == alumni_id)
-        .all()
-    )
+    return await load_requests(db, models.ConnectionRequest.alumni_id == alumni_id)
 
-    auto_accept_old_requests(requests, db)
 
-    return requests
+@router.get("/alumni/{alumni_id}/expanded", response_model=List[schemas.ConnectionRequestExpanded])
+async def get_alumni_requests_expanded(alumni_id: int, db: AsyncSession = Depends(get_async_db)):
+    """Same as /alumni/{id}, with alumni + student summaries joined in (fixed query count)."""
+    return await load_requests(db, models.ConnectionRequest.alumni_id == alumni_id, expand=True)
 
 
 
 @router.post("/{request_id}/status", response_model=schemas.ConnectionRequestOut)
-def update_request_status(
+async def update_request_status(
     request_id: int,
     body: schemas.ConnectionRequestUpdateStatus,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db),
+    claims: Optional[TokenClaims] = Depends(optional_claims),
 ):
     """
     Update status of a connection request.
-    Normally alumni would call this through their UI.
+    Normally alumni would call this through their UI; until alumni have
+    credentials, only the request's own student may change it.
     """
 
-    req = db.query(models.ConnectionRequest).filter(models.ConnectionRequest.id == request_id).first()
+    req = await db.get(models.ConnectionRequest, request_id)
     if not req:
         raise HTTPException(status_code=404, detail="Connection request not found")
+    authorize_student(claims, req.student_id)
 
     new_status = body.status.capitalize()
     if new_status not in ["Pending", "Accepted", "Rejected"]:
         raise HTTPException(status_code=400, detail="Status must be Pending, Accepted, or Rejected")
 
     req.status = new_status
-    db.commit()
-    db.refresh(req)
+    await db.commit()
+    await db.refresh(req)
+    events.notify_student(req.student_id, "connection", request=events.connection_dict(req))
 
     return req
@@ -1,10 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
+from typing import Optional
 from email.message import EmailMessage
 import smtplib
 
 from ..database import get_db
-from .. import models, schemas
+from ..cache import get_student, get_alumni
+from ..auth import TokenClaims, optional_claims, authorize_student
+from ..metrics import timed_call
+from .. import schemas
 
 router = APIRouter(prefix="/email", tags=["Email"])
 
@@ -19,14 +23,19 @@ MENTOR_EMAIL = "mentor.inbox@example.com"   # replace with your fixed mentor ema
 
 
 @router.post("/send")
-def send_email_to_mentor(body: schemas.EmailToMentor, db: Session = Depends(get_db)):
+def send_email_to_mentor(
+    body: schemas.EmailToMentor,
+    db: Session = Depends(get_db),
+    claims: Optional[TokenClaims] = Depends(optional_claims),
+):
     """
     Sends an email to a constant mentor email.
     Visible sender & reply-to fields will show student's email.
     """
+    authorize_student(claims, body.student_id)
 
-    student = db.query(models.Student).filter(models.Student.id == body.student_id).first()
-    alumni = db.query(models.Alumni).filter(models.Alumni.id == body.alumni_id).first()
+    student = get_student(db, body.student_id)
+    alumni = get_alumni(db, body.alumni_id)
 
     if not student or not alumni:
         raise HTTPException(status_code=404, detail="Student or Alumni not found")
@@ -62,7 +71,7 @@ def send_email_to_mentor(body: schemas.EmailToMentor, db: Session = Depends(get_
 
     # Send email
     try:
-        with smtplib.SMTP(SMTP_HOST, SMTP_PORT) as server:
+        with timed_call("smtp"), smtplib.SMTP(SMTP_HOST, SMTP_PORT) as server:
             server.starttls()
             server.login(SMTP_USER, SMTP_PASSWORD)
             server.send_message(msg)
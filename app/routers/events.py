@@ -0,0 +1,99 @@
+from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect, status
+from fastapi.responses import StreamingResponse
+from typing import Optional
+import asyncio
+
+from ..config import settings
+from ..auth import claims_from_query, authorize_student
+from ..responses import dumps
+from .. import events
+
+router = APIRouter(
+    prefix="/events",
+    tags=["Events"]
+)
+
+PING = {"type": "ping"}
+
+
+def _authorize(student_id: int, token: Optional[str]) -> None:
+    authorize_student(claims_from_query(token), student_id)
+
+
+async def _next_event(sub) -> dict:
+    """Next event, or PING after a quiet heartbeat interval."""
+    try:
+        return await asyncio.wait_for(sub.get(), settings.events_heartbeat_seconds)
+    except asyncio.TimeoutError:
+        return PING
+
+
+async def _send_events(websocket: WebSocket, sub) -> None:
+    try:
+        while True:
+            await websocket.send_text(dumps(await _next_event(sub)).decode("utf-8"))
+    except (WebSocketDisconnect, RuntimeError):  # closed while sending
+        pass
+
+
+async def _until_closed(websocket: WebSocket) -> None:
+    # Clients never send anything; reading is how the close is noticed
+    try:
+        while True:
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        pass
+
+
+@router.websocket("/ws/{student_id}")
+async def student_events_ws(websocket: WebSocket, student_id: int, token: Optional[str] = None):
+    """
+    Push channel for one student: new chat messages, connection status
+    changes and feedback acknowledgements, as JSON text frames (see
+    app/events.py). A {"type": "ping"} frame goes out when idle.
+    """
+    try:
+        _authorize(student_id, token)
+    except HTTPException:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await websocket.accept()
+    async with events.broker.subscribe(events.student_channel(student_id)) as sub:
+        tasks = [
+            asyncio.create_task(_send_events(websocket, sub)),
+            asyncio.create_task(_until_closed(websocket)),
+        ]
+        done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        for task in pending:
+            task.cancel()
+        for task in done:
+            task.result()
+
+
+@router.get("/stream/{student_id}")
+async def student_events_sse(student_id: int, token: Optional[str] = None):
+    """Same events as /events/ws/{id}, as Server-Sent Events (for EventSource clients)."""
+    _authorize(student_id, token)
+
+    async def stream():
+        async with events.broker.subscribe(events.student_channel(student_id)) as sub:
+            yield b": connected\n\n"
+            while True:
+                event = await _next_event(sub)
+                if event is PING:
+                    yield b": ping\n\n"
+                else:
+                    yield b"event: " + event["type"].encode() + b"\ndata: " + dumps(event) + b"\n\n"
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/stats")
+def events_stats():
+    """Broker type, open subscriptions on this worker and events published."""
+    return events.stats()
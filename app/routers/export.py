@@ -0,0 +1,118 @@
+from fastapi import APIRouter, Header, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from typing import Optional
+import csv
+import hmac
+import io
+
+from ..config import settings
+from ..database import engine
+from ..responses import dumps
+from .. import models
+
+router = APIRouter(
+    prefix="/export",
+    tags=["Export"]
+)
+
+# Exported columns per table (never password_hash). Tables holding
+# personal data are only served with EXPORT_PERSONAL_DATA=true.
+PERSONAL_TABLES = {"students", "messages"}
+
+EXPORTS = {
+    "alumni": [
+        models.Alumni.id, models.Alumni.alumni_id, models.Alumni.name, models.Alumni.email,
+        models.Alumni.graduation_year, models.Alumni.department, models.Alumni.current_role,
+        models.Alumni.company, models.Alumni.experience_years, models.Alumni.skills,
+        models.Alumni.domain, models.Alumni.location, models.Alumni.mentorship_available,
+    ],
+    "students": [
+        models.Student.id, models.Student.name, models.Student.email, models.Student.department,
+        models.Student.year, models.Student.skills, models.Student.interests,
+        models.Student.career_goal,
+    ],
+    "interactions": [
+        models.Interaction.id, models.Interaction.student_id, models.Interaction.alumni_id,
+        models.Interaction.rating, models.Interaction.comment, models.Interaction.reward,
+        models.Interaction.created_at,
+    ],
+    "messages": [
+        models.Message.id, models.Message.sender_id, models.Message.receiver_id,
+        models.Message.sender_type, models.Message.receiver_type, models.Message.content,
+        models.Message.is_read, models.Message.created_at,
+    ],
+}
+
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
+
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return value
+
+
+def encode_ndjson(keys, rows) -> bytes:
+    return b"".join(dumps(dict(zip(keys, row))) + b"\n" for row in rows)
+
+
+def encode_csv(rows) -> bytes:
+    buf = io.StringIO()
+    csv.writer(buf).writerows([_csv_value(v) for v in row] for row in rows)
+    return buf.getvalue().encode("utf-8")
+
+
+def stream_table(table: str, fmt: str, after_id: int = 0, batch: int = None):
+    """
+    Yields one encoded chunk per `batch` rows, in id order.
+
+    Own connection (the request's session is closed before the body is
+    sent), stream_results + yield_per: a server-side cursor on Postgres,
+    lazy cursor iteration on SQLite. Only one batch is ever in memory.
+    """
+    columns = EXPORTS[table]
+    keys = [c.key for c in columns]
+    query = select(*columns).where(columns[0] > after_id).order_by(columns[0])
+    batch = batch or settings.export_batch_rows
+
+    if fmt == "csv":
+        yield encode_csv([keys])  # header goes out before the first query returns
+    with engine.connect() as conn:
+        result = conn.execution_options(stream_results=True, yield_per=batch).execute(query)
+        for rows in result.partitions():
+            yield encode_ndjson(keys, rows) if fmt == "ndjson" else encode_csv(rows)
+
+
+def exportable_tables() -> list:
+    return [t for t in EXPORTS if settings.export_personal_data or t not in PERSONAL_TABLES]
+
+
+@router.get("/{table}")
+def export_table(
+    table: str,
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    after_id: int = Query(0, ge=0, description="resume after this id"),
+    x_export_token: Optional[str] = Header(None),
+):
+    """
+    Stream a whole table as NDJSON (one object per line) or CSV, in id
+    order. Memory stays flat whatever the table size; an interrupted
+    download resumes with ?after_id=<last id received>.
+    """
+    # Fail closed: no configured token means no exports at all
+    if not settings.export_token or not hmac.compare_digest(
+        (x_export_token or "").encode(), settings.export_token.encode()
+    ):
+        raise HTTPException(status_code=403, detail="Invalid export token")
+    tables = exportable_tables()
+    if table not in tables:
+        raise HTTPException(status_code=404, detail=f"Unknown table (one of: {', '.join(tables)})")
+
+    return StreamingResponse(
+        stream_table(table, format, after_id),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{table}.{format}"'},
+    )
@@ -1,15 +1,33 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
+from datetime import datetime
 
 from ..database import get_db
-from .. import models, schemas
+from ..cache import get_student, get_alumni
+from ..auth import TokenClaims, optional_claims, authorize_student
+from ..bandit import bandit
+from ..responses import TrustedJSONResponse, row_dicts
+from .. import events, models, schemas, versions
 
 router = APIRouter(
     prefix="/feedback",
     tags=["Feedback"]
 )
 
+# Exactly the FeedbackOut fields, for the no-validation list path
+_FEEDBACK_COLUMNS = select(
+    models.Interaction.id,
+    models.Interaction.student_id,
+    models.Interaction.alumni_id,
+    models.Interaction.rating,
+    models.Interaction.comment,
+    models.Interaction.reward,
+    models.Interaction.created_at,
+)
+
 
 def compute_reward_from_rating(rating: float | None) -> float | None:
     """
@@ -22,21 +40,72 @@ def compute_reward_from_rating(rating: float | None) -> float | None:
     return round(float(rating) / 5.0, 3)
 
 
+def apply_rating_stats(db: Session, alumni_id: int, rating, reward, at: datetime) -> None:
+    """
+    Add one feedback row to alumni_rating_stats (caller commits).
+    Atomic in-place UPDATE; the first feedback for an alumni inserts the row.
+    """
+    has_rating = rating is not None
+    stmt = (
+        update(models.AlumniRatingStats)
+        .where(models.AlumniRatingStats.alumni_id == alumni_id)
+        .values(
+            feedback_count=models.AlumniRatingStats.feedback_count + 1,
+            rating_count=models.AlumniRatingStats.rating_count + (1 if has_rating else 0),
+            rating_sum=models.AlumniRatingStats.rating_sum + (float(rating) if has_rating else 0.0),
+            reward_sum=models.AlumniRatingStats.reward_sum + (float(reward) if reward is not None else 0.0),
+            last_feedback_at=at,
+        )
+    )
+    if db.execute(stmt).rowcount:
+        return
+
+    try:
+        with db.begin_nested():
+            db.add(models.AlumniRatingStats(
+                alumni_id=alumni_id,
+                feedback_count=1,
+                rating_count=1 if has_rating else 0,
+                rating_sum=float(rating) if has_rating else 0.0,
+                reward_sum=float(reward) if reward is not None else 0.0,
+                last_feedback_at=at,
+            ))
+    except IntegrityError:
+        # Another request created the row in between: fall back to the UPDATE
+        db.execute(stmt)
+
+
+def stats_out(alumni_id: int, row: Optional[models.AlumniRatingStats]) -> schemas.AlumniRatingStatsOut:
+    if row is None:
+        return schemas.AlumniRatingStatsOut(alumni_id=alumni_id)
+    return schemas.AlumniRatingStatsOut(
+        alumni_id=alumni_id,
+        feedback_count=row.feedback_count,
+        rating_count=row.rating_count,
+        avg_rating=round(row.rating_sum / row.rating_count, 3) if row.rating_count else None,
+        avg_reward=round(row.reward_sum / row.rating_count, 3) if row.rating_count else None,
+        last_feedback_at=row.last_feedback_at,
+    )
+
+
 @router.post("/", response_model=schemas.FeedbackOut)
 def submit_feedback(
     fb: schemas.FeedbackCreate,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    claims: Optional[TokenClaims] = Depends(optional_claims),
 ):
+    authorize_student(claims, fb.student_id)
     # check student and alumni exist
-    student = db.query(models.Student).filter(models.Student.id == fb.student_id).first()
+    student = get_student(db, fb.student_id)
     if not student:
         raise HTTPException(status_code=404, detail="Student not found")
 
-    alumni = db.query(models.Alumni).filter(models.Alumni.id == fb.alumni_id).first()
+    alumni = get_alumni(db, fb.alumni_id)
     if not alumni:
         raise HTTPException(status_code=404, detail="Alumni not found")
 
     reward = compute_reward_from_rating(fb.rating)
+    now = datetime.utcnow()
 
     interaction = models.Interaction(
         student_id=fb.student_id,
@@ -44,15 +113,93 @@ def submit_feedback(
         rating=fb.rating,
         comment=fb.comment,
         reward=reward,
+        created_at=now,
     )
 
     db.add(interaction)
+    db.flush()
+    # Same transaction as the interaction row: both land or neither does
+    apply_rating_stats(db, fb.alumni_id, fb.rating, reward, now)
+    versions.bump(db, "feedback")
     db.commit()
     db.refresh(interaction)
+    bandit.observe(fb.alumni_id, reward)
+    events.notify_student(fb.student_id, "feedback", feedback={
+        c.key: getattr(interaction, c.key) for c in _FEEDBACK_COLUMNS.selected_columns
+    })
 
     return interaction
 
 
+def feedback_owner(claims: Optional[TokenClaims], student_id: Optional[int]) -> Optional[int]:
+    """
+    Whose feedback a listing may show: always the token's own student.
+    Without a token (only possible with AUTH_REQUIRED=false) ?student_id=
+    narrows it, else everything is listed.
+    """
+    if claims is None:
+        return student_id
+    if student_id is not None:
+        authorize_student(claims, student_id)
+    return claims.student_id
+
+
 @router.get("/", response_model=List[schemas.FeedbackOut])
-def list_feedback(db: Session = Depends(get_db)):
-    return db.query(models.Interaction).all()
+def list_feedback(
+    student_id: Optional[int] = None,
+    db: Session = Depends(get_db),
+    claims: Optional[TokenClaims] = Depends(optional_claims),
+):
+    query = _FEEDBACK_COLUMNS
+    owner = feedback_owner(claims, student_id)
+    if owner is not None:
+        query = query.where(models.Interaction.student_id == owner)
+    return TrustedJSONResponse(row_dicts(db.execute(query)))
+
+
+@router.get("/page", response_model=schemas.FeedbackPage)
+def list_feedback_page(
+    limit: int = Query(50, ge=1, le=500),
+    before_id: Optional[int] = None,
+    alumni_id: Optional[int] = None,
+    student_id: Optional[int] = None,
+    db: Session = Depends(get_db),
+    claims: Optional[TokenClaims] = Depends(optional_claims),
+):
+    """
+    Newest-first feedback, keyset-paginated on id (no OFFSET scans).
+    Pass next_before_id from the previous page as ?before_id=.
+    """
+    query = db.query(models.Interaction)
+    owner = feedback_owner(claims, student_id)
+    if owner is not None:
+        query = query.filter(models.Interaction.student_id == owner)
+    if alumni_id is not None:
+        query = query.filter(models.Interaction.alumni_id == alumni_id)
+    if before_id is not None:
+        query = query.filter(models.Interaction.id < before_id)
+
+    items = query.order_by(models.Interaction.id.desc()).limit(limit).all()
+    next_before_id = items[-1].id if len(items) == limit else None
+    return schemas.FeedbackPage(items=items, next_before_id=next_before_id)
+
+
+@router.get("/alumni/stats", response_model=List[schemas.AlumniRatingStatsOut])
+def list_alumni_rating_stats(
+    limit: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_db)
+):
+    """Alumni with the most feedback first."""
+    rows = (
+        db.query(models.AlumniRatingStats)
+        .order_by(models.AlumniRatingStats.feedback_count.desc())
+        .limit(limit)
+        .all()
+    )
+    return [stats_out(row.alumni_id, row) for row in rows]
+
+
+@router.get("/alumni/{alumni_id}/stats", response_model=schemas.AlumniRatingStatsOut)
+def get_alumni_rating_stats(alumni_id: int, db: Session = Depends(get_db)):
+    """Rating count / averages for one alumni: a single primary-key read."""
+    return stats_out(alumni_id, db.get(models.AlumniRatingStats, alumni_id))
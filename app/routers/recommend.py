@@ -1,10 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
+from datetime import datetime, timedelta
 import random
 
-from ..database import get_db
-from .. import models, schemas
+import numpy as np
+
+from ..async_database import get_async_db
+from ..auth import TokenClaims, optional_claims, authorize_student
+from ..cache import aget_student
+from ..alumni_store import alumni_store, AlumniRecord
+from ..bandit import bandit
+from ..embeddings import get_index
+from ..config import settings
+from .. import models, schemas, versions
 
 router = APIRouter(
     prefix="/recommend",
@@ -27,63 +37,61 @@ def compute_skill_score(student_skills: str, alumni_skills: Optional[str]) -> fl
     return len(common) / len(student_list)
 
 
-class RecommendationOut(schemas.AlumniOut):
-    match_score: float
-    reason: str
+RecommendationOut = schemas.RecommendationOut
 
 
-@router.get("/student/{student_id}", response_model=List[RecommendationOut])
-def recommend_for_student(student_id: int, db: Session = Depends(get_db), top_k: int = 10):
+def recommendation_reason(student, alum, score: float, skill_score: Optional[float] = None) -> str:
     """
-    ✅ RANDOMIZED recommendations from CSV data
-    Returns different alumni each request!
+    skill_score is the exact skill-overlap part of `score` when semantic
+    matching contributed to it (None = score is pure skill overlap).
     """
-    student = db.query(models.Student).filter(models.Student.id == student_id).first()
-    if not student:
-        raise HTTPException(status_code=404, detail="Student not found")
-
-    # Get ALL mentorship-available alumni from CSV
-    alumni_list = (
-        db.query(models.Alumni)
-        .filter(models.Alumni.mentorship_available == True)
-        .all()
+    if skill_score is None:
+        skill_score = score
+    if score == 0:
+        return "No matching skills"
+    if skill_score == 0:
+        return "Similar profile: " + ", ".join(filter(None, [alum.current_role, alum.domain]))
+    common_skills = set(
+        [s.strip() for s in (student.skills or "").split(",")]
+    ).intersection(
+        set([s.strip() for s in (alum.skills or "").split(",")])
+    )
+    return "Common skills: " + ", ".join(common_skills)
+
+
+def to_recommendation(student, alum, score: float, skill_score: Optional[float] = None,
+                      reason: Optional[str] = None) -> RecommendationOut:
+    """Wrap one alumni row (ORM object or AlumniRecord) with its score + reason."""
+    if reason is None:
+        reason = recommendation_reason(student, alum, score, skill_score)
+
+    return RecommendationOut(
+        id=alum.id,
+        alumni_id=alum.alumni_id,
+        name=alum.name,
+        graduation_year=alum.graduation_year,
+        department=alum.department,
+        current_role=alum.current_role,
+        company=alum.company,
+        experience_years=alum.experience_years,
+        skills=alum.skills,
+        domain=alum.domain,
+        location=alum.location,
+        mentorship_available=alum.mentorship_available,
+        match_score=round(score, 2),
+        reason=reason,
     )
 
-    if not alumni_list:
-        return []
 
-    recommendations: List[RecommendationOut] = []
-
-    # Score each alumni
-    for alum in alumni_list:
-        score = compute_skill_score(student.skills or "", alum.skills)
-        if score == 0:
-            reason = "No matching skills"
-        else:
-            common_skills = set(
-                [s.strip() for s in (student.skills or "").split(",")]
-            ).intersection(
-                set([s.strip() for s in (alum.skills or "").split(",")])
-            )
-            reason = "Common skills: " + ", ".join(common_skills)
-
-        rec = RecommendationOut(
-            id=alum.id,
-            alumni_id=alum.alumni_id,
-            name=alum.name,
-            graduation_year=alum.graduation_year,
-            department=alum.department,
-            current_role=alum.current_role,
-            company=alum.company,
-            experience_years=alum.experience_years,
-            skills=alum.skills,
-            domain=alum.domain,
-            location=alum.location,
-            mentorship_available=alum.mentorship_available,
-            match_score=round(score, 2),
-            reason=reason,
-        )
-        recommendations.append(rec)
+def build_recommendations(student, alumni_list, top_k: int = 10) -> List[RecommendationOut]:
+    """
+    Score + shuffle already-loaded alumni for a student, one row at a time.
+    Reference path (used by the sync benchmark baseline).
+    """
+    recommendations: List[RecommendationOut] = [
+        to_recommendation(student, alum, compute_skill_score(student.skills or "", alum.skills))
+        for alum in alumni_list
+    ]
 
     # ✅ SHUFFLE for randomness
     high_scores = [r for r in recommendations if r.match_score > 0.0]
@@ -96,6 +104,161 @@ def recommend_for_student(student_id: int, db: Session = Depends(get_db), top_k:
     return high_scores[:top_k]
 
 
+def candidate_rows(student, snap, index=None):
+    """
+    Snapshot rows eligible for a student, their rounded match scores and
+    the skill-overlap part of those scores.
+
+    Without an embedding index: mentorship-available alumni with any skill
+    match, or all available alumni when nothing matches (score = overlap).
+    With one (embeddings.EmbeddingIndex): score blends overlap with the
+    cosine similarity of the profiles and only the best
+    `recommend_candidate_pool` rows are kept.
+    """
+    skill = np.round(alumni_store.skill_scores(snap, student.skills if student else None), 2)
+    scores = skill
+    if index is not None and student is not None:
+        w = settings.semantic_weight
+        cosine = np.maximum(index.similarities(snap, index.student_vector(student)), 0.0)
+        scores = np.round((1.0 - w) * skill + w * cosine, 2)
+
+    available = snap.mentorship.flatnonzero()
+    candidates = available[scores[available] > 0.0]
+    if not len(candidates):
+        return available, scores, skill
+
+    pool = settings.recommend_candidate_pool
+    if index is not None and len(candidates) > pool:
+        candidates = candidates[np.argpartition(-scores[candidates], pool - 1)[:pool]]
+    return candidates, scores, skill
+
+
+def recommend_from_store(student, snap, top_k: int = 10, reranker=None, index=None) -> List[RecommendationOut]:
+    """
+    Same result as build_recommendations, on the columnar alumni snapshot:
+    scores are computed for all rows in one vectorized pass, and only the
+    top_k picked rows are turned into RecommendationOut objects.
+    With a reranker (bandit.ThompsonReranker) candidates are ordered by
+    posterior samples of their feedback reward instead of a plain shuffle.
+    With an embedding index the candidates are the closest profiles.
+    """
+    candidates, scores, skill = candidate_rows(student, snap, index)
+    if not len(candidates):
+        return []
+
+    if reranker is not None:
+        picked = candidates[reranker.rank(snap.ids[candidates], top_k)]
+    else:
+        # ✅ SHUFFLE for randomness
+        picked = np.random.permutation(candidates)[:top_k]
+    return [
+        to_recommendation(student, AlumniRecord(snap, int(i)), float(scores[i]), float(skill[i]))
+        for i in picked
+    ]
+
+
+async def load_materialized(db: AsyncSession, student_id: int, profile_version: int):
+    """
+    Precomputed (alumni, match_score, reason) rows for the student
+    (app/materialize.py), or [] when missing or stale. One indexed read.
+    """
+    cutoff = datetime.utcnow() - timedelta(hours=settings.materialized_max_age_hours)
+    result = await db.execute(
+        select(
+            models.Alumni,
+            models.StudentRecommendation.match_score,
+            models.StudentRecommendation.reason,
+        )
+        .join(models.Alumni, models.Alumni.id == models.StudentRecommendation.alumni_id)
+        .where(
+            models.StudentRecommendation.student_id == student_id,
+            models.StudentRecommendation.profile_version == (profile_version or 0),
+            models.StudentRecommendation.computed_at >= cutoff,
+            models.Alumni.mentorship_available == True,
+        )
+        .order_by(models.StudentRecommendation.rank)
+    )
+    return result.all()
+
+
+def recommend_from_rows(rows, top_k: int = 10, reranker=None) -> List[RecommendationOut]:
+    """recommend_from_store over materialized rows: same pick, same output."""
+    if reranker is not None:
+        picked = reranker.rank(np.asarray([alum.id for alum, _, _ in rows]), top_k)
+    else:
+        # ✅ SHUFFLE for randomness
+        picked = np.random.permutation(len(rows))[:top_k]
+    return [to_recommendation(None, rows[i][0], rows[i][1], reason=rows[i][2]) for i in picked]
+
+
+async def recommend(db: AsyncSession, student_id: int, top_k: int = 10, student=None,
+                    claims: Optional[TokenClaims] = None) -> List[RecommendationOut]:
+    """
+    Materialized candidates when fresh, else live scoring on the alumni
+    snapshot. With verified token claims the materialized path needs no
+    student lookup at all (id + profile version are in the token).
+    """
+    reranker = None
+    if settings.recommend_bandit:
+        await bandit.aensure_fresh(db)
+        reranker = bandit
+
+    if student is None and claims is None:
+        student = await aget_student(db, student_id)
+        if not student:
+            raise HTTPException(status_code=404, detail="Student not found")
+
+    if settings.recommend_materialized:
+        profile_version = student.profile_version if student is not None else claims.profile_version
+        rows = await load_materialized(db, student_id, profile_version)
+        if rows:
+            return recommend_from_rows(rows, top_k, reranker)
+
+    if student is None:
+        student = await aget_student(db, student_id)
+        if not student:
+            raise HTTPException(status_code=404, detail="Student not found")
+
+    # ALL alumni, from the in-memory columnar snapshot (no ORM rows)
+    snap = await alumni_store.aensure_fresh(db)
+    return recommend_from_store(student, snap, top_k, reranker, get_index())
+
+
+def recommendation_version_keys(student_id: int) -> List[str]:
+    """Everything a recommendation list depends on (app/versions.py)."""
+    return [f"student:{student_id}", "alumni", "feedback", "recommendations"]
+
+
+@router.get("/student/{student_id}", response_model=List[RecommendationOut])
+async def recommend_for_student(
+    student_id: int,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    top_k: int = 10,
+    claims: Optional[TokenClaims] = Depends(optional_claims),
+):
+    """
+    ✅ RANDOMIZED recommendations from CSV data
+    Returns different alumni each request!
+
+    A client revalidating with If-None-Match gets 304 (keep the list it
+    has) until the profile, alumni, feedback or materialized set changes.
+    """
+    authorize_student(claims, student_id)
+    # 404 before any 304 (see versions.check); a verified token already proves the student
+    student = None
+    if claims is None:
+        student = await aget_student(db, student_id)
+        if not student:
+            raise HTTPException(status_code=404, detail="Student not found")
+    cond = await versions.acheck(request, db, recommendation_version_keys(student_id), variant=f"top_k={top_k}")
+    if cond.not_modified:
+        return cond.not_modified_response()
+    cond.apply(response)
+    return await recommend(db, student_id, top_k, student=student, claims=claims)
+
+
 
 
 
@@ -1,25 +1,29 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
-import hashlib
-
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy import select, delete
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+import asyncio
+
+from ..config import settings
 from ..database import get_db
-from .. import models, schemas
+from ..async_database import get_async_db, AsyncSessionLocal
+from ..cache import entity_cache, get_student, aget_student
+from ..embeddings import warm_student_vector
+from ..auth import TokenClaims, issue_token, revocations, optional_claims, require_claims, authorize_student
+from ..responses import TrustedJSONResponse, row_dicts
+from ..passwords import (
+    hash_password_pooled, averify_and_update, unusable_password,
+)
+from .. import models, schemas, versions
+from .connections import auto_accept_old_requests
+from .recommend import recommend
 
 router = APIRouter(
     prefix="/students",
     tags=["Students"]
 )
 
-# Fast SHA256 hashing for development
-def hash_password(password: str) -> str:
-    """Fast SHA256 hash (instant, good for development/testing)"""
-    return hashlib.sha256(password.encode("utf-8")).hexdigest()
-
-def verify_password(plain: str, hashed: str) -> bool:
-    """Fast SHA256 verification (1-2ms)"""
-    return hashlib.sha256(plain.encode("utf-8")).hexdigest() == hashed
-
 # ==================== AUTHENTICATION ENDPOINTS ====================
 
 @router.post("/register", response_model=schemas.StudentOut)
@@ -32,7 +36,7 @@ def register_student(student_in: schemas.StudentCreate, db: Session = Depends(ge
             detail="Email already registered"
         )
 
-    hashed = hash_password(student_in.password)
+    hashed = hash_password_pooled(student_in.password)
 
     student = models.Student(
         name=student_in.name,
@@ -50,42 +54,73 @@ def register_student(student_in: schemas.StudentCreate, db: Session = Depends(ge
     db.refresh(student)
     return student
 
-@router.post("/login", response_model=schemas.StudentOut)
-def login_student(login_data: schemas.StudentLogin, db: Session = Depends(get_db)):
-    """Student login - optimized for speed"""
-    student = db.query(models.Student).filter(models.Student.email == login_data.email).first()
-    
-    if not student:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid email or password",
-        )
+@router.post("/login", response_model=schemas.StudentLoginOut)
+async def login_student(login_data: schemas.StudentLogin, db: AsyncSession = Depends(get_async_db)):
+    """Student login (KDF runs in the password pool, not on the event loop)"""
+    result = await db.execute(
+        select(models.Student).where(models.Student.email == login_data.email).limit(1)
+    )
+    student = result.scalars().first()
 
-    if not verify_password(login_data.password, student.password_hash):
+    # Unknown e-mail still pays for one hash check: same timing either way
+    ok, upgraded = await averify_and_update(
+        login_data.password, student.password_hash if student else None
+    )
+    if not ok:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password",
         )
 
-    return student
+    if upgraded:
+        # Legacy SHA-256 (or old scrypt parameters): store the new hash
+        student.password_hash = upgraded
+        await db.commit()
+
+    return schemas.StudentLoginOut(
+        **schemas.StudentOut.model_validate(student).model_dump(),
+        access_token=issue_token(student.id, student.profile_version or 0),
+        expires_in=settings.auth_token_ttl_minutes * 60,
+    )
+
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout_student(claims: TokenClaims = Depends(require_claims)):
+    """Revoke the bearer token used for this call."""
+    revocations.revoke(claims.jti, claims.exp)
 
 # ==================== PROFILE ENDPOINTS ====================
 
 @router.get("/{student_id}", response_model=schemas.StudentOut)
-def get_student_profile(student_id: int, db: Session = Depends(get_db)):
-    """Get student profile by ID"""
-    student = db.query(models.Student).filter(models.Student.id == student_id).first()
+def get_student_profile(
+    student_id: int,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db),
+    claims: Optional[TokenClaims] = Depends(optional_claims),
+):
+    """Get student profile by ID (served from the profile cache when warm; 304 when unchanged)"""
+    authorize_student(claims, student_id)
+    # 404 before any 304: If-None-Match: * (or the ETag of a never-bumped
+    # key) must not match a student that does not exist
+    student = get_student(db, student_id)
     if not student:
         raise HTTPException(status_code=404, detail="Student not found")
+    cond = versions.check(request, db, [f"student:{student_id}"])
+    if cond.not_modified:
+        return cond.not_modified_response()
+    cond.apply(response)
     return student
 
 @router.patch("/{student_id}", response_model=schemas.StudentOut)
 def update_student_profile(
     student_id: int,
     student_update: schemas.StudentUpdate,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    claims: Optional[TokenClaims] = Depends(optional_claims),
 ):
     """Update student profile (skills, interests, etc.)"""
+    authorize_student(claims, student_id)
     student = db.query(models.Student).filter(models.Student.id == student_id).first()
     if not student:
         raise HTTPException(status_code=404, detail="Student not found")
@@ -93,11 +128,103 @@ def update_student_profile(
     update_data = student_update.dict(exclude_unset=True)
     for field, value in update_data.items():
         setattr(student, field, value)
+    if update_data:
+        # Invalidates this student's materialized recommendations; delete
+        # them too, since tokens issued earlier still carry the old version
+        student.profile_version = (student.profile_version or 0) + 1
+        db.execute(
+            delete(models.StudentRecommendation)
+            .where(models.StudentRecommendation.student_id == student_id)
+        )
+        versions.bump(db, f"student:{student_id}")
     
     db.commit()
     db.refresh(student)
+    entity_cache.invalidate("student", student_id)
+    # Encode the new profile now rather than on the next recommend call
+    warm_student_vector(student)
     return student
 
+# ==================== DASHBOARD ====================
+
+# Each part runs in its own AsyncSession (a session can't run queries
+# concurrently), so the three DB round trips overlap.
+
+async def _dashboard_connections(student_id: int) -> List[schemas.DashboardConnection]:
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(models.ConnectionRequest)
+            .options(joinedload(models.ConnectionRequest.alumni))
+            .where(models.ConnectionRequest.student_id == student_id)
+            .order_by(models.ConnectionRequest.created_at.desc())
+        )
+        requests = result.scalars().all()
+        await auto_accept_old_requests(requests, db)
+
+        return [
+            schemas.DashboardConnection(
+                id=req.id,
+                student_id=req.student_id,
+                alumni_id=req.alumni_id,
+                status=req.status,
+                created_at=req.created_at,
+                alumni_name=req.alumni.name if req.alumni else None,
+                alumni_role=req.alumni.current_role if req.alumni else None,
+                alumni_company=req.alumni.company if req.alumni else None,
+            )
+            for req in requests
+        ]
+
+
+async def _dashboard_recommendations(student, top_k: int):
+    async with AsyncSessionLocal() as db:
+        return await recommend(db, student.id, top_k, student=student)
+
+
+async def _dashboard_unread(student_id: int) -> dict:
+    # Counters kept by chat send / mark-read (no scan of `messages`)
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(models.ConversationSummary.peer_id, models.ConversationSummary.unread_count)
+            .where(
+                models.ConversationSummary.user_type == "student",
+                models.ConversationSummary.user_id == student_id,
+                models.ConversationSummary.unread_count > 0,
+            )
+        )
+        return {alumni_id: count for alumni_id, count in result.all()}
+
+
+@router.get("/{student_id}/dashboard", response_model=schemas.StudentDashboard)
+async def get_student_dashboard(
+    student_id: int,
+    top_k: int = 6,
+    db: AsyncSession = Depends(get_async_db),
+    claims: Optional[TokenClaims] = Depends(optional_claims),
+):
+    """
+    Everything dashboard.html needs in one call: profile, connection
+    requests (with alumni names), top recommendations and unread counts.
+    """
+    authorize_student(claims, student_id)
+    student = await aget_student(db, student_id)
+    if not student:
+        raise HTTPException(status_code=404, detail="Student not found")
+
+    connections, recommendations, unread = await asyncio.gather(
+        _dashboard_connections(student_id),
+        _dashboard_recommendations(student, top_k),
+        _dashboard_unread(student_id),
+    )
+
+    return schemas.StudentDashboard(
+        profile=student,
+        connections=connections,
+        recommendations=recommendations,
+        unread_messages=sum(unread.values()),
+        unread_by_alumni=unread,
+    )
+
 # ==================== SIMPLE CREATION (FOR SEEDING) ====================
 
 @router.post("/", status_code=status.HTTP_201_CREATED)
@@ -125,13 +252,11 @@ def create_student_simple(
                 detail="Student with this email already exists"
             )
     
-    # Create with default password hash if not provided
-    default_password = hashlib.sha256("defaultpassword".encode()).hexdigest()
-    
+    # No shared default password: seeded accounts can't log in until one is set
     db_student = models.Student(
         name=name,
         email=email,
-        password_hash=default_password,
+        password_hash=unusable_password(),
         skills=skills,
         year=graduation_year,
         department=department,
@@ -161,18 +286,17 @@ def create_student_simple(
 @router.get("/", response_model=List[dict])
 def get_all_students(db: Session = Depends(get_db)):
     """Get all students"""
-    students = db.query(models.Student).all()
-    return [
-        {
-            "id": s.id,
-            "name": s.name,
-            "email": s.email,
-            "skills": s.skills,
-            "graduation_year": s.year,
-            "department": s.department
-        }
-        for s in students
-    ]
+    result = db.execute(
+        select(
+            models.Student.id,
+            models.Student.name,
+            models.Student.email,
+            models.Student.skills,
+            models.Student.year.label("graduation_year"),
+            models.Student.department,
+        )
+    )
+    return TrustedJSONResponse(row_dicts(result))
 
 
 
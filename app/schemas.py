@@ -1,5 +1,5 @@
 from pydantic import BaseModel, ConfigDict
-from typing import Optional, List
+from typing import Optional, List, Dict
 from datetime import datetime
 
 
@@ -53,6 +53,7 @@ class StudentOut(BaseModel):
     skills: Optional[str] = None
     interests: Optional[str] = None
     career_goal: Optional[str] = None
+    profile_version: int = 0
 
 
 class StudentUpdate(BaseModel):
@@ -71,6 +72,12 @@ class StudentLogin(BaseModel):
     password: str
 
 
+class StudentLoginOut(StudentOut):
+    access_token: str
+    token_type: str = "bearer"
+    expires_in: int                    # seconds
+
+
 # --------- Feedback Schemas ---------
 class FeedbackCreate(BaseModel):
     student_id: int
@@ -87,6 +94,21 @@ class FeedbackOut(BaseModel):
     rating: Optional[float] = None
     comment: Optional[str] = None
     reward: Optional[float] = None
+    created_at: Optional[datetime] = None
+
+
+class FeedbackPage(BaseModel):
+    items: List[FeedbackOut]
+    next_before_id: Optional[int] = None   # pass as ?before_id= for the next page
+
+
+class AlumniRatingStatsOut(BaseModel):
+    alumni_id: int
+    feedback_count: int = 0
+    rating_count: int = 0
+    avg_rating: Optional[float] = None
+    avg_reward: Optional[float] = None
+    last_feedback_at: Optional[datetime] = None
 
 
 # --------- Connection Schemas ---------
@@ -108,6 +130,29 @@ class ConnectionRequestOut(BaseModel):
     created_at: Optional[datetime] = None
 
 
+class AlumniSummary(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    id: int
+    name: str
+    current_role: Optional[str] = None
+    company: Optional[str] = None
+    domain: Optional[str] = None
+
+
+class StudentSummary(BaseModel):
+    """Public fields only: /connect/alumni/{id}/expanded is readable without a student token."""
+    model_config = ConfigDict(from_attributes=True)
+    id: int
+    name: str
+    department: Optional[str] = None
+    year: Optional[int] = None
+
+
+class ConnectionRequestExpanded(ConnectionRequestOut):
+    alumni: Optional[AlumniSummary] = None
+    student: Optional[StudentSummary] = None
+
+
 # --------- Chat Schemas ---------
 class ChatMessageCreate(BaseModel):
     student_id: int
@@ -130,6 +175,21 @@ class ChatReply(BaseModel):
     reply: str
 
 
+class InboxItem(BaseModel):
+    alumni_id: int
+    alumni_name: Optional[str] = None
+    unread_count: int
+    last_message_id: int
+    last_message_preview: str
+    last_sender_type: str
+    last_message_at: Optional[datetime] = None
+
+
+class InboxPage(BaseModel):
+    items: List[InboxItem]
+    next_before_id: Optional[int] = None   # pass as ?before_id= for the next page
+
+
 # --------- Email Schema ---------
 class EmailToMentor(BaseModel):
     student_id: int
@@ -146,6 +206,21 @@ class RecommendationOut(AlumniOut):
     model_config = ConfigDict(from_attributes=True)  # ✅ FIXED: added closing parenthesis
 
 
+# --------- Dashboard Schema (students.py) ---------
+class DashboardConnection(ConnectionRequestOut):
+    alumni_name: Optional[str] = None
+    alumni_role: Optional[str] = None
+    alumni_company: Optional[str] = None
+
+
+class StudentDashboard(BaseModel):
+    profile: StudentOut
+    connections: List[DashboardConnection]
+    recommendations: List[RecommendationOut]
+    unread_messages: int = 0
+    unread_by_alumni: Dict[int, int] = {}
+
+
 
 
 
@@ -0,0 +1,128 @@
+"""
+Version counters for conditional GET (ETag / Last-Modified -> 304).
+
+`data_versions` keeps one counter per key, bumped by the write paths in
+the same transaction as the change itself:
+
+    alumni              alumni register / CSV import
+    student:{id}        profile update
+    feedback            any feedback (feeds the bandit re-ranking)
+    recommendations     a materialize run
+    chat:{sid}:{aid}    message sent / history cleared
+
+A read endpoint loads the counters it depends on (one primary-key query),
+derives a weak ETag from them and, when the client's If-None-Match (or
+If-Modified-Since) still matches, answers 304 before running its real
+query or serializing anything. Counters live in the DB, so every worker
+agrees on them.
+
+Writes that bypass the API (bulk SQL, scripts) must bump() the matching
+keys as well, or clients keep serving their cached copy.
+"""
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Iterable, NamedTuple, Optional
+
+from fastapi import Request, Response
+from sqlalchemy import select
+
+from . import models
+
+CACHE_CONTROL = "private, no-cache"  # browsers may keep a copy but must revalidate
+
+
+def _upsert(dialect: str, keys: Iterable[str], now: datetime):
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    stmt = insert(models.DataVersion).values(
+        [{"key": k, "version": 1, "updated_at": now} for k in dict.fromkeys(keys)]
+    )
+    return stmt.on_conflict_do_update(
+        index_elements=[models.DataVersion.key],
+        set_={"version": models.DataVersion.version + 1, "updated_at": stmt.excluded.updated_at},
+    )
+
+
+def bump(db, *keys: str) -> None:
+    """Increment `keys` inside the caller's transaction (caller commits)."""
+    db.execute(_upsert(db.get_bind().dialect.name, keys, datetime.utcnow()))
+
+
+async def abump(db, *keys: str) -> None:
+    await db.execute(_upsert(db.get_bind().dialect.name, keys, datetime.utcnow()))
+
+
+def _query(keys):
+    return select(models.DataVersion.key, models.DataVersion.version, models.DataVersion.updated_at).where(
+        models.DataVersion.key.in_(keys)
+    )
+
+
+class Conditional(NamedTuple):
+    etag: str
+    last_modified: Optional[datetime]
+    not_modified: bool
+
+    def headers(self) -> dict:
+        headers = {"ETag": self.etag, "Cache-Control": CACHE_CONTROL}
+        if self.last_modified is not None:
+            headers["Last-Modified"] = format_datetime(self.last_modified.replace(tzinfo=timezone.utc), usegmt=True)
+        return headers
+
+    def not_modified_response(self) -> Response:
+        return Response(status_code=304, headers=self.headers())
+
+    def apply(self, response: Response) -> Response:
+        """Stamp the validators on a full (200) response."""
+        response.headers.update(self.headers())
+        return response
+
+
+def evaluate(request: Request, keys, rows, variant: str = "") -> Conditional:
+    """rows: (key, version, updated_at) for the keys that have ever been bumped."""
+    found = {key: (version, updated_at) for key, version, updated_at in rows}
+    digest = hashlib.sha1(variant.encode())
+    for key in keys:
+        digest.update(f"|{key}={found.get(key, (0, None))[0]}".encode())
+    etag = f'W/"{digest.hexdigest()[:20]}"'
+    stamps = [updated_at for _, updated_at in found.values()]
+    last_modified = max(stamps).replace(microsecond=0) if stamps else None
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        candidates = {tag.strip() for tag in if_none_match.split(",")}
+        # Weak comparison: W/"x" and "x" are the same validator
+        not_modified = "*" in candidates or etag in candidates or etag[2:] in candidates
+    else:
+        not_modified = _not_modified_since(request.headers.get("if-modified-since"), last_modified)
+    return Conditional(etag, last_modified, not_modified)
+
+
+def _not_modified_since(header: Optional[str], last_modified: Optional[datetime]) -> bool:
+    if header is None or last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(header)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is not None:
+        since = since.astimezone(timezone.utc).replace(tzinfo=None)
+    return last_modified <= since
+
+
+def check(request: Request, db, keys, variant: str = "") -> Conditional:
+    """
+    Call after the route's 404 check: `If-None-Match: *` matches any current
+    representation, and keys that were never bumped hash the same for ids
+    that do not exist.
+    """
+    keys = list(keys)
+    return evaluate(request, keys, db.execute(_query(keys)).all(), variant)
+
+
+async def acheck(request: Request, db, keys, variant: str = "") -> Conditional:
+    keys = list(keys)
+    return evaluate(request, keys, (await db.execute(_query(keys))).all(), variant)
@@ -0,0 +1,78 @@
+"""
+Memory per alumnus and recommend latency: ORM rows vs the columnar AlumniStore.
+
+    python -m benchmarks.bench_alumni_store [--sizes 1000 10000 100000]
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+
+from .common import use_temp_database, seed_alumni
+
+use_temp_database("alumni_store")
+
+from app.database import engine, init_db, SessionLocal  # noqa: E402
+from app import models, schemas  # noqa: E402
+from app.alumni_store import AlumniStore  # noqa: E402
+from app.routers.recommend import build_recommendations, recommend_from_store  # noqa: E402
+
+STUDENT = schemas.StudentOut(id=1, name="Bench", email="b@example.com", skills="Python, SQL, ML, React")
+
+
+def retained_bytes(build):
+    """Bytes still allocated after build() returns (what a worker keeps resident)."""
+    gc.collect()
+    tracemalloc.start()
+    obj = build()
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return obj, current
+
+
+def timed(fn, repeat: int = 20) -> float:
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - t0) / repeat * 1000
+
+
+def run(n: int) -> None:
+    models.Base.metadata.drop_all(bind=engine)
+    init_db()
+    seed_alumni(engine, n)
+
+    db = SessionLocal()
+    try:
+        orm_rows, orm_bytes = retained_bytes(lambda: db.query(models.Alumni).all())
+        db.expunge_all()
+        del orm_rows
+
+        store = AlumniStore()
+        snap, store_bytes = retained_bytes(lambda: store.ensure_fresh(db))
+
+        def orm_recommend():
+            rows = db.query(models.Alumni).filter(models.Alumni.mentorship_available == True).all()
+            build_recommendations(STUDENT, rows, 10)
+            db.expunge_all()
+
+        repeat = max(1, min(20, 200000 // n))
+        orm_ms = timed(orm_recommend, repeat)
+        store_ms = timed(lambda: recommend_from_store(STUDENT, store.ensure_fresh(db), 10), repeat)
+    finally:
+        db.close()
+
+    print(
+        f"{n:>9} alumni | bytes/alumnus  ORM {orm_bytes / n:>8.0f}  store {store_bytes / n:>6.0f}"
+        f"  ({orm_bytes / max(store_bytes, 1):.1f}x) | recommend  ORM {orm_ms:>9.1f} ms"
+        f"  store {store_ms:>7.2f} ms"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    args = parser.parse_args()
+    for size in args.sizes:
+        run(size)
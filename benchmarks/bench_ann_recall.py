@@ -0,0 +1,83 @@
+"""
+IVF recall@k vs latency against exact cosine search.
+
+    python -m benchmarks.bench_ann_recall [--sizes 10000 100000 1000000] [--nprobe 1 2 4 8 16 32]
+
+Vectors are synthetic unit vectors drawn around a few thousand "profile"
+centres (alumni profiles cluster by role / domain the same way), saved to
+.npy and memory-mapped exactly like app/embeddings.py does. Queries are
+perturbed centres, i.e. students close to some group of alumni.
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from app.ann import IVFIndex, exact_search
+
+from .common import percentile
+
+
+def synthetic_vectors(n: int, dim: int, centres: int, rng) -> np.ndarray:
+    c = rng.standard_normal((centres, dim)).astype(np.float32)
+    c /= np.linalg.norm(c, axis=1, keepdims=True)
+    out = np.empty((n, dim), dtype=np.float32)
+    for start in range(0, n, 100000):
+        stop = min(n, start + 100000)
+        v = c[rng.integers(0, centres, stop - start)] + 0.35 * rng.standard_normal((stop - start, dim)).astype(np.float32) / np.sqrt(dim)
+        out[start:stop] = v / np.linalg.norm(v, axis=1, keepdims=True)
+    return out
+
+
+def queries(vectors: np.ndarray, count: int, rng) -> np.ndarray:
+    q = vectors[rng.integers(0, len(vectors), count)] + 0.3 * rng.standard_normal((count, vectors.shape[1])).astype(np.float32) / np.sqrt(vectors.shape[1])
+    return q / np.linalg.norm(q, axis=1, keepdims=True)
+
+
+def timed_search(fn, qs):
+    results, lat = [], []
+    for q in qs:
+        t0 = time.perf_counter()
+        results.append(fn(q)[0])
+        lat.append(time.perf_counter() - t0)
+    return results, lat
+
+
+def run(n: int, dim: int, k: int, nprobes, num_queries: int, seed: int = 0) -> None:
+    rng = np.random.default_rng(seed)
+    path = os.path.join(tempfile.mkdtemp(prefix="ann-"), "vectors.npy")
+    np.save(path, synthetic_vectors(n, dim, max(50, n // 200), rng))
+    vectors = np.load(path, mmap_mode="r")
+
+    t0 = time.perf_counter()
+    ivf = IVFIndex.train(vectors)
+    build_s = time.perf_counter() - t0
+
+    qs = queries(vectors, num_queries, rng)
+    truth, exact_lat = timed_search(lambda q: exact_search(vectors, q, k), qs)
+    print(
+        f"\n{n:>9} alumni  dim={dim}  nlist={ivf.nlist}  train {build_s:.1f} s | exact "
+        f"p50 {percentile(exact_lat, 50) * 1000:7.2f} ms  p99 {percentile(exact_lat, 99) * 1000:7.2f} ms"
+    )
+    print(f"{'nprobe':>8} {'recall@' + str(k):>10} {'p50 ms':>9} {'p99 ms':>9} {'speedup':>8}")
+    for nprobe in nprobes:
+        found, lat = timed_search(lambda q: ivf.search(vectors, q, k, nprobe), qs)
+        recall = np.mean([len(np.intersect1d(a, b)) / len(b) for a, b in zip(found, truth)])
+        print(
+            f"{nprobe:>8} {recall:>10.3f} {percentile(lat, 50) * 1000:>9.2f} {percentile(lat, 99) * 1000:>9.2f}"
+            f" {percentile(exact_lat, 50) / max(percentile(lat, 50), 1e-9):>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32])
+    parser.add_argument("--dim", type=int, default=64)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+    for size in args.sizes:
+        run(size, args.dim, args.k, args.nprobe, args.queries)
@@ -0,0 +1,89 @@
+"""
+Worker cold start: building the alumni snapshot + bandit state from the DB
+vs opening the published memory-mapped artifacts.
+
+    python -m benchmarks.bench_artifact_startup [--sizes 10000 100000 1000000]
+
+"private" is what tracemalloc sees allocated by the worker itself; mmap'd
+artifact pages are shared through the page cache and are not counted.
+"""
+import argparse
+import gc
+import os
+import tempfile
+import time
+import tracemalloc
+
+from .common import use_temp_database, seed_alumni
+
+use_temp_database("artifacts")
+os.environ["ARTIFACT_DIR"] = tempfile.mkdtemp(prefix="artifacts-")
+
+from app.database import engine, init_db, SessionLocal  # noqa: E402
+from app import artifacts, models  # noqa: E402
+from app.alumni_store import AlumniStore  # noqa: E402
+from app.bandit import ThompsonReranker  # noqa: E402
+from app.config import settings  # noqa: E402
+from app.routers.recommend import recommend_from_store  # noqa: E402
+from app import schemas  # noqa: E402
+
+STUDENT = schemas.StudentOut(id=1, name="Bench", email="b@example.com", skills="Python, SQL, ML, React")
+
+
+def first_request(db):
+    """What the first recommend request in a fresh worker pays."""
+    store, reranker = AlumniStore(), ThompsonReranker()
+    snap = store.ensure_fresh(db)
+    reranker.ensure_fresh(db)
+    recommend_from_store(STUDENT, snap, 10, reranker)
+    return store, reranker
+
+
+def cold_start(db):
+    """(seconds, private bytes retained): timed untraced, memory traced separately."""
+    t0 = time.perf_counter()
+    first_request(db)
+    elapsed = time.perf_counter() - t0
+
+    gc.collect()
+    tracemalloc.start()
+    state = first_request(db)
+    gc.collect()
+    private, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del state
+    return elapsed, private
+
+
+def run(n: int) -> None:
+    models.Base.metadata.drop_all(bind=engine)
+    init_db()
+    seed_alumni(engine, n)
+
+    db = SessionLocal()
+    try:
+        settings.artifacts_enabled = False
+        db_s, db_bytes = cold_start(db)
+
+        settings.artifacts_enabled = True
+        t0 = time.perf_counter()
+        artifacts.publish(artifacts.build(db))
+        build_s = time.perf_counter() - t0
+        art_s, art_bytes = cold_start(db)
+        artifacts.prune(1)
+    finally:
+        db.close()
+
+    print(
+        f"{n:>9} alumni | offline build {build_s:>6.2f} s | cold start  DB {db_s * 1000:>8.1f} ms"
+        f"  artifacts {art_s * 1000:>7.1f} ms | private memory  DB {db_bytes / 2**20:>7.1f} MiB"
+        f"  artifacts {art_bytes / 2**20:>6.1f} MiB"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 1000000])
+    args = parser.parse_args()
+    for size in args.sizes:
+        run(size)
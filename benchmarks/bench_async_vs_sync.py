@@ -0,0 +1,83 @@
+"""
+Async vs sync throughput for the hot routes.
+
+The sync baseline replays the old code path (sync Session + threadpool)
+on a side route; the async numbers hit the real routes.
+
+    python -m benchmarks.bench_async_vs_sync [--total 1000] [--concurrency 64]
+"""
+import argparse
+import asyncio
+
+from .common import use_temp_database, drive, print_table
+
+use_temp_database("async_vs_sync")
+
+import httpx  # noqa: E402
+from fastapi import Depends, HTTPException  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app.main import app  # noqa: E402
+from app.database import get_db, init_db  # noqa: E402
+from app import models  # noqa: E402
+from app.routers.recommend import build_recommendations  # noqa: E402
+from app.passwords import verify_password  # noqa: E402
+
+
+# ---- sync baselines (pre-async code path) ----
+def sync_recommend(student_id: int, db: Session = Depends(get_db), top_k: int = 10):
+    student = db.query(models.Student).filter(models.Student.id == student_id).first()
+    if not student:
+        raise HTTPException(status_code=404, detail="Student not found")
+    alumni_list = db.query(models.Alumni).filter(models.Alumni.mentorship_available == True).all()
+    return build_recommendations(student, alumni_list, top_k)
+
+
+def sync_connections(student_id: int, db: Session = Depends(get_db)):
+    return db.query(models.ConnectionRequest).filter(
+        models.ConnectionRequest.student_id == student_id
+    ).all()
+
+
+def sync_login(email: str, password: str, db: Session = Depends(get_db)):
+    student = db.query(models.Student).filter(models.Student.email == email).first()
+    if not student or not verify_password(password, student.password_hash):
+        raise HTTPException(status_code=401)
+    return {"id": student.id}
+
+
+app.add_api_route("/_bench/sync/recommend/{student_id}", sync_recommend)
+app.add_api_route("/_bench/sync/connect/{student_id}", sync_connections)
+app.add_api_route("/_bench/sync/login", sync_login, methods=["POST"])
+
+
+async def main(total: int, concurrency: int):
+    init_db()  # ASGITransport does not run the lifespan hook
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await client.post("/alumni/import_csv")
+        await client.post(
+            "/students/register",
+            json={"name": "Bench", "email": "bench@example.com", "password": "pw", "skills": "Python, SQL, ML"},
+        )
+        for alumni_id in (1, 2, 3):
+            await client.post("/connect/request", json={"student_id": 1, "alumni_id": alumni_id})
+
+        login = {"email": "bench@example.com", "password": "pw"}
+        rows = {
+            "recommend  sync": await drive(client, "GET", "/_bench/sync/recommend/1", total, concurrency),
+            "recommend  async": await drive(client, "GET", "/recommend/student/1", total, concurrency),
+            "connect    sync": await drive(client, "GET", "/_bench/sync/connect/1", total, concurrency),
+            "connect    async": await drive(client, "GET", "/connect/student/1", total, concurrency),
+            "login      sync": await drive(client, "POST", "/_bench/sync/login", total, concurrency, params=login),
+            "login      async": await drive(client, "POST", "/students/login", total, concurrency, json=login),
+        }
+    print_table(f"async vs sync (total={total}, concurrency={concurrency})", rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--total", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    args = parser.parse_args()
+    asyncio.run(main(args.total, args.concurrency))
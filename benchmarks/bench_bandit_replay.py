@@ -0,0 +1,67 @@
+"""
+Offline replay of the Thompson-sampling re-ranker vs the old random shuffle.
+
+Runs bandit.replay_evaluate over the interactions table of the configured
+DATABASE_URL. With --synthetic, first builds a temp DB with students,
+alumni and rated interactions drawn from hidden per-alumni quality.
+
+    python -m benchmarks.bench_bandit_replay [--synthetic] [--top-k 10]
+"""
+import argparse
+import json
+import os
+
+
+def seed_synthetic(students: int, alumni: int, events: int, seed: int = 7) -> None:
+    import numpy as np
+    from app.database import engine, init_db
+    from app import models
+    from .common import seed_alumni, synthetic_alumni
+
+    rng = np.random.default_rng(seed)
+    skill_pool = [row["skills"] for row in synthetic_alumni(alumni)]
+    init_db()
+    seed_alumni(engine, alumni)
+    quality = rng.beta(2, 2, size=alumni)  # hidden mean rating / 5 per alumni
+    with engine.begin() as conn:
+        conn.execute(models.Student.__table__.insert(), [
+            {"name": f"S{i}", "email": f"s{i}@example.com", "password_hash": "x",
+             "skills": skill_pool[int(rng.integers(len(skill_pool)))]}
+            for i in range(students)
+        ])
+        rows = []
+        for _ in range(events):
+            a = int(rng.integers(alumni))
+            rating = float(np.clip(np.round(rng.normal(quality[a] * 5, 0.7)), 1, 5))
+            rows.append({
+                "student_id": int(rng.integers(students)) + 1,
+                "alumni_id": a + 1,
+                "rating": rating,
+                "reward": round(rating / 5.0, 3),
+            })
+        conn.execute(models.Interaction.__table__.insert(), rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--synthetic", action="store_true")
+    parser.add_argument("--students", type=int, default=200)
+    parser.add_argument("--alumni", type=int, default=50)
+    parser.add_argument("--events", type=int, default=20000)
+    parser.add_argument("--top-k", type=int, default=5)
+    args = parser.parse_args()
+
+    if args.synthetic or "DATABASE_URL" not in os.environ:
+        from .common import use_temp_database
+        use_temp_database("bandit_replay")
+        seed_synthetic(args.students, args.alumni, args.events)
+
+    from app.database import SessionLocal
+    from app.bandit import replay_evaluate
+
+    db = SessionLocal()
+    try:
+        for use_bandit in (False, True):
+            print(json.dumps(replay_evaluate(db, top_k=args.top_k, use_bandit=use_bandit)))
+    finally:
+        db.close()
@@ -0,0 +1,125 @@
+"""
+Response compression: CPU spent vs bytes saved.
+
+    python -m benchmarks.bench_compression [--rows 10000] [--total 30] [--mbit 20]
+
+Part 1 compresses real response bodies (/alumni/, /students/,
+/chat/history) with gzip levels 1/6/9 and, when the `brotli` package is
+installed, Brotli qualities 1/5/11. For each it reports the size ratio,
+compression time and the time to ship the body over a --mbit link
+(compress + transfer), which is where a level stops paying for itself.
+
+Part 2 goes through the app: identity vs gzip for a precompressed cached
+route (/alumni/, /chat/history) and one compressed per response by the
+middleware (/students/). Reports req/s and bytes on the wire.
+"""
+import argparse
+import asyncio
+import time
+import zlib
+
+from .common import use_temp_database, seed_alumni, seed_students
+
+use_temp_database("compression")
+
+import httpx  # noqa: E402
+
+from app.main import app  # noqa: E402
+from app.database import engine, init_db  # noqa: E402
+from app.compression import brotli, gzip_compress  # noqa: E402
+from app import models  # noqa: E402
+
+
+def seed(rows: int) -> None:
+    from datetime import datetime, timedelta
+    seed_alumni(engine, rows)
+    seed_students(engine, rows)
+    now = datetime.utcnow()
+    with engine.begin() as conn:
+        conn.execute(models.Message.__table__.insert(), [
+            {"sender_id": 1 if i % 2 == 0 else 2, "receiver_id": 2 if i % 2 == 0 else 1,
+             "sender_type": "student" if i % 2 == 0 else "alumni_ai",
+             "receiver_type": "alumni_ai" if i % 2 == 0 else "student",
+             "content": f"Message number {i}: how should I prepare for interviews?", "is_read": False,
+             "created_at": now - timedelta(seconds=rows - i)}
+            for i in range(rows // 10)
+        ])
+
+
+def codecs():
+    out = [(f"gzip -{level}", lambda data, level=level: gzip_compress(data, level)) for level in (1, 6, 9)]
+    if brotli is not None:
+        out += [(f"br q{q}", lambda data, q=q: brotli.compress(data, quality=q)) for q in (1, 5, 11)]
+    return out
+
+
+def cpu_vs_bytes(name: str, body: bytes, mbit: float) -> None:
+    link = mbit * 1e6 / 8  # bytes/s
+    print(f"\n-- {name}: {len(body) / 1e6:.2f} MB identity, {len(body) / link * 1000:.0f} ms at {mbit:g} Mbit/s --")
+    for label, fn in codecs():
+        repeats = 3
+        start = time.perf_counter()
+        for _ in range(repeats):
+            packed = fn(body)
+        ms = (time.perf_counter() - start) / repeats * 1000
+        start = time.perf_counter()
+        if label.startswith("gzip"):
+            zlib.decompress(packed, 16 + zlib.MAX_WBITS)
+        else:
+            brotli.decompress(packed)
+        dec_ms = (time.perf_counter() - start) * 1000
+        print(
+            f"{label:<9} {len(packed) / 1e6:>7.3f} MB  ratio {len(body) / len(packed):>5.1f}x   "
+            f"compress {ms:>7.1f} ms ({len(body) / ms / 1e3:>6.1f} MB/s)   decompress {dec_ms:>6.1f} ms   "
+            f"compress+send {ms + len(packed) / link * 1000:>7.0f} ms"
+        )
+
+
+async def measure(client, url: str, total: int, encoding: str, **kwargs) -> dict:
+    headers = {"Accept-Encoding": encoding}
+    await client.get(url, headers=headers, **kwargs)  # warm (snapshot, precompressed bodies)
+    wire = 0
+    start = time.perf_counter()
+    for _ in range(total):
+        # Raw bytes: the client-side gunzip is not the server's cost
+        async with client.stream("GET", url, headers=headers, **kwargs) as resp:
+            resp.raise_for_status()
+            async for chunk in resp.aiter_raw():
+                wire += len(chunk)
+    elapsed = time.perf_counter() - start
+    return {"rps": total / elapsed, "bytes": wire // total, "encoding": resp.headers.get("content-encoding", "identity")}
+
+
+async def main(rows: int, total: int, mbit: float):
+    init_db()  # ASGITransport does not run the lifespan hook
+    seed(rows)
+    history = {"params": {"student_id": 1, "alumni_id": 2}}
+    cases = [
+        ("GET /alumni/ (cached)", "/alumni/", {}),
+        ("GET /chat/history (cached)", "/chat/history", history),
+        ("GET /students/ (per response)", "/students/", {}),
+    ]
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        print(f"\n== CPU vs bytes, {rows} rows ==")
+        for name, url, kwargs in cases:
+            body = (await client.get(url, headers={"Accept-Encoding": "identity"}, **kwargs)).content
+            cpu_vs_bytes(name, body, mbit)
+
+        print(f"\n== through the app, {total} sequential requests ==")
+        for name, url, kwargs in cases:
+            plain = await measure(client, url, total, "identity", **kwargs)
+            packed = await measure(client, url, total, "gzip, br", **kwargs)
+            print(
+                f"{name:<30} identity {plain['rps']:>7.1f} req/s {plain['bytes'] / 1e6:>7.3f} MB   "
+                f"{packed['encoding']:<5} {packed['rps']:>7.1f} req/s {packed['bytes'] / 1e6:>7.3f} MB"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--total", type=int, default=30)
+    parser.add_argument("--mbit", type=float, default=20.0, help="link speed for compress+send estimates")
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.total, args.mbit))
@@ -0,0 +1,60 @@
+"""
+Polling cost with and without conditional GET (app/versions.py).
+
+    python -m benchmarks.bench_conditional_get [--alumni 10000] [--total 300] [--concurrency 8]
+
+Each endpoint is polled once without validators (full 200) and once
+revalidating with the ETag it returned (304, no query / serialization).
+"""
+import argparse
+import asyncio
+
+from .common import use_temp_database, drive, print_table, seed_alumni, install_llm_stub
+
+use_temp_database("conditional")
+
+import httpx  # noqa: E402
+
+from app.main import app  # noqa: E402
+from app.database import engine, init_db  # noqa: E402
+
+
+async def main(alumni: int, total: int, concurrency: int):
+    init_db()  # ASGITransport does not run the lifespan hook
+    install_llm_stub()
+    seed_alumni(engine, alumni)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await client.post(
+            "/students/register",
+            json={"name": "Bench", "email": "bench@example.com", "password": "pw", "skills": "Python, SQL"},
+        )
+        for _ in range(20):
+            await client.post("/chat/send", json={"student_id": 1, "alumni_id": 2, "message": "hello"})
+
+        cases = [
+            ("/alumni/", {}),
+            ("/students/1", {}),
+            ("/recommend/student/1", {}),
+            ("/chat/history", {"params": {"student_id": 1, "alumni_id": 2}}),
+        ]
+        rows = {}
+        sizes = []
+        for url, kwargs in cases:
+            first = await client.get(url, **kwargs)
+            validators = {"If-None-Match": first.headers["etag"]}
+            assert (await client.get(url, headers=validators, **kwargs)).status_code == 304
+            rows[f"{url} 200"] = await drive(client, "GET", url, total, concurrency, **kwargs)
+            rows[f"{url} 304"] = await drive(client, "GET", url, total, concurrency, headers=validators, **kwargs)
+            sizes.append(f"{url}: {len(first.content)} bytes -> 0")
+    print_table(f"conditional GET ({alumni} alumni, total={total}, concurrency={concurrency})", rows)
+    print("\nbody per poll: " + ", ".join(sizes))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--alumni", type=int, default=10000)
+    parser.add_argument("--total", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+    asyncio.run(main(args.alumni, args.total, args.concurrency))
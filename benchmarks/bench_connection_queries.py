@@ -0,0 +1,97 @@
+"""
+SQL statements per connection listing, as the list grows.
+
+Expanded listing (selectinload) must stay flat; the lazy-per-row
+pattern it replaces grows linearly (the classic N+1).
+
+    python -m benchmarks.bench_connection_queries [--sizes 10 100 1000]
+"""
+import argparse
+import asyncio
+from datetime import datetime
+
+from .common import use_temp_database, seed_alumni
+
+use_temp_database("connection_queries")
+
+import httpx  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+from sqlalchemy.orm import lazyload  # noqa: E402
+
+from app.main import app  # noqa: E402
+from app.database import engine, init_db, SessionLocal  # noqa: E402
+from app.async_database import async_engine  # noqa: E402
+from app import models  # noqa: E402
+
+
+class QueryCounter:
+    def __init__(self, *engines):
+        self.count = 0
+        for eng in engines:
+            event.listen(eng, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, *args, **kwargs):
+        self.count += 1
+
+
+def seed(n: int) -> int:
+    """One student with n accepted requests to n different alumni; returns the student id."""
+    with engine.begin() as conn:
+        conn.execute(models.ConnectionRequest.__table__.delete())
+        conn.execute(models.Student.__table__.delete())
+        student_id = conn.execute(
+            models.Student.__table__.insert().values(name="Bench", email="bench@example.com", password_hash="x")
+        ).inserted_primary_key[0]
+        conn.execute(
+            models.ConnectionRequest.__table__.insert(),
+            [
+                {"student_id": student_id, "alumni_id": i, "status": "Accepted", "created_at": datetime.utcnow()}
+                for i in range(1, n + 1)
+            ],
+        )
+    return student_id
+
+
+def naive_listing(student_id: int) -> list:
+    """Pre-change pattern: load requests, then touch each relationship lazily."""
+    db = SessionLocal()
+    try:
+        reqs = (
+            db.query(models.ConnectionRequest)
+            .options(lazyload(models.ConnectionRequest.alumni), lazyload(models.ConnectionRequest.student))
+            .filter(models.ConnectionRequest.student_id == student_id)
+            .all()
+        )
+        return [(r.id, r.alumni.name, r.student.name) for r in reqs]
+    finally:
+        db.close()
+
+
+async def main(sizes):
+    init_db()
+    seed_alumni(engine, max(sizes))
+    counter = QueryCounter(engine, async_engine.sync_engine)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        print(f"\n{'rows':>6} | {'expanded endpoint':>18} | {'lazy per-row (N+1)':>18}")
+        for n in sizes:
+            student_id = seed(n)
+
+            counter.count = 0
+            resp = await client.get(f"/connect/student/{student_id}/expanded")
+            assert resp.status_code == 200 and len(resp.json()) == n
+            expanded = counter.count
+
+            counter.count = 0
+            naive_listing(student_id)
+            naive = counter.count
+
+            print(f"{n:>6} | {expanded:>18} | {naive:>18}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    args = parser.parse_args()
+    asyncio.run(main(args.sizes))
@@ -0,0 +1,93 @@
+"""
+Streaming export vs the JSON list endpoint: time to first byte, total
+time and memory growth while serving the whole alumni table.
+
+    python -m benchmarks.bench_export [--alumni 200000]
+
+Calls the ASGI app directly (httpx's ASGITransport buffers the whole
+body) and only counts the bytes sent. Exports run first, since peak RSS
+only ever grows; tracemalloc peaks are measured in a separate pass.
+"""
+import argparse
+import asyncio
+import os
+import time
+import tracemalloc
+
+from .common import use_temp_database, seed_alumni, peak_rss_mib
+
+use_temp_database("export")
+os.environ.setdefault("EXPORT_TOKEN", "bench")  # exports are off without one
+
+from app.main import app  # noqa: E402
+from app.database import engine, init_db  # noqa: E402
+
+
+async def fetch(path: str, query: str = "") -> dict:
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "query_string": query.encode(),
+        "root_path": "", "headers": [(b"host", b"bench"), (b"x-export-token", os.environ["EXPORT_TOKEN"].encode())], "client": ("127.0.0.1", 1), "server": ("bench", 80),
+    }
+    start = time.perf_counter()
+    first = None
+    size = 0
+    chunks = 0
+
+    requested = False
+    done = asyncio.Event()
+
+    async def receive():
+        # Request body once, then block until the response is complete (as uvicorn does)
+        nonlocal requested
+        if not requested:
+            requested = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await done.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal first, size, chunks
+        if message["type"] == "http.response.body" and message.get("body"):
+            if first is None:
+                first = time.perf_counter() - start
+            size += len(message["body"])
+            chunks += 1
+        if message["type"] == "http.response.body" and not message.get("more_body"):
+            done.set()
+
+    await app(scope, receive, send)
+    return {"ttfb_ms": first * 1000, "total_ms": (time.perf_counter() - start) * 1000, "mb": size / 1e6, "chunks": chunks}
+
+
+async def main(alumni: int):
+    init_db()
+    seed_alumni(engine, alumni)
+    cases = [
+        ("/export/alumni (ndjson)", "/export/alumni", "format=ndjson"),
+        ("/export/alumni (csv)", "/export/alumni", "format=csv"),
+        ("/alumni/ (json list)", "/alumni/", ""),
+    ]
+    print(f"\n== whole alumni table, {alumni} rows ==")
+    for name, path, query in cases:
+        rss_before = peak_rss_mib()
+        r = await fetch(path, query)
+        print(
+            f"{name:<26} first byte {r['ttfb_ms']:>8.1f} ms   total {r['total_ms']:>8.0f} ms   "
+            f"{r['mb']:>7.1f} MB in {r['chunks']:>4} chunks   peak RSS +{peak_rss_mib() - rss_before:.0f} MiB"
+        )
+
+    print("\n-- traced Python allocations (separate pass) --")
+    for name, path, query in cases:
+        tracemalloc.start()
+        await fetch(path, query)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"{name:<26} peak {peak / 2**20:>8.1f} MiB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--alumni", type=int, default=200000)
+    args = parser.parse_args()
+    asyncio.run(main(args.alumni))
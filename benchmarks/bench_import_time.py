@@ -0,0 +1,76 @@
+"""
+Cold-start import cost of the app (what every uvicorn worker pays on spawn).
+
+Runs `python -X importtime -c "import app.main"` in a fresh interpreter and
+reports the total plus the heaviest modules. Exits 1 when --budget-ms is
+exceeded (0 = no budget), or when a module that must stay lazy (pandas,
+groq) got imported. tests/test_import_time.py runs the same checks.
+
+    python -m benchmarks.bench_import_time [--budget-ms 2500] [--top 15]
+"""
+import argparse
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Deferred to first use; importing app.main must not pull these in
+MUST_BE_LAZY = ("pandas", "groq")
+
+# Cold import on a small CI runner, with headroom; raise it deliberately
+DEFAULT_BUDGET_MS = 2500.0
+
+
+def profile_import(module: str = "app.main"):
+    env = dict(os.environ, PYTHONPATH=str(ROOT), DATABASE_URL="sqlite:///:memory:")
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+    )
+    rows = []
+    for line in proc.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((name.rstrip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def total_ms(rows) -> float:
+    # top-level entries have exactly one leading space, nested ones more
+    return sum(cum for name, _, cum in rows if not name.startswith("  ")) / 1000.0
+
+
+def eager_modules(rows) -> list:
+    """MUST_BE_LAZY packages that were imported anyway."""
+    loaded = {name.strip().split(".")[0] for name, _, _ in rows}
+    return [m for m in MUST_BE_LAZY if m in loaded]
+
+
+def main(budget_ms: float, top: int) -> int:
+    rows = profile_import()
+    total = total_ms(rows)
+
+    print(f"\n== import app.main: {total:.1f} ms total ==")
+    for name, _, cum in sorted(rows, key=lambda r: r[2], reverse=True)[:top]:
+        print(f"{cum / 1000.0:>9.1f} ms  {name}")
+
+    eager = eager_modules(rows)
+    if eager:
+        print(f"\nFAIL: imported at startup but should be lazy: {', '.join(eager)}")
+        return 1
+    if budget_ms and total > budget_ms:
+        print(f"\nFAIL: {total:.1f} ms exceeds budget of {budget_ms:.0f} ms")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+    sys.exit(main(args.budget_ms, args.top))
@@ -0,0 +1,68 @@
+"""
+Cost of the metrics middleware and SQL statement timers (app/metrics.py).
+
+    python -m benchmarks.bench_metrics_overhead [--total 2000] [--concurrency 16]
+
+Drives the same routes through the full app with and without
+MetricsMiddleware (the engine listeners attached in both runs are
+detached for the baseline), and reports the throughput / p99 delta.
+"""
+import argparse
+import asyncio
+
+from .common import use_temp_database, drive, print_table
+
+use_temp_database("metrics")
+
+import httpx  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+
+from app.main import app  # noqa: E402
+from app.database import engine, init_db  # noqa: E402
+from app.async_database import async_engine  # noqa: E402
+from app import metrics  # noqa: E402
+from starlette.middleware import Middleware  # noqa: E402
+
+ROUTES = [("GET", "/"), ("GET", "/students/1"), ("GET", "/recommend/student/1"), ("GET", "/connect/student/1")]
+
+
+def set_instrumented(enabled: bool) -> None:
+    app.user_middleware = [m for m in app.user_middleware if m.cls is not metrics.MetricsMiddleware]
+    for eng in (engine, async_engine.sync_engine):
+        if event.contains(eng, "before_cursor_execute", metrics._before_cursor_execute):
+            event.remove(eng, "before_cursor_execute", metrics._before_cursor_execute)
+            event.remove(eng, "after_cursor_execute", metrics._after_cursor_execute)
+    if enabled:
+        metrics.instrument_engine(engine)
+        metrics.instrument_engine(async_engine.sync_engine)
+        app.user_middleware.insert(0, Middleware(metrics.MetricsMiddleware))
+    app.middleware_stack = app.build_middleware_stack()
+
+
+async def main(total: int, concurrency: int):
+    init_db()  # ASGITransport does not run the lifespan hook
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await client.post("/alumni/import_csv")
+        await client.post(
+            "/students/register",
+            json={"name": "Bench", "email": "bench@example.com", "password": "pw", "skills": "Python, SQL"},
+        )
+        rows = {}
+        for enabled in (False, True, False, True):  # interleaved to even out warm-up
+            set_instrumented(enabled)
+            label = "metrics on " if enabled else "metrics off"
+            for method, url in ROUTES:
+                result = await drive(client, method, url, total, concurrency)
+                key = f"{url:<24} {label}"
+                if key not in rows or result["throughput_rps"] > rows[key]["throughput_rps"]:
+                    rows[key] = result
+    print_table(f"metrics overhead (total={total}, concurrency={concurrency}, best of 2)", dict(sorted(rows.items())))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--total", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+    asyncio.run(main(args.total, args.concurrency))
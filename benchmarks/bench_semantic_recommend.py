@@ -0,0 +1,93 @@
+"""
+Recommend latency with semantic matching (memory-mapped embedding index)
+vs skill overlap only, against a p99 budget.
+
+    python -m benchmarks.bench_semantic_recommend [--sizes 10000 100000] [--budget-ms 25]
+
+Each query uses a different student profile, so the student vector is
+encoded on every call (the worst case: a cold student-vector cache).
+Exits non-zero if the semantic p99 exceeds the budget.
+"""
+import argparse
+import sys
+import tempfile
+import time
+
+from .common import use_temp_database, seed_alumni, percentile
+
+use_temp_database("semantic")
+
+from app.database import engine, init_db, SessionLocal  # noqa: E402
+from app import models, schemas  # noqa: E402
+from app.alumni_store import AlumniStore  # noqa: E402
+from app.embeddings import EmbeddingIndex, build_from_db  # noqa: E402
+from app.routers.recommend import recommend_from_store  # noqa: E402
+
+PROFILES = [
+    ("ML, Python", "AI, data science", "Data Scientist"),
+    ("React, JS", "web development, UI", "Frontend Engineer"),
+    ("Java, DSA", "backend, system design", "Software Engineer"),
+    ("Excel, SQL", "business analytics", "Business Analyst"),
+    ("K8s, AWS", "cloud, devops", "Site Reliability Engineer"),
+]
+
+
+def student(i: int) -> schemas.StudentOut:
+    skills, interests, goal = PROFILES[i % len(PROFILES)]
+    return schemas.StudentOut(
+        id=i, name="Bench", email=f"s{i}@example.com",
+        skills=skills, interests=f"{interests}, topic {i}", career_goal=goal,
+    )
+
+
+def latencies(fn, repeat: int):
+    out = []
+    for i in range(repeat):
+        t0 = time.perf_counter()
+        fn(i)
+        out.append(time.perf_counter() - t0)
+    return out
+
+
+def run(n: int, repeat: int) -> float:
+    models.Base.metadata.drop_all(bind=engine)
+    init_db()
+    seed_alumni(engine, n)
+
+    directory = tempfile.mkdtemp(prefix="embeddings-")
+    t0 = time.perf_counter()
+    build_from_db(directory)
+    build_s = time.perf_counter() - t0
+    index = EmbeddingIndex.load_current(directory)
+
+    db = SessionLocal()
+    try:
+        snap = AlumniStore().ensure_fresh(db)
+    finally:
+        db.close()
+
+    index.similarities(snap, index.student_vector(student(0)))  # align once, as the first request would
+    skill = latencies(lambda i: recommend_from_store(student(i), snap, 10), repeat)
+    semantic = latencies(lambda i: recommend_from_store(student(i), snap, 10, index=index), repeat)
+
+    p99 = percentile(semantic, 99) * 1000
+    print(
+        f"{n:>9} alumni | build {build_s:>6.2f} s | skill-only p50 {percentile(skill, 50) * 1000:>6.2f} ms"
+        f"  p99 {percentile(skill, 99) * 1000:>6.2f} ms | semantic p50 {percentile(semantic, 50) * 1000:>6.2f} ms"
+        f"  p99 {p99:>6.2f} ms"
+    )
+    return p99
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--budget-ms", type=float, default=25.0)
+    args = parser.parse_args()
+
+    worst = max(run(size, args.repeat) for size in args.sizes)
+    if worst > args.budget_ms:
+        print(f"FAIL: semantic p99 {worst:.2f} ms > budget {args.budget_ms} ms")
+        sys.exit(1)
+    print(f"OK: semantic p99 {worst:.2f} ms <= budget {args.budget_ms} ms")
@@ -0,0 +1,128 @@
+"""
+Response serialization on 10k-row lists: the validated path (ORM rows ->
+response_model -> jsonable / json.dumps) vs the trusted fast path
+(column select -> orjson, no re-validation).
+
+    python -m benchmarks.bench_serialization [--rows 10000] [--total 30]
+
+The old path is replayed on side routes; the fast path hits the real
+routes. Reports requests/s and response MB/s for each.
+"""
+import argparse
+import asyncio
+import time
+from typing import List
+
+from .common import use_temp_database, seed_alumni, seed_students
+
+use_temp_database("serialization")
+
+import httpx  # noqa: E402
+from fastapi import Depends  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app.main import app  # noqa: E402
+from app.database import engine, get_db, init_db  # noqa: E402
+from app.alumni_store import alumni_store, AlumniRecord  # noqa: E402
+from app import models, schemas  # noqa: E402
+
+
+# ---- validated baselines (pre-fast-path code) ----
+def old_alumni(db: Session = Depends(get_db)):
+    snap = alumni_store.ensure_fresh(db)
+    return [AlumniRecord(snap, i).to_dict() for i in range(len(snap))]
+
+
+def old_students(db: Session = Depends(get_db)):
+    return [
+        {"id": s.id, "name": s.name, "email": s.email, "skills": s.skills,
+         "graduation_year": s.year, "department": s.department}
+        for s in db.query(models.Student).all()
+    ]
+
+
+def old_feedback(db: Session = Depends(get_db)):
+    return db.query(models.Interaction).all()
+
+
+def old_history(student_id: int, alumni_id: int, db: Session = Depends(get_db)):
+    return (
+        db.query(models.Message)
+        .filter(
+            ((models.Message.sender_id == student_id) & (models.Message.receiver_id == alumni_id)) |
+            ((models.Message.sender_id == alumni_id) & (models.Message.receiver_id == student_id))
+        )
+        .order_by(models.Message.created_at.asc())
+        .all()
+    )
+
+
+app.add_api_route("/_bench/old/alumni", old_alumni, response_model=List[schemas.AlumniOut], response_class=JSONResponse)
+app.add_api_route("/_bench/old/students", old_students, response_model=List[dict], response_class=JSONResponse)
+app.add_api_route("/_bench/old/feedback", old_feedback, response_model=List[schemas.FeedbackOut], response_class=JSONResponse)
+app.add_api_route("/_bench/old/history", old_history, response_model=List[schemas.ChatMessageOut], response_class=JSONResponse)
+
+
+def seed(rows: int) -> None:
+    from datetime import datetime, timedelta
+    seed_alumni(engine, rows)
+    seed_students(engine, rows)
+    now = datetime.utcnow()
+    with engine.begin() as conn:
+        conn.execute(models.Interaction.__table__.insert(), [
+            {"student_id": i % rows + 1, "alumni_id": i % rows + 1, "rating": float(i % 5 + 1),
+             "comment": "Helpful session, clear advice on projects", "reward": (i % 5 + 1) / 5, "created_at": now}
+            for i in range(rows)
+        ])
+        conn.execute(models.Message.__table__.insert(), [
+            {"sender_id": 1 if i % 2 == 0 else 2, "receiver_id": 2 if i % 2 == 0 else 1,
+             "sender_type": "student" if i % 2 == 0 else "alumni_ai",
+             "receiver_type": "alumni_ai" if i % 2 == 0 else "student",
+             "content": f"Message number {i}: how should I prepare for interviews?", "is_read": False,
+             "created_at": now - timedelta(seconds=rows - i)}
+            for i in range(rows)
+        ])
+
+
+async def measure(client, url: str, total: int, **kwargs) -> dict:
+    await client.get(url, **kwargs)  # warm (snapshot, caches)
+    size = 0
+    start = time.perf_counter()
+    for _ in range(total):
+        resp = await client.get(url, **kwargs)
+        resp.raise_for_status()
+        size += len(resp.content)
+    elapsed = time.perf_counter() - start
+    return {"rps": total / elapsed, "mb_s": size / elapsed / 1e6, "bytes": size // total}
+
+
+async def main(rows: int, total: int):
+    init_db()  # ASGITransport does not run the lifespan hook
+    seed(rows)
+    history = {"params": {"student_id": 1, "alumni_id": 2}}
+    cases = [
+        ("GET /alumni/", "/_bench/old/alumni", "/alumni/", {}),
+        ("GET /students/", "/_bench/old/students", "/students/", {}),
+        ("GET /feedback/", "/_bench/old/feedback", "/feedback/", {}),
+        ("GET /chat/history", "/_bench/old/history", "/chat/history", history),
+    ]
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        print(f"\n== serialization, {rows} rows per response, {total} sequential requests ==")
+        for name, old_url, new_url, kwargs in cases:
+            old = await measure(client, old_url, total, **kwargs)
+            new = await measure(client, new_url, total, **kwargs)
+            print(
+                f"{name:<18} validated {old['rps']:>6.1f} req/s {old['mb_s']:>6.1f} MB/s   "
+                f"fast path {new['rps']:>6.1f} req/s {new['mb_s']:>6.1f} MB/s   "
+                f"x{new['mb_s'] / old['mb_s']:.1f}  ({new['bytes'] / 1e6:.2f} MB/response)"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--total", type=int, default=30)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.total))
@@ -0,0 +1,245 @@
+"""
+Shared helpers for the benchmark scripts.
+
+Every benchmark runs in-process against the ASGI app and a throw-away
+SQLite file, so call use_temp_database() BEFORE importing app.*
+"""
+import asyncio
+import csv
+import os
+import random
+import resource
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def use_temp_database(name: str = "bench") -> str:
+    """Point DATABASE_URL at a fresh SQLite file in a temp dir."""
+    path = os.path.join(tempfile.mkdtemp(prefix="mentorbridge-"), f"{name}.db")
+    os.environ["DATABASE_URL"] = f"sqlite:///{path}"
+    os.environ.setdefault("AUTH_REQUIRED", "false")  # handlers are measured, not token checks
+    return path
+
+
+def synthetic_alumni(n: int):
+    """
+    n alumni rows (dicts matching models.Alumni columns) made by cycling
+    alumni_dataset.csv and making ids / emails unique.
+    """
+    with open(ROOT / "alumni_dataset.csv", newline="", encoding="utf-8") as f:
+        base = list(csv.DictReader(f))
+    for i in range(n):
+        row = base[i % len(base)]
+        yield {
+            "alumni_id": f"SYN{i:07d}",
+            "name": f"{row['Name']} {i}",
+            "email": f"alumni{i}@example.com",
+            "graduation_year": int(row["Grad Year"] or 2020),
+            "department": row["Dept"],
+            "current_role": row["Current Role"],
+            "company": row["Company"],
+            "experience_years": int(row["Exp (yrs)"] or 0),
+            "skills": row["Skills"],
+            "domain": row["Domain"],
+            "location": row["Location"],
+            "mentorship_available": row["Mentor Available"].strip().lower() in ("yes", "true", "1"),
+        }
+
+
+def seed_alumni(engine, n: int, batch: int = 10000) -> None:
+    """Bulk-insert n synthetic alumni with Core executemany (fast, no ORM)."""
+    from app import models
+
+    rows = synthetic_alumni(n)
+    with engine.begin() as conn:
+        while True:
+            chunk = [r for _, r in zip(range(batch), rows)]
+            if not chunk:
+                break
+            conn.execute(models.Alumni.__table__.insert(), chunk)
+
+
+STUDENT_SKILLS = ["Python", "SQL", "Machine Learning", "Java", "React", "Cloud", "Data Analysis", "DevOps"]
+STUDENT_GOALS = ["Data Scientist", "Backend Engineer", "ML Engineer", "Product Manager", "Cloud Architect"]
+
+
+def seed_students(engine, n: int, batch: int = 10000, seed: int = 0) -> None:
+    """n students with random skills / goals; unusable password (nobody logs in as them)."""
+    from app import models
+    from app.passwords import unusable_password
+
+    rng = random.Random(seed)
+    rows = (
+        {
+            "name": f"Student {i}",
+            "email": f"student{i}@example.com",
+            "password_hash": unusable_password(),
+            "department": rng.choice(["CSE", "ECE", "IT", "ME"]),
+            "year": rng.randint(1, 4),
+            "skills": ", ".join(rng.sample(STUDENT_SKILLS, 3)),
+            "interests": ", ".join(rng.sample(STUDENT_SKILLS, 2)),
+            "career_goal": rng.choice(STUDENT_GOALS),
+        }
+        for i in range(n)
+    )
+    with engine.begin() as conn:
+        while True:
+            chunk = [r for _, r in zip(range(batch), rows)]
+            if not chunk:
+                break
+            conn.execute(models.Student.__table__.insert(), chunk)
+
+
+def seed_activity(engine, students: int, alumni: int, connections: int = 3, messages: int = 10,
+                  interactions: int = 5, seed: int = 0) -> dict:
+    """
+    Per student: `connections` connection requests, `messages` chat messages
+    (alternating student / AI with one alumnus) and `interactions` rated
+    feedback rows. Rebuilds alumni_rating_stats from the interactions.
+    Ids are assumed to be 1..students and 1..alumni.
+    """
+    from datetime import datetime, timedelta
+    from sqlalchemy import text
+    from app import models
+
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    conn_rows, msg_rows, fb_rows = [], [], []
+    for sid in range(1, students + 1):
+        for aid in rng.sample(range(1, alumni + 1), min(connections, alumni)):
+            conn_rows.append({"student_id": sid, "alumni_id": aid, "status": rng.choice(["Pending", "Accepted"]),
+                              "created_at": now})
+        aid = rng.randint(1, alumni)
+        for k in range(messages):
+            from_student = k % 2 == 0
+            msg_rows.append({
+                "sender_id": sid if from_student else aid,
+                "receiver_id": aid if from_student else sid,
+                "sender_type": "student" if from_student else "alumni_ai",
+                "receiver_type": "alumni_ai" if from_student else "student",
+                "content": f"message {k} between student {sid} and alumni {aid}",
+                "is_read": False,
+                "created_at": now - timedelta(minutes=messages - k),
+            })
+        for _ in range(interactions):
+            rating = float(rng.randint(1, 5))
+            fb_rows.append({"student_id": sid, "alumni_id": rng.randint(1, alumni), "rating": rating,
+                            "comment": "seeded", "reward": round(rating / 5.0, 3), "created_at": now})
+
+    with engine.begin() as conn:
+        for table, rows in ((models.ConnectionRequest.__table__, conn_rows),
+                            (models.Message.__table__, msg_rows),
+                            (models.Interaction.__table__, fb_rows)):
+            for start in range(0, len(rows), 10000):
+                conn.execute(table.insert(), rows[start:start + 10000])
+        conn.execute(models.AlumniRatingStats.__table__.delete())
+        # Same backfill as migration 0002
+        conn.execute(text(
+            """
+            INSERT INTO alumni_rating_stats
+                (alumni_id, feedback_count, rating_count, rating_sum, reward_sum, last_feedback_at)
+            SELECT alumni_id, COUNT(*), COUNT(rating), COALESCE(SUM(rating), 0),
+                   COALESCE(SUM(reward), 0), MAX(created_at)
+            FROM interactions WHERE alumni_id IS NOT NULL GROUP BY alumni_id
+            """
+        ))
+    return {"connections": len(conn_rows), "messages": len(msg_rows), "interactions": len(fb_rows)}
+
+
+class StubLLM:
+    """
+    Offline stand-in for AsyncGroq: `chat.completions.create(...)` sleeps
+    `latency_s` (default 0: measure our own overhead, not the network)
+    and returns a canned reply.
+    """
+
+    def __init__(self, latency_s: float = 0.0, reply: str = "Stub mentor reply: focus on projects."):
+        self.latency_s = latency_s
+        self.reply = reply
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    async def _create(self, **kwargs):
+        self.calls += 1
+        if self.latency_s:
+            await asyncio.sleep(self.latency_s)
+        message = SimpleNamespace(content=self.reply)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+def install_llm_stub(latency_s: float = 0.0) -> StubLLM:
+    """Route app/routers/chat.py's Groq calls to a StubLLM (import app first)."""
+    from app.routers import chat
+
+    stub = StubLLM(latency_s)
+    chat._client = stub
+    chat._client_ready = True
+    return stub
+
+
+def peak_rss_mib() -> float:
+    """Peak resident set size of this process so far."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def percentile(values, pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    k = max(0, min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1)))))
+    return ordered[k]
+
+
+def summarize(latencies, elapsed: float, errors: int = 0) -> dict:
+    """Latencies in seconds -> report dict (ms)."""
+    n = len(latencies)
+    return {
+        "requests": n,
+        "errors": errors,
+        "throughput_rps": round(n / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 2) if n else 0.0,
+    }
+
+
+async def drive(client, method: str, url: str, total: int = 500, concurrency: int = 32, **kwargs) -> dict:
+    """Fire `total` requests with at most `concurrency` in flight."""
+    return await drive_requests(client, lambda i: (method, url, kwargs), total, concurrency)
+
+
+async def drive_requests(client, make_request, total: int = 500, concurrency: int = 32) -> dict:
+    """Like drive(), with make_request(i) -> (method, url, request kwargs) per request."""
+    latencies = []
+    errors = 0
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one(i):
+        nonlocal errors
+        method, url, kwargs = make_request(i)
+        async with sem:
+            t0 = time.perf_counter()
+            resp = await client.request(method, url, **kwargs)
+            latencies.append(time.perf_counter() - t0)
+            if resp.status_code >= 400:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(total)))
+    return summarize(latencies, time.perf_counter() - start, errors)
+
+
+def print_table(title: str, rows: dict) -> None:
+    print(f"\n== {title} ==")
+    for name, r in rows.items():
+        print(
+            f"{name:<32} {r['throughput_rps']:>9} req/s   "
+            f"p50 {r['p50_ms']:>8} ms   p99 {r['p99_ms']:>8} ms   errors {r['errors']}"
+        )
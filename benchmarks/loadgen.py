@@ -0,0 +1,317 @@
+"""
+Mixed-traffic load driver against a local uvicorn.
+
+    python -m benchmarks.loadgen [--rps 5 10 20 40] [--duration 20] [--users 50]
+                                 [--chat-turns 3] [--llm-latency-ms 300] [--slo-p99-ms 1000]
+    python -m benchmarks.loadgen --replay requests.log [--speed 1.0] [--rps ...]
+    python -m benchmarks.loadgen --url http://127.0.0.1:8000 ...   (server already running)
+
+Unless --url is given, starts `uvicorn app.main:app` in a child process on
+a throw-away SQLite database, with Groq replaced by an offline stub that
+answers after --llm-latency-ms (`python -m benchmarks.loadgen serve`).
+
+Synthesized traffic is made of user sessions:
+    login -> dashboard -> recommend -> N chat turns -> feedback
+Sessions start as a Poisson process (open loop, so a slow server is not
+given a break) at the rate that makes the total request rate --rps.
+
+Replay reads a JSON-lines request log, one request per line:
+    {"t": 0.12, "method": "GET", "path": "/recommend/student/3", "json": {...}, "params": {...}}
+`t` is seconds from the start of the log (optional; without it requests are
+spaced evenly at --rps). --speed scales the recorded timing.
+
+For every --rps step reports, per endpoint: achieved throughput, error
+rate (HTTP >= 400 or transport error) and p50 / p99 / max latency. The
+saturation point is the highest step whose achieved rate is within 95%
+of the target with < 1% errors and p99 under --slo-p99-ms.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+import httpx
+
+from .common import ROOT, percentile
+
+PASSWORD = "loadtest-pw"
+QUESTIONS = [
+    "How did you get your first job?",
+    "Which skills should I learn next?",
+    "Can you review my project idea?",
+    "What does a normal day look like in your role?",
+]
+
+
+# ---------------------------------------------------------
+# Server side: uvicorn with the offline LLM stub
+# ---------------------------------------------------------
+def serve(host: str, port: int, llm_latency_ms: float) -> None:
+    import uvicorn
+    from app.main import app
+    from .common import install_llm_stub
+
+    install_llm_stub(llm_latency_ms / 1000.0)
+    uvicorn.run(app, host=host, port=port, log_level="warning", access_log=False)
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def start_server(llm_latency_ms: float):
+    """(process, base url, temp dir) for a fresh uvicorn child."""
+    tmp = tempfile.TemporaryDirectory(prefix="mentorbridge-load-")
+    port = free_port()
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{os.path.join(tmp.name, 'load.db')}",
+               PYTHONPATH=str(ROOT), ARTIFACTS_ENABLED="false", SEMANTIC_MATCHING="false",
+               AUTH_REQUIRED=os.environ.get("AUTH_REQUIRED", "false"))  # replayed logs carry no tokens
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "benchmarks.loadgen", "serve", "--port", str(port),
+         "--llm-latency-ms", str(llm_latency_ms)],
+        cwd=ROOT, env=env,
+    )
+    url = f"http://127.0.0.1:{port}"
+    async with httpx.AsyncClient() as client:
+        for _ in range(200):
+            try:
+                await client.get(url + "/")
+                return proc, url, tmp
+            except httpx.TransportError:
+                if proc.poll() is not None:
+                    raise RuntimeError("uvicorn exited during startup")
+                await asyncio.sleep(0.1)
+    proc.terminate()
+    raise RuntimeError("uvicorn did not come up")
+
+
+# ---------------------------------------------------------
+# Recording
+# ---------------------------------------------------------
+class Recorder:
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+
+    async def request(self, client, endpoint: str, method: str, url: str, **kwargs):
+        t0 = time.perf_counter()
+        try:
+            resp = await client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            self.latencies[endpoint].append(time.perf_counter() - t0)
+            self.errors[endpoint] += 1
+            return None
+        self.latencies[endpoint].append(time.perf_counter() - t0)
+        if resp.status_code >= 400:
+            self.errors[endpoint] += 1
+            return None
+        return resp
+
+    def report(self, elapsed: float) -> dict:
+        rows = {}
+        for endpoint in sorted(self.latencies):
+            lat = self.latencies[endpoint]
+            rows[endpoint] = {
+                "requests": len(lat),
+                "errors": self.errors[endpoint],
+                "error_rate": round(self.errors[endpoint] / len(lat), 4),
+                "throughput_rps": round(len(lat) / elapsed, 1),
+                "p50_ms": round(percentile(lat, 50) * 1000, 1),
+                "p99_ms": round(percentile(lat, 99) * 1000, 1),
+                "max_ms": round(max(lat) * 1000, 1),
+            }
+        all_lat = [x for lat in self.latencies.values() for x in lat]
+        errors = sum(self.errors.values())
+        rows["ALL"] = {
+            "requests": len(all_lat),
+            "errors": errors,
+            "error_rate": round(errors / len(all_lat), 4) if all_lat else 0.0,
+            "throughput_rps": round(len(all_lat) / elapsed, 1),
+            "p50_ms": round(percentile(all_lat, 50) * 1000, 1),
+            "p99_ms": round(percentile(all_lat, 99) * 1000, 1),
+            "max_ms": round(max(all_lat) * 1000, 1) if all_lat else 0.0,
+        }
+        return rows
+
+
+# ---------------------------------------------------------
+# Synthesized sessions
+# ---------------------------------------------------------
+async def register_users(client, users: int) -> None:
+    sem = asyncio.Semaphore(8)
+
+    async def one(i):
+        async with sem:
+            await client.post("/students/register", json={
+                "name": f"Load {i}", "email": f"load{i}@example.com", "password": PASSWORD,
+                "skills": random.choice(["Python, SQL", "Java, Cloud", "React, UI", "ML, Python"]),
+                "career_goal": random.choice(["Data Scientist", "Backend Engineer", "Designer"]),
+            })
+
+    await asyncio.gather(*(one(i) for i in range(users)))
+
+
+async def session(client, rec: Recorder, user: int, chat_turns: int, rng: random.Random) -> None:
+    resp = await rec.request(client, "POST /students/login", "POST", "/students/login",
+                             json={"email": f"load{user}@example.com", "password": PASSWORD})
+    if resp is None:
+        return
+    body = resp.json()
+    student_id = body["id"]
+    headers = {"Authorization": f"Bearer {body['access_token']}"} if body.get("access_token") else {}
+
+    await rec.request(client, "GET /students/{id}/dashboard", "GET", f"/students/{student_id}/dashboard",
+                      headers=headers)
+    resp = await rec.request(client, "GET /recommend/student/{id}", "GET", f"/recommend/student/{student_id}",
+                             headers=headers)
+    recs = resp.json() if resp is not None else []
+    alumni_id = recs[0]["id"] if recs else rng.randint(1, 50)
+
+    for _ in range(chat_turns):
+        await rec.request(client, "POST /chat/send", "POST", "/chat/send", headers=headers, json={
+            "student_id": student_id, "alumni_id": alumni_id, "message": rng.choice(QUESTIONS),
+        })
+    await rec.request(client, "POST /feedback/", "POST", "/feedback/", headers=headers, json={
+        "student_id": student_id, "alumni_id": alumni_id, "rating": rng.randint(1, 5), "comment": "load test",
+    })
+
+
+async def run_sessions(client, rps: float, duration: float, users: int, chat_turns: int, seed: int) -> dict:
+    rng = random.Random(seed)
+    rec = Recorder()
+    session_rate = rps / (4 + chat_turns)  # requests per session
+    tasks = []
+    start = time.perf_counter()
+    next_at = 0.0
+    while next_at < duration:
+        delay = start + next_at - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(session(client, rec, rng.randrange(users), chat_turns, rng)))
+        next_at += rng.expovariate(session_rate)
+    await asyncio.gather(*tasks)
+    return rec.report(time.perf_counter() - start)
+
+
+# ---------------------------------------------------------
+# Log replay
+# ---------------------------------------------------------
+def load_log(path: str) -> list:
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def endpoint_of(method: str, path: str) -> str:
+    """GET /recommend/student/17?x=1 -> GET /recommend/student/{id}, so ids aggregate."""
+    parts = path.split("?")[0].split("/")
+    return f"{method} " + "/".join("{id}" if p.isdigit() else p for p in parts)
+
+
+async def run_replay(client, entries: list, rps: float, speed: float) -> dict:
+    rec = Recorder()
+    timed = all("t" in e for e in entries)
+    tasks = []
+    start = time.perf_counter()
+    for i, e in enumerate(entries):
+        at = e["t"] / speed if timed else i / rps
+        delay = start + at - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        endpoint = e.get("endpoint") or endpoint_of(e["method"], e["path"])
+        tasks.append(asyncio.create_task(rec.request(
+            client, endpoint, e["method"], e["path"], json=e.get("json"), params=e.get("params"),
+        )))
+    await asyncio.gather(*tasks)
+    return rec.report(time.perf_counter() - start)
+
+
+def print_step(title: str, rows: dict) -> None:
+    print(f"\n== {title} ==")
+    for name, r in rows.items():
+        print(
+            f"{name:<32} {r['throughput_rps']:>7} req/s  err {r['error_rate']:>6.2%}  "
+            f"p50 {r['p50_ms']:>8} ms  p99 {r['p99_ms']:>8} ms  max {r['max_ms']:>8} ms"
+        )
+
+
+async def main(args) -> int:
+    proc = tmp = None
+    url = args.url
+    if url is None:
+        proc, url, tmp = await start_server(args.llm_latency_ms)
+    try:
+        limits = httpx.Limits(max_connections=args.max_connections, max_keepalive_connections=args.max_connections)
+        async with httpx.AsyncClient(base_url=url, limits=limits, timeout=args.timeout) as client:
+            entries = None
+            if args.replay:
+                entries = load_log(args.replay)
+            else:
+                await register_users(client, args.users)
+                await client.post("/alumni/import_csv")
+
+            steps = {}
+            for rps in args.rps:
+                if entries is not None:
+                    rows = await run_replay(client, entries, rps, args.speed)
+                else:
+                    rows = await run_sessions(client, rps, args.duration, args.users, args.chat_turns, args.seed)
+                steps[rps] = rows
+                print_step(f"target {rps} req/s", rows)
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait()
+            tmp.cleanup()
+
+    saturation = None
+    for rps, rows in steps.items():
+        total = rows["ALL"]
+        if (total["throughput_rps"] >= 0.95 * rps and total["error_rate"] < 0.01
+                and total["p99_ms"] <= args.slo_p99_ms):
+            saturation = rps
+    if entries is not None and all("t" in e for e in entries):
+        print("\n(replayed at recorded timing; --rps only repeats the run)")
+    print(f"\nsaturation: {saturation or 'below the lowest step'} req/s "
+          f"(achieved >= 95% of target, < 1% errors, p99 <= {args.slo_p99_ms} ms)")
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({"steps": steps, "saturation_rps": saturation}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "serve":
+        p = argparse.ArgumentParser()
+        p.add_argument("serve")
+        p.add_argument("--host", default="127.0.0.1")
+        p.add_argument("--port", type=int, default=8000)
+        p.add_argument("--llm-latency-ms", type=float, default=300.0)
+        a = p.parse_args()
+        serve(a.host, a.port, a.llm_latency_ms)
+        sys.exit(0)
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default=None, help="target an already running server")
+    parser.add_argument("--rps", type=float, nargs="+", default=[5, 10, 20, 40])
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds per step (sessions)")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--chat-turns", type=int, default=3)
+    parser.add_argument("--llm-latency-ms", type=float, default=300.0)
+    parser.add_argument("--replay", default=None, help="JSON-lines request log")
+    parser.add_argument("--speed", type=float, default=1.0)
+    parser.add_argument("--slo-p99-ms", type=float, default=1000.0)
+    parser.add_argument("--max-connections", type=int, default=200)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default=None)
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(args)))
@@ -0,0 +1,207 @@
+"""
+Benchmark suite over every router hot path, at several alumni scales.
+
+    python -m benchmarks.suite [--alumni 1000 100000 1000000] [--students 1000]
+                               [--total 500] [--concurrency 16]
+                               [--out benchmarks/baselines/latest.json]
+                               [--baseline benchmarks/baselines/main.json] [--tolerance 0.25]
+
+Each scale runs in a fresh interpreter on a throw-away SQLite database
+(so peak RSS is per scale): POST /alumni/import_csv on the empty table,
+then synthetic alumni up to the target count (alumni_dataset.csv cycled),
+students, connections, chat messages and rated interactions. Every
+endpoint is then driven in-process through the ASGI app, with Groq
+replaced by an offline stub. Student / alumni ids are drawn at random per
+request so the profile cache sees realistic hit rates.
+
+Results (throughput, p50 / p99, peak RSS after each endpoint) go to
+--out as JSON. With --baseline, endpoints whose throughput dropped or p99
+grew by more than --tolerance are listed and the exit code is 1.
+GET /alumni/ returns the whole table, so it gets fewer requests at large
+scales (total * 1000 / alumni, at least 3).
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from .common import ROOT, print_table
+
+DEFAULT_OUT = ROOT / "benchmarks" / "baselines" / "latest.json"
+
+
+async def run_scale(alumni: int, students: int, total: int, concurrency: int, seed: int) -> dict:
+    """Runs inside the per-scale child process (DATABASE_URL already set)."""
+    import httpx
+    from app.main import app
+    from app.database import engine, init_db
+    from .common import (drive, drive_requests, install_llm_stub, peak_rss_mib,
+                         seed_activity, seed_alumni, seed_students)
+
+    init_db()  # ASGITransport does not run the lifespan hook
+    install_llm_stub()
+    rng = random.Random(seed)
+    results = {}
+
+    def record(name, result):
+        result["peak_rss_mib"] = peak_rss_mib()
+        results[name] = result
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        # Cold import is a one-shot operation: time it once on the empty table
+        t0 = time.perf_counter()
+        resp = await client.post("/alumni/import_csv")
+        elapsed = time.perf_counter() - t0
+        imported = resp.json().get("imported", 0) if resp.status_code < 400 else 0
+        record("POST /alumni/import_csv", {
+            "requests": 1, "errors": int(resp.status_code >= 400),
+            "throughput_rps": round(1 / elapsed, 1), "p50_ms": round(elapsed * 1000, 2),
+            "p99_ms": round(elapsed * 1000, 2), "mean_ms": round(elapsed * 1000, 2),
+        })
+
+        t0 = time.perf_counter()
+        seed_alumni(engine, max(0, alumni - imported))
+        seed_students(engine, students, seed=seed)
+        counts = seed_activity(engine, students, alumni, seed=seed)
+        seed_seconds = round(time.perf_counter() - t0, 1)
+
+        def student():
+            return rng.randint(1, students)
+
+        def alumnus():
+            return rng.randint(1, alumni)
+
+        # Warm the snapshot / stats once so the first timed request is not a full load
+        await client.get("/recommend/student/1")
+
+        record("GET /recommend/student/{id}", await drive_requests(
+            client, lambda i: ("GET", f"/recommend/student/{student()}", {}), total, concurrency))
+        record("GET /students/{id}/dashboard", await drive_requests(
+            client, lambda i: ("GET", f"/students/{student()}/dashboard", {}), total, concurrency))
+        record("GET /alumni/", await drive(
+            client, "GET", "/alumni/", max(3, total * 1000 // alumni), min(concurrency, 4)))
+        record("POST /alumni/import_csv (again)", await drive(
+            client, "POST", "/alumni/import_csv", total, concurrency))
+        record("POST /chat/send", await drive_requests(
+            client,
+            lambda i: ("POST", "/chat/send", {"json": {
+                "student_id": student(), "alumni_id": alumnus(), "message": "How do I get into ML?",
+            }}),
+            total, concurrency))
+        record("GET /chat/history", await drive_requests(
+            client,
+            lambda i: ("GET", "/chat/history", {"params": {"student_id": student(), "alumni_id": alumnus()}}),
+            total, concurrency))
+        record("GET /connect/student/{id}", await drive_requests(
+            client, lambda i: ("GET", f"/connect/student/{student()}", {}), total, concurrency))
+        record("POST /feedback/", await drive_requests(
+            client,
+            lambda i: ("POST", "/feedback/", {"json": {
+                "student_id": student(), "alumni_id": alumnus(), "rating": rng.randint(1, 5), "comment": "bench",
+            }}),
+            total, concurrency))
+        record("GET /feedback/page", await drive(client, "GET", "/feedback/page", total, concurrency))
+
+    return {
+        "alumni": alumni,
+        "students": students,
+        "seeded": counts,
+        "seed_seconds": seed_seconds,
+        "peak_rss_mib": peak_rss_mib(),
+        "endpoints": results,
+    }
+
+
+def spawn_scale(args, alumni: int) -> dict:
+    """One scale in a fresh interpreter: own database, own peak RSS."""
+    with tempfile.TemporaryDirectory(prefix="mentorbridge-suite-") as tmp:
+        out = os.path.join(tmp, "result.json")
+        env = dict(os.environ, DATABASE_URL=f"sqlite:///{os.path.join(tmp, 'suite.db')}",
+                   PYTHONPATH=str(ROOT), ARTIFACTS_ENABLED="false", SEMANTIC_MATCHING="false",
+                   AUTH_REQUIRED=os.environ.get("AUTH_REQUIRED", "false"))
+        subprocess.run(
+            [sys.executable, "-m", "benchmarks.suite", "--child-out", out, "--alumni", str(alumni),
+             "--students", str(args.students), "--total", str(args.total),
+             "--concurrency", str(args.concurrency), "--seed", str(args.seed)],
+            cwd=ROOT, env=env, check=True,
+        )
+        with open(out) as f:
+            return json.load(f)
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> list:
+    """Endpoints slower than the baseline by more than `tolerance` (fraction)."""
+    regressions = []
+    for scale, run in current["scales"].items():
+        base_run = baseline.get("scales", {}).get(scale)
+        if not base_run:
+            continue
+        for name, r in run["endpoints"].items():
+            b = base_run["endpoints"].get(name)
+            if not b or r["requests"] < 3:
+                continue
+            if r["throughput_rps"] < b["throughput_rps"] * (1 - tolerance):
+                regressions.append(f"{scale:>8} {name}: {b['throughput_rps']} -> {r['throughput_rps']} req/s")
+            if r["p99_ms"] > b["p99_ms"] * (1 + tolerance):
+                regressions.append(f"{scale:>8} {name}: p99 {b['p99_ms']} -> {r['p99_ms']} ms")
+    return regressions
+
+
+def main(args) -> int:
+    report = {
+        "created_at": datetime.utcnow().isoformat(),
+        "machine": {"python": platform.python_version(), "platform": platform.platform(), "cpus": os.cpu_count()},
+        "params": {"students": args.students, "total": args.total, "concurrency": args.concurrency, "seed": args.seed},
+        "scales": {},
+    }
+    for alumni in args.alumni:
+        run = spawn_scale(args, alumni)
+        report["scales"][str(alumni)] = run
+        print_table(
+            f"alumni={alumni} students={args.students} (seeded in {run['seed_seconds']}s, peak RSS {run['peak_rss_mib']} MiB)",
+            run["endpoints"],
+        )
+
+    out = Path(args.out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(report, indent=2))
+    print(f"\nsaved {out}")
+
+    if args.baseline:
+        regressions = compare(report, json.loads(Path(args.baseline).read_text()), args.tolerance)
+        if regressions:
+            print(f"\nREGRESSIONS vs {args.baseline} (tolerance {args.tolerance:.0%}):")
+            print("\n".join(f"  {line}" for line in regressions))
+            return 1
+        print(f"no regressions vs {args.baseline} (tolerance {args.tolerance:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--alumni", type=int, nargs="+", default=[1000, 100000, 1000000])
+    parser.add_argument("--students", type=int, default=1000)
+    parser.add_argument("--total", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default=str(DEFAULT_OUT))
+    parser.add_argument("--baseline", default=None)
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--child-out", default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child_out:
+        result = asyncio.run(run_scale(args.alumni[0], args.students, args.total, args.concurrency, args.seed))
+        with open(args.child_out, "w") as f:
+            json.dump(result, f)
+        sys.exit(0)
+    sys.exit(main(args))
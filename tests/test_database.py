@@ -0,0 +1,153 @@
+"""
+Engine construction (app/database.py, app/async_database.py).
+
+    python -m pytest tests
+
+URL handling and the keyword arguments handed to create_engine need no
+server. The live checks connect to TEST_POSTGRES_URL (postgresql://...)
+and are skipped when it is unset or unreachable.
+"""
+import asyncio
+import os
+
+import pytest
+
+from app import async_database, database
+from app.async_database import build_async_engine, to_async_url
+from app.config import Settings
+from app.database import build_engine, normalize_database_url
+
+PG_URL = "postgresql+psycopg2://user:pw@db.example:5432/mentor"
+CFG = Settings(
+    db_pool_size=3,
+    db_max_overflow=4,
+    db_pool_timeout=7,
+    db_pool_recycle=60,
+    db_pool_pre_ping=True,
+    db_statement_timeout_ms=1234,
+)
+
+
+@pytest.fixture
+def captured(monkeypatch):
+    """Record create_engine / create_async_engine calls instead of building engines."""
+    calls = []
+
+    def fake(url, **kwargs):
+        calls.append((url, kwargs))
+
+    monkeypatch.setattr(database, "create_engine", fake)
+    monkeypatch.setattr(async_database, "create_async_engine", fake)
+    return calls
+
+
+# ---------------------------------------------------------
+# URLs
+# ---------------------------------------------------------
+@pytest.mark.parametrize("url, expected", [
+    ("postgres://u:p@h:5432/db", "postgresql+psycopg2://u:p@h:5432/db"),
+    ("postgresql://u:p@h/db", "postgresql://u:p@h/db"),
+    ("postgresql+psycopg2://u:p@h/db", "postgresql+psycopg2://u:p@h/db"),
+    ("sqlite:///./alumni.db", "sqlite:///./alumni.db"),
+])
+def test_normalize_database_url(url, expected):
+    assert normalize_database_url(url) == expected
+
+
+@pytest.mark.parametrize("url, expected", [
+    ("sqlite:///./alumni.db", "sqlite+aiosqlite:///./alumni.db"),
+    ("sqlite+aiosqlite:///x.db", "sqlite+aiosqlite:///x.db"),
+    ("postgresql://u:p@h/db", "postgresql+asyncpg://u:p@h/db"),
+    ("postgresql+psycopg2://u:p@h/db", "postgresql+asyncpg://u:p@h/db"),
+    ("postgresql+asyncpg://u:p@h/db", "postgresql+asyncpg://u:p@h/db"),
+    (normalize_database_url("postgres://u:p@h/db"), "postgresql+asyncpg://u:p@h/db"),
+])
+def test_to_async_url(url, expected):
+    assert to_async_url(url) == expected
+
+
+# ---------------------------------------------------------
+# Engine keyword arguments
+# ---------------------------------------------------------
+def test_postgres_pool_settings(captured):
+    build_engine(PG_URL, CFG)
+    (url, kwargs), = captured
+    assert url == PG_URL
+    assert kwargs["poolclass"] is database.QueuePool
+    assert kwargs["pool_size"] == 3
+    assert kwargs["max_overflow"] == 4
+    assert kwargs["pool_timeout"] == 7
+    assert kwargs["pool_recycle"] == 60
+    assert kwargs["pool_pre_ping"] is True
+    assert kwargs["connect_args"] == {"options": "-c statement_timeout=1234"}
+
+
+def test_statement_timeout_disabled(captured):
+    build_engine(PG_URL, CFG.model_copy(update={"db_statement_timeout_ms": 0}))
+    build_async_engine(to_async_url(PG_URL), CFG.model_copy(update={"db_statement_timeout_ms": 0}))
+    assert [kwargs["connect_args"] for _, kwargs in captured] == [{}, {}]
+
+
+def test_sqlite_has_no_pool_tuning(captured):
+    build_engine("sqlite:///./x.db", CFG)
+    (_, kwargs), = captured
+    assert kwargs["connect_args"] == {"check_same_thread": False}
+    assert "pool_size" not in kwargs and "poolclass" not in kwargs
+
+
+def test_async_postgres_server_settings(captured):
+    build_async_engine(to_async_url(PG_URL), CFG)
+    (url, kwargs), = captured
+    assert url == "postgresql+asyncpg://user:pw@db.example:5432/mentor"
+    assert kwargs["pool_size"] == 3
+    assert kwargs["max_overflow"] == 4
+    assert kwargs["pool_pre_ping"] is True
+    assert kwargs["connect_args"] == {"server_settings": {"statement_timeout": "1234"}}
+
+
+# ---------------------------------------------------------
+# Live PostgreSQL
+# ---------------------------------------------------------
+@pytest.fixture(scope="module")
+def pg_url():
+    url = os.environ.get("TEST_POSTGRES_URL")
+    if not url:
+        pytest.skip("TEST_POSTGRES_URL not set")
+    pytest.importorskip("psycopg2")
+    from sqlalchemy import create_engine, exc
+
+    probe = create_engine(normalize_database_url(url))
+    try:
+        probe.connect().close()
+    except exc.OperationalError as e:
+        pytest.skip(f"PostgreSQL not reachable: {e}")
+    finally:
+        probe.dispose()
+    return normalize_database_url(url)
+
+
+def test_live_statement_timeout(pg_url):
+    from sqlalchemy import text
+
+    engine = build_engine(pg_url, CFG)
+    try:
+        with engine.connect() as conn:
+            assert conn.execute(text("SHOW statement_timeout")).scalar() == "1234ms"
+        assert engine.pool.size() == 3
+    finally:
+        engine.dispose()
+
+
+def test_live_async_statement_timeout(pg_url):
+    pytest.importorskip("asyncpg")
+    from sqlalchemy import text
+
+    async def check():
+        engine = build_async_engine(to_async_url(pg_url), CFG)
+        try:
+            async with engine.connect() as conn:
+                return (await conn.execute(text("SHOW statement_timeout"))).scalar()
+        finally:
+            await engine.dispose()
+
+    assert asyncio.run(check()) == "1234ms"
@@ -0,0 +1,20 @@
+"""
+Cold import of app.main (benchmarks/bench_import_time.py): heavy optional
+packages stay lazy and the total stays within DEFAULT_BUDGET_MS.
+"""
+import pytest
+
+from benchmarks.bench_import_time import DEFAULT_BUDGET_MS, MUST_BE_LAZY, eager_modules, profile_import, total_ms
+
+
+@pytest.fixture(scope="module")
+def rows():
+    return profile_import("app.main")
+
+
+def test_heavy_modules_stay_lazy(rows):
+    assert eager_modules(rows) == [], f"importing app.main must not import {MUST_BE_LAZY}"
+
+
+def test_import_within_budget(rows):
+    assert total_ms(rows) <= DEFAULT_BUDGET_MS